@@ -0,0 +1,183 @@
+"""
+Local avatar storage for the ``/avatars/<hash>/<size>/`` proxy.
+
+Avatars are served from an on-disk cache filled by the
+``prefetch_avatars`` command, so page rendering never waits on
+gravatar.com. The cache holds at most ``AVATARS['MAX_FILES']`` images and
+evicts the least recently served ones (file modification times are
+bumped on every hit) once a write takes it over the limit. Hashes with no cached image get a deterministic
+SVG identicon generated locally.
+"""
+
+import os
+import tempfile
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from recipes.metrics import get_metrics
+
+
+DEFAULT_AVATARS = {
+    # Defaults to BASE_DIR/avatar_cache.
+    'CACHE_DIR': None,
+    'MAX_FILES': 5000,
+    'MAX_AGE': 7 * 24 * 60 * 60,
+    # Browser cache lifetime of identicons, which a fetched gravatar replaces.
+    'IDENTICON_MAX_AGE': 60 * 60,
+    'SIZES': [40, 60, 80, 120],
+    'FETCH_TIMEOUT': 5,
+}
+
+MAX_SIZE = 512
+
+CONTENT_TYPES = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/gif': 'gif',
+}
+
+REMOTE_URL = 'https://www.gravatar.com/avatar/{hash}?size={size}&default=404'
+
+metrics = get_metrics('avatars')
+
+
+def get_avatar_config():
+    """Return the avatar configuration, with ``settings.AVATARS`` over the defaults."""
+
+    config = dict(DEFAULT_AVATARS)
+    config.update(getattr(settings, 'AVATARS', {}) or {})
+    if not config['CACHE_DIR']:
+        config['CACHE_DIR'] = os.path.join(settings.BASE_DIR, 'avatar_cache')
+    return config
+
+
+def is_valid_hash(email_hash):
+    """Return True if ``email_hash`` looks like an MD5 hex digest."""
+
+    return len(email_hash) == 32 and all(character in '0123456789abcdef' for character in email_hash)
+
+
+def identicon_svg(email_hash, size):
+    """
+    Return a deterministic SVG identicon for an email hash.
+
+    The image is a horizontally mirrored 5x5 grid. Cells are switched on by
+    the bits of the hash and coloured by a hue taken from its first digits.
+    """
+
+    hue = int(email_hash[:3], 16) * 360 // 4096
+    cells = []
+    for index in range(15):
+        if int(email_hash[index + 3], 16) % 2:
+            continue
+        row, column = divmod(index, 3)
+        for x in {column, 4 - column}:
+            cells.append(f'<rect x="{x + 0.5}" y="{row + 0.5}" width="1" height="1"/>')
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 6 6" shape-rendering="crispEdges">'
+        f'<rect width="6" height="6" fill="#f0f0f0"/>'
+        f'<g fill="hsl({hue}, 55%, 50%)">{"".join(cells)}</g></svg>'
+    )
+
+
+class AvatarCache:
+    """On-disk LRU cache of avatar images keyed by email hash and size."""
+
+    def __init__(self, directory=None, max_files=None):
+        config = get_avatar_config()
+        self.directory = str(directory or config['CACHE_DIR'])
+        self.max_files = max_files or config['MAX_FILES']
+        # Images on disk, counted on the first put and kept up to date by
+        # put and prune, so writes only scan the directory to evict.
+        self.files = None
+
+    def _path(self, email_hash, size, extension):
+        return os.path.join(self.directory, f'{email_hash}-{size}.{extension}')
+
+    def _count(self):
+        return sum(1 for entry in os.scandir(self.directory) if not entry.name.endswith('.tmp'))
+
+    def get(self, email_hash, size):
+        """
+        Return a cached image and mark it as recently used.
+
+        Returns:
+            tuple or None: ``(data, content_type)``, or None on a miss.
+        """
+
+        for content_type, extension in CONTENT_TYPES.items():
+            path = self._path(email_hash, size, extension)
+            try:
+                with open(path, 'rb') as handle:
+                    data = handle.read()
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return data, content_type
+        return None
+
+    def put(self, email_hash, size, data, content_type):
+        """Store an image, then evict the least recently used ones if the cache is over the limit."""
+
+        os.makedirs(self.directory, exist_ok=True)
+        if self.files is None:
+            self.files = self._count()
+        for extension in CONTENT_TYPES.values():
+            if extension != CONTENT_TYPES[content_type]:
+                try:
+                    os.remove(self._path(email_hash, size, extension))
+                    self.files -= 1
+                except FileNotFoundError:
+                    pass
+        path = self._path(email_hash, size, CONTENT_TYPES[content_type])
+        added = not os.path.exists(path)
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary_path, path)
+        self.files += added
+        if self.files > self.max_files:
+            self.prune()
+
+    def prune(self):
+        """
+        Delete the least recently used images beyond ``max_files``.
+
+        A tenth of the limit is freed on top, so a full cache is scanned
+        once every ``max_files // 10`` new images rather than on each one.
+        """
+
+        entries = [entry for entry in os.scandir(self.directory) if not entry.name.endswith('.tmp')]
+        self.files = len(entries)
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_files + self.max_files // 10]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            self.files -= 1
+            metrics.increment('evictions')
+
+
+def fetch_remote(email_hash, size, timeout=None):
+    """
+    Download an avatar from gravatar.com.
+
+    Returns:
+        tuple or None: ``(data, content_type)``, or None if the user has no
+        gravatar, the image type is not supported or the request fails.
+    """
+
+    timeout = timeout or get_avatar_config()['FETCH_TIMEOUT']
+    try:
+        with urllib.request.urlopen(REMOTE_URL.format(hash=email_hash, size=size), timeout=timeout) as response:
+            content_type = response.headers.get_content_type()
+            if content_type not in CONTENT_TYPES:
+                return None
+            return response.read(), content_type
+    except (urllib.error.URLError, OSError):
+        return None
@@ -0,0 +1,95 @@
+"""
+Authentication backend with a per-process cache of user objects.
+
+``AuthenticationMiddleware`` loads the logged-in user on every request.
+``CachedModelBackend`` keeps recently loaded users in process memory for
+``USER_CACHE['TIMEOUT']`` seconds so most requests skip that query.
+
+Every user also has a version token in the shared cache
+(``USER_CACHE['CACHE']``), which ``invalidate_user`` replaces whenever
+the user is saved or deleted. A cached user is only reused while its
+token is unchanged, so role changes made by any process apply on the
+next request.
+"""
+
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from recipes.metrics import get_metrics
+
+
+DEFAULT_USER_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 30,
+    'MAX_ENTRIES': 1000,
+}
+
+metrics = get_metrics('user_cache')
+
+_users = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_user_cache_config():
+    """Return the user cache configuration, with ``settings.USER_CACHE`` over the defaults."""
+
+    config = dict(DEFAULT_USER_CACHE)
+    config.update(getattr(settings, 'USER_CACHE', {}) or {})
+    return config
+
+
+def _version_key(user_id):
+    return f'user:v:{user_id}'
+
+
+def invalidate_user(user_id):
+    """Drop a user from every process's cache."""
+
+    caches[get_user_cache_config()['CACHE']].set(_version_key(user_id), uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _users.pop(user_id, None)
+
+
+def clear_user_cache():
+    """Empty this process's user cache."""
+
+    with _lock:
+        _users.clear()
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose ``get_user`` is served from the per-process user cache."""
+
+    def get_user(self, user_id):
+        config = get_user_cache_config()
+        shared = caches[config['CACHE']]
+        key = _version_key(user_id)
+        version = shared.get(key)
+
+        with _lock:
+            entry = _users.get(user_id)
+        if entry is not None and version is not None and entry[0] == version and entry[1] > time.monotonic():
+            metrics.increment('hits')
+            # Each request gets its own copy, so changes a view makes to
+            # request.user without saving cannot leak into other requests.
+            return pickle.loads(entry[2])
+
+        metrics.increment('misses')
+        user = super().get_user(user_id)
+        if user is None:
+            return None
+        if version is None:
+            shared.add(key, uuid.uuid4().hex, timeout=None)
+            version = shared.get(key)
+        with _lock:
+            _users[user_id] = (version, time.monotonic() + config['TIMEOUT'], pickle.dumps(user))
+            _users.move_to_end(user_id)
+            while len(_users) > config['MAX_ENTRIES']:
+                _users.popitem(last=False)
+        return user
@@ -0,0 +1,172 @@
+"""
+Streaming export of public recipes, as JSON lines or a static HTML snapshot.
+
+Recipes are walked with ``.iterator()`` in chunks of
+``EXPORTS['CHUNK_SIZE']``; each chunk's authors, tags (and, for HTML, ratings)
+are fetched with one query per relation rather than one per recipe.
+Ingredients and steps are read from ``Recipe.content``; recipes written
+before it existed have their rows fetched for the whole chunk at once.
+
+JSON lines records use the shape ``import_recipes`` reads (see
+recipes/imports.py), so an export can be imported elsewhere.
+
+The HTML snapshot renders each ``view_recipe`` page as an anonymous visitor
+sees it to ``<directory>/recipes/<id>/index.html``, so a file server or CDN
+can serve ``/recipes/<id>/`` without reaching Django. Pages are replaced
+atomically, and pages of recipes that are no longer public are removed.
+Requests with a query string (``?serves=N``) still need Django.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.urls import reverse
+from recipes.metrics import get_metrics
+from recipes.models import Recipe, RecipeRating
+
+
+DEFAULT_EXPORTS = {
+    # Recipes read per query.
+    'CHUNK_SIZE': 500,
+}
+
+metrics = get_metrics('exports')
+
+
+def get_export_config():
+    """Return the export configuration, with ``settings.EXPORTS`` over the defaults."""
+
+    config = dict(DEFAULT_EXPORTS)
+    config.update(getattr(settings, 'EXPORTS', {}) or {})
+    return config
+
+
+def public_recipe_chunks(chunk_size=None, ratings=False):
+    """
+    Yield lists of public recipes in id order, with their relations fetched per chunk.
+
+    Every recipe has ``content`` filled in (in memory only, for recipes
+    written before it existed). With ``ratings``, each recipe's ratings are
+    prefetched newest first, with their users.
+    """
+
+    chunk_size = max(chunk_size or get_export_config()['CHUNK_SIZE'], 1)
+    prefetches = ['tags']
+    if ratings:
+        prefetches.append(Prefetch(
+            'ratings', queryset=RecipeRating.objects.select_related('user').order_by('-createdAt')
+        ))
+    recipes = (
+        Recipe.objects.filter(visibility='public')
+        .select_related('author')
+        .prefetch_related(*prefetches)
+        .order_by('id')
+        .iterator(chunk_size=chunk_size)
+    )
+    while True:
+        chunk = list(islice(recipes, chunk_size))
+        if not chunk:
+            return
+        missing = [recipe for recipe in chunk if not recipe.content]
+        if missing:
+            prefetch_related_objects(missing, 'ingredients', 'steps')
+            for recipe in missing:
+                recipe.content = Recipe.build_content(recipe.ingredients.all(), recipe.steps.all())
+        yield chunk
+
+
+def recipe_record(recipe):
+    """Return the export record of a recipe with its content and tags loaded."""
+
+    return {
+        'id': recipe.pk,
+        'name': recipe.name,
+        'author': recipe.author.username,
+        'description': recipe.description,
+        'serves': recipe.serves,
+        'difficulty': recipe.difficulty,
+        'prep_minutes': int(recipe.prepTime.total_seconds() // 60),
+        'cook_minutes': int(recipe.cookTime.total_seconds() // 60),
+        'cuisine': recipe.cuisine,
+        'visibility': recipe.visibility,
+        'tags': [tag.name for tag in recipe.tags.all()],
+        'ingredients': [ingredient['text'] for ingredient in recipe.content['ingredients']],
+        'steps': [step['text'] for step in recipe.content['steps']],
+        'averageRating': float(recipe.averageRating),
+        'ratingCount': recipe.ratingCount,
+        'createdAt': recipe.createdAt.isoformat(),
+        'updatedAt': recipe.updatedAt.isoformat(),
+    }
+
+
+def export_jsonl(out, chunk_size=None):
+    """
+    Write every public recipe to ``out`` as one JSON object per line.
+
+    Returns:
+        int: The number of recipes written.
+    """
+
+    count = 0
+    for chunk in public_recipe_chunks(chunk_size):
+        for recipe in chunk:
+            out.write(json.dumps(recipe_record(recipe), ensure_ascii=False) + '\n')
+        count += len(chunk)
+    metrics.increment('jsonl_recipes', count)
+    return count
+
+
+def render_recipe_page(recipe):
+    """Render a recipe's ``view_recipe`` page as an anonymous visitor sees it."""
+
+    # Imported here: the views package imports most of the app.
+    from recipes.views.view_recipe_view import recipe_page_context
+
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = reverse('view_recipe', args=[recipe.pk])
+    request.user = AnonymousUser()
+    context = recipe_page_context(request, recipe, ratings=recipe.ratings.all())
+    return render_to_string('view_recipe.html', context, request=request)
+
+
+def _write_atomically(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(handle, 'w', encoding='utf-8') as page:
+        page.write(text)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+
+def export_html(directory, chunk_size=None):
+    """
+    Write the static snapshot of every public recipe's page under ``directory``.
+
+    Returns:
+        tuple: ``(written, removed)`` page counts.
+    """
+
+    root = os.path.join(directory, 'recipes')
+    exported = set()
+    for chunk in public_recipe_chunks(chunk_size, ratings=True):
+        for recipe in chunk:
+            _write_atomically(os.path.join(root, str(recipe.pk), 'index.html'), render_recipe_page(recipe))
+            exported.add(str(recipe.pk))
+
+    removed = 0
+    if os.path.isdir(root):
+        for name in os.listdir(root):
+            if name.isdigit() and name not in exported:
+                shutil.rmtree(os.path.join(root, name))
+                removed += 1
+    metrics.increment('html_pages', len(exported))
+    return len(exported), removed
@@ -0,0 +1,215 @@
+"""
+Following feed built by fanning recipes out to followers' timelines.
+
+When a public recipe is created a ``FanoutTask`` is queued with it. The
+``fanout_timelines`` command works through the queue in the background,
+adding a ``TimelineEntry`` for each of the author's followers, in batches
+of ``FEED['BATCH_SIZE']``. Reading a feed is then one range scan over the
+user's timeline entries.
+
+Authors with more than ``FEED['FANOUT_LIMIT']`` followers are not fanned
+out: their recent recipes are read directly (fan-out on read) and merged
+into their followers' feeds.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Q
+from recipes.metrics import get_metrics
+from recipes.models import FanoutTask, Recipe, TimelineEntry
+from recipes.writes import atomic_write
+
+
+DEFAULT_FEED = {
+    'PAGE_SIZE': 20,
+    'BATCH_SIZE': 500,
+    'FANOUT_LIMIT': 5000,
+    # Recent recipes copied into a feed when its owner follows someone.
+    'BACKFILL': 20,
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+metrics = get_metrics('feed')
+
+
+def get_feed_config():
+    """Return the feed configuration, with ``settings.FEED`` over the defaults."""
+
+    config = dict(DEFAULT_FEED)
+    config.update(getattr(settings, 'FEED', {}) or {})
+    return config
+
+
+def encode_cursor(created_at, recipe_id):
+    """Encode a feed position as ``<microseconds since epoch>_<recipe id>``."""
+
+    return f'{(created_at - EPOCH) // timedelta(microseconds=1)}_{recipe_id}'
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by ``encode_cursor``.
+
+    Returns:
+        tuple or None: ``(created_at, recipe_id)``, or None if the cursor is
+        missing or malformed.
+    """
+
+    try:
+        microseconds, recipe_id = (int(part) for part in cursor.split('_'))
+    except (AttributeError, ValueError):
+        return None
+    return EPOCH + timedelta(microseconds=microseconds), recipe_id
+
+
+def high_fanout_author_ids(user):
+    """Return the ids of authors ``user`` follows whose recipes are read on demand."""
+
+    limit = get_feed_config()['FANOUT_LIMIT']
+    return list(user.following.filter(followers_count__gt=limit).order_by().values_list('id', flat=True))
+
+
+def enqueue_fanout(recipe):
+    """Queue a recipe for delivery to its author's followers."""
+
+    FanoutTask.objects.get_or_create(recipe=recipe)
+
+
+@atomic_write
+def fanout_batch(task, batch_size=None):
+    """
+    Deliver a queued recipe to the next batch of followers.
+
+    The task is deleted once every follower has the recipe, or straight
+    away if the recipe is no longer public or its author has too many
+    followers to fan out to.
+
+    Returns:
+        int: The number of followers delivered to.
+    """
+
+    config = get_feed_config()
+    recipe = task.recipe
+    author = recipe.author
+    if recipe.visibility != 'public' or (
+        author.followers_count > config['FANOUT_LIMIT']
+    ):
+        task.delete()
+        return 0
+
+    follower_ids = list(
+        author.followers.filter(id__gt=task.lastFollowerId)
+        .order_by('id')
+        .values_list('id', flat=True)[:batch_size or config['BATCH_SIZE']]
+    )
+    if not follower_ids:
+        task.delete()
+        return 0
+
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=follower_id, recipe=recipe, author=author, createdAt=recipe.createdAt)
+            for follower_id in follower_ids
+        ],
+        ignore_conflicts=True,
+    )
+    task.lastFollowerId = follower_ids[-1]
+    task.save(update_fields=['lastFollowerId'])
+    metrics.increment('delivered', len(follower_ids))
+    return len(follower_ids)
+
+
+def process_fanout_queue(batch_size=None, max_batches=None):
+    """
+    Work through queued fan-outs, oldest first.
+
+    Returns:
+        int: The number of timeline entries written.
+    """
+
+    delivered = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        task = (
+            FanoutTask.objects.filter(recipe__deletedAt__isnull=True)
+            .select_related('recipe__author').order_by('id').first()
+        )
+        if task is None:
+            break
+        delivered += fanout_batch(task, batch_size)
+        batches += 1
+    return delivered
+
+
+@atomic_write
+def backfill_timeline(user_id, author_ids):
+    """Copy the most recent public recipes of newly followed authors into a user's feed."""
+
+    backfill = get_feed_config()['BACKFILL']
+    entries = []
+    for author_id in author_ids:
+        recipes = Recipe.objects.filter(author_id=author_id, visibility='public').order_by('-createdAt')
+        entries += [
+            TimelineEntry(user_id=user_id, recipe_id=recipe_id, author_id=author_id, createdAt=created_at)
+            for recipe_id, created_at in recipes.values_list('id', 'createdAt')[:backfill]
+        ]
+    TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+def remove_from_timeline(user_id, author_ids):
+    """Remove unfollowed authors' recipes from a user's feed."""
+
+    TimelineEntry.objects.filter(user_id=user_id, author_id__in=author_ids).delete()
+
+
+def _before(cursor, created_field, id_field):
+    """Return the keyset filter for rows that come after ``cursor`` in a feed."""
+
+    created_at, recipe_id = cursor
+    return Q(**{f'{created_field}__lt': created_at}) | Q(**{created_field: created_at, f'{id_field}__lt': recipe_id})
+
+
+def get_feed(user, cursor=None, page_size=None):
+    """
+    Return one page of a user's following feed, newest first.
+
+    Args:
+        user (User): The user whose feed to read.
+        cursor (str): Position returned with the previous page, if any.
+        page_size (int): Number of recipes per page.
+
+    Returns:
+        tuple: ``(recipes, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+
+    page_size = page_size or get_feed_config()['PAGE_SIZE']
+    position = decode_cursor(cursor)
+
+    entries = TimelineEntry.objects.filter(user=user, recipe__deletedAt__isnull=True).select_related('recipe__author')
+    if position:
+        entries = entries.filter(_before(position, 'createdAt', 'recipe_id'))
+    rows = [
+        (entry.createdAt, entry.recipe_id, entry.recipe)
+        for entry in entries.order_by('-createdAt', '-recipe_id')[:page_size + 1]
+    ]
+
+    high_fanout = high_fanout_author_ids(user)
+    if high_fanout:
+        recipes = Recipe.objects.filter(author_id__in=high_fanout, visibility='public').select_related('author')
+        if position:
+            recipes = recipes.filter(_before(position, 'createdAt', 'id'))
+        # Skip recipes delivered before their author crossed the limit.
+        delivered = {recipe_id for _, recipe_id, _ in rows}
+        rows += [
+            (recipe.createdAt, recipe.id, recipe)
+            for recipe in recipes.order_by('-createdAt', '-id')[:page_size + 1]
+            if recipe.id not in delivered
+        ]
+        rows.sort(key=lambda row: row[:2], reverse=True)
+        metrics.increment('fanout_on_read')
+
+    page = rows[:page_size]
+    next_cursor = encode_cursor(*page[-1][:2]) if len(rows) > page_size else None
+    return [recipe for _, _, recipe in page], next_cursor
@@ -1,4 +1,5 @@
 from .log_in_form import *
 from .user_forms import *
 from .recipe_form import *
-from .rating_form import *
\ No newline at end of file
+from .rating_form import *
+from .import_form import *
\ No newline at end of file
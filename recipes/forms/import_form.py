@@ -0,0 +1,15 @@
+# recipes/forms/import_form.py
+
+from django import forms
+
+
+class RecipeImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="A JSON lines (.jsonl) or CSV (.csv) recipe dump",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.jsonl,.json,.csv'}),
+    )
+    format = forms.ChoiceField(
+        choices=[('', 'Detect from file name'), ('jsonl', 'JSON lines'), ('csv', 'CSV')],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
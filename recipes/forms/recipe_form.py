@@ -77,4 +77,13 @@ StepFormSet = inlineformset_factory(
     form=StepForm,
     extra=1,
     can_delete=True,
-)
\ No newline at end of file
+)
+
+
+def formset_texts(formset):
+    """Return the texts of a valid formset's filled-in, undeleted forms, in order."""
+    return [
+        f.cleaned_data["text"]
+        for f in formset.forms
+        if f.cleaned_data and not f.cleaned_data.get("DELETE")
+    ]
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, Any
 from django.http import HttpRequest
 from recipes.models import User, AdminLog
+from recipes.writes import atomic_write
 
 
 def is_admin(user: User) -> bool:
@@ -40,6 +41,7 @@ def can_flag_user_for_deletion(user: User) -> bool:
     return is_moderator(user)
 
 
+@atomic_write
 def log_action(
     actor: Optional[User],
     action_type: str,
@@ -51,6 +53,9 @@ def log_action(
 ) -> AdminLog:
     """
     Log an action performed by a user, moderator, or admin.
+
+    The insert is retried with backoff if the database is locked, unless
+    it is part of a larger transaction.
     
     Args:
         actor: The user who performed the action (None for system actions)
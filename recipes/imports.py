@@ -0,0 +1,348 @@
+"""
+Bulk import of recipe dumps in JSON lines or CSV.
+
+Each record has the shape of ``recipe_fixtures`` in the seed command:
+``name``, ``author`` (a username), ``description``, ``serves``,
+``difficulty``, ``prep_minutes``, ``cook_minutes``, ``cuisine``,
+``visibility`` and the lists ``tags``, ``ingredients`` and ``steps``. In
+CSV files the lists are single cells separated by ``|``.
+
+Files are read a record at a time and never held in memory. Records are
+validated with ``RecipeForm`` and written ``IMPORTS['CHUNK_SIZE']`` at a
+time, each chunk in one transaction with ``bulk_create``: a chunk takes a
+fixed number of statements however many recipes it holds (more only where
+SQLite's limit on query parameters splits a bulk insert). Authors and tags
+are resolved from in-memory maps filled once per chunk; unknown tags are
+created. The similarity and pantry indexes and feed fan-out tasks are
+written with the recipes, since ``bulk_create`` skips ``save()`` and its
+signals.
+"""
+
+import csv
+import json
+from datetime import timedelta
+from itertools import islice
+from typing import List, NamedTuple, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from recipes.forms.recipe_form import RecipeForm
+from recipes.ingredients import ingredient_words
+from recipes.metrics import get_metrics
+from recipes.minhash import band_hashes, compute_signature, recipe_tokens
+from recipes.models import (
+    FanoutTask,
+    IngredientPosting,
+    IngredientTerm,
+    LSHBucket,
+    Recipe,
+    RecipeIngredient,
+    RecipeSignature,
+    RecipeStep,
+    Tag,
+)
+from recipes.query_cache import invalidate_tables
+from recipes.writes import atomic_write
+
+
+DEFAULT_IMPORTS = {
+    # Recipes written per transaction.
+    'CHUNK_SIZE': 500,
+    # Row errors kept for the report; later ones are only counted.
+    'MAX_ERRORS': 100,
+}
+
+CSV_LIST_SEPARATOR = '|'
+
+FORMATS = ('jsonl', 'csv')
+
+# Tables written by an import, whose cached queries are invalidated after each chunk.
+WRITTEN_MODELS = (
+    Recipe, Recipe.tags.through, RecipeIngredient, RecipeStep, Tag,
+    RecipeSignature, LSHBucket, IngredientTerm, IngredientPosting, FanoutTask,
+)
+
+metrics = get_metrics('imports')
+
+
+class ImportResult(NamedTuple):
+    """The outcome of an import."""
+
+    created: int
+    failed: int
+    errors: List[Tuple[int, str]]
+    # True if reading stopped at bytes that are not valid UTF-8.
+    truncated: bool = False
+
+
+def get_import_config():
+    """Return the import configuration, with ``settings.IMPORTS`` over the defaults."""
+
+    config = dict(DEFAULT_IMPORTS)
+    config.update(getattr(settings, 'IMPORTS', {}) or {})
+    return config
+
+
+def detect_format(filename):
+    """Return the format of a dump from its file name: ``csv`` or ``jsonl``."""
+
+    return 'csv' if filename.lower().endswith('.csv') else 'jsonl'
+
+
+def read_records(lines, format='jsonl'):
+    """
+    Yield ``(number, record)`` pairs from an iterable of text lines.
+
+    ``number`` is the record's line (JSON lines) or row (CSV, not counting
+    the header). A record that cannot be decoded is yielded as a ``str``
+    error message instead of a dict.
+    """
+
+    if format == 'csv':
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            record = dict(row)
+            for key in ('tags', 'ingredients', 'steps'):
+                record[key] = [part.strip() for part in (row.get(key) or '').split(CSV_LIST_SEPARATOR) if part.strip()]
+            yield number, record
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield number, f'Invalid JSON: {error}'
+            continue
+        yield number, record if isinstance(record, dict) else 'Expected a JSON object'
+
+
+def _string_list(record, key):
+    value = record.get(key) or []
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f'{key} must be a list of strings')
+    return [item.strip() for item in value if item.strip()]
+
+
+def _minutes(record, key):
+    try:
+        return str(timedelta(minutes=int(record.get(key) or 0)))
+    except (TypeError, ValueError):
+        raise ValueError(f'{key} must be a whole number of minutes')
+
+
+def validate_record(record):
+    """
+    Check a record with the rules of ``RecipeForm``.
+
+    Returns:
+        tuple: An unsaved ``Recipe`` (without author) and the record's
+        ingredient, step and tag lists.
+
+    Raises:
+        ValueError: With a message naming what is wrong.
+    """
+
+    if not isinstance(record.get('author') or '', str):
+        raise ValueError('author must be a username')
+    ingredients = _string_list(record, 'ingredients')
+    steps = _string_list(record, 'steps')
+    tags = _string_list(record, 'tags')
+    for key, values, field in (('ingredients', ingredients, RecipeIngredient.text), ('tags', tags, Tag.name)):
+        max_length = field.field.max_length
+        if any(len(value) > max_length for value in values):
+            raise ValueError(f'{key} must be at most {max_length} characters each')
+
+    form = RecipeForm(data={
+        'name': record.get('name'),
+        'description': record.get('description'),
+        'serves': record.get('serves'),
+        'difficulty': record.get('difficulty'),
+        'prepTime': _minutes(record, 'prep_minutes'),
+        'cookTime': _minutes(record, 'cook_minutes'),
+        'cuisine': record.get('cuisine') or '',
+        'visibility': record.get('visibility'),
+    })
+    # Tags are resolved per chunk rather than looked up by the form row by row.
+    del form.fields['tags']
+    if not form.is_valid():
+        raise ValueError('; '.join(
+            f'{field}: {" ".join(messages)}' for field, messages in form.errors.items()
+        ))
+    return form.save(commit=False), ingredients, steps, tags
+
+
+def _resolve_tags(names, tag_ids):
+    """
+    Return the ids of ``names``, creating tags that are not in ``tag_ids``.
+
+    ``tag_ids`` is left alone: tags created here only exist once the
+    transaction commits.
+    """
+
+    resolved = {name: tag_ids[name] for name in names if name in tag_ids}
+    missing = set(names) - resolved.keys()
+    if missing:
+        Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+        resolved.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+    return resolved
+
+
+@atomic_write
+def insert_chunk(rows, tag_ids):
+    """
+    Write a chunk of validated recipes and everything derived from them.
+
+    Args:
+        rows (list): ``(recipe, ingredient_texts, step_texts, tag_names)``
+            tuples, each recipe with its author set.
+        tag_ids (dict): Tag name to id of tags known to exist.
+
+    Returns:
+        dict: Tag name to id of the chunk's tags, including any created.
+        Merge it into ``tag_ids`` once the chunk has committed: a retried
+        attempt must not trust tags created by one that rolled back.
+    """
+
+    tag_ids = _resolve_tags({name for *_, names in rows for name in names}, tag_ids)
+
+    recipes, ingredients, steps, tag_links = [], [], [], []
+    for recipe, ingredient_texts, step_texts, tag_names in rows:
+        recipe_ingredients = []
+        for position, text in enumerate(ingredient_texts, start=1):
+            ingredient = RecipeIngredient(recipe=recipe, text=text, position=position)
+            # bulk_create skips save(), which would parse the text.
+            ingredient.parse()
+            recipe_ingredients.append(ingredient)
+        recipe_steps = [
+            RecipeStep(recipe=recipe, text=text, position=position)
+            for position, text in enumerate(step_texts, start=1)
+        ]
+        # save() is skipped too, which would fill in the total time.
+        recipe.totalTime = recipe.prepTime + recipe.cookTime
+        recipe.content = Recipe.build_content(recipe_ingredients, recipe_steps)
+        recipes.append(recipe)
+        ingredients.extend(recipe_ingredients)
+        steps.extend(recipe_steps)
+
+    Recipe.objects.bulk_create(recipes)
+    RecipeIngredient.objects.bulk_create(ingredients)
+    RecipeStep.objects.bulk_create(steps)
+
+    Through = Recipe.tags.through
+    signatures, buckets, recipe_words = [], [], {}
+    for recipe, _, _, tag_names in rows:
+        names = list(dict.fromkeys(tag_names))
+        tag_links.extend(Through(recipe_id=recipe.pk, tag_id=tag_ids[name]) for name in names)
+        items = [row['item'] or row['text'] for row in recipe.content['ingredients']]
+        signature = compute_signature(recipe_tokens(items, names))
+        signatures.append(RecipeSignature(recipe=recipe, minhashes=signature))
+        if signature:
+            buckets.extend(
+                LSHBucket(recipe=recipe, band=band, bucket=bucket)
+                for band, bucket in enumerate(band_hashes(signature))
+            )
+        recipe_words[recipe.pk] = {word for item in items for word in ingredient_words(item)}
+    Through.objects.bulk_create(tag_links)
+    RecipeSignature.objects.bulk_create(signatures)
+    LSHBucket.objects.bulk_create(buckets)
+
+    words = set().union(*recipe_words.values())
+    if words:
+        IngredientTerm.objects.bulk_create([IngredientTerm(term=word) for word in words], ignore_conflicts=True)
+        term_ids = dict(IngredientTerm.objects.filter(term__in=words).values_list('term', 'id'))
+        IngredientPosting.objects.bulk_create([
+            IngredientPosting(term_id=term_ids[word], recipe_id=recipe_id, recipeTermCount=len(recipe_words[recipe_id]))
+            for recipe_id, own_words in recipe_words.items()
+            for word in own_words
+        ])
+
+    FanoutTask.objects.bulk_create([FanoutTask(recipe=recipe) for recipe in recipes if recipe.visibility == 'public'])
+    return tag_ids
+
+
+def import_recipes(lines, format='jsonl', default_author=None, chunk_size=None):
+    """
+    Import recipes from an iterable of text lines, such as an open file.
+
+    Records that fail validation, or name an author that does not exist,
+    are skipped and reported; the rest are imported. Text that is not valid
+    UTF-8 ends the import: the records read before it are still imported,
+    and the result is marked ``truncated``.
+
+    Args:
+        lines (iterable): The dump, read lazily.
+        format (str): ``jsonl`` or ``csv``.
+        default_author (User): Author of records without one.
+        chunk_size (int): Defaults to ``IMPORTS['CHUNK_SIZE']``.
+
+    Returns:
+        ImportResult: Counts of created and failed records and the first
+        ``IMPORTS['MAX_ERRORS']`` ``(number, message)`` errors.
+    """
+
+    config = get_import_config()
+    chunk_size = max(chunk_size or config['CHUNK_SIZE'], 1)
+    User = get_user_model()
+    author_ids = {default_author.username: default_author.pk} if default_author else {}
+    tag_ids = dict(Tag.objects.values_list('name', 'id'))
+    created = failed = 0
+    errors = []
+    truncated = False
+    last_number = 0
+
+    def fail(number, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < config['MAX_ERRORS']:
+            errors.append((number, message))
+
+    records = read_records(lines, format)
+    while not truncated:
+        chunk = []
+        try:
+            for item in islice(records, chunk_size):
+                chunk.append(item)
+        except UnicodeDecodeError:
+            truncated = True
+        if chunk:
+            last_number = chunk[-1][0]
+        if truncated:
+            errors.append((last_number + 1, 'Not UTF-8 text; the rest of the file was not read.'))
+        if not chunk:
+            break
+
+        rows = []
+        for number, record in chunk:
+            if isinstance(record, str):
+                fail(number, record)
+                continue
+            try:
+                recipe, ingredients, steps, tags = validate_record(record)
+            except ValueError as error:
+                fail(number, str(error))
+                continue
+            rows.append((number, record.get('author') or getattr(default_author, 'username', None),
+                         (recipe, ingredients, steps, tags)))
+
+        unknown = {username for _, username, _ in rows if username and username not in author_ids}
+        if unknown:
+            author_ids.update(User.objects.filter(username__in=unknown).values_list('username', 'id'))
+
+        valid = []
+        for number, username, row in rows:
+            if username not in author_ids:
+                fail(number, f'Unknown author: {username}' if username else 'No author')
+                continue
+            row[0].author_id = author_ids[username]
+            valid.append(row)
+
+        if valid:
+            tag_ids.update(insert_chunk(valid, tag_ids))
+            invalidate_tables([model._meta.db_table for model in WRITTEN_MODELS])
+            created += len(valid)
+            metrics.increment('recipes', len(valid))
+        metrics.increment('chunks')
+
+    metrics.increment('failures', failed)
+    return ImportResult(created=created, failed=failed, errors=sorted(errors), truncated=truncated)
@@ -0,0 +1,188 @@
+"""
+Parsing and normalisation of free-text ingredient lines.
+
+``parse_ingredient`` splits a line such as "1 1/2 tbsp olive oil, warmed"
+into a quantity, a normalised unit, the item and a preparation note. It runs
+once when a ``RecipeIngredient`` is saved, and the parts are stored on it.
+
+``ingredient_words`` reduces a line or item such as "2 large eggs, beaten"
+to the words that name the ingredient (``{'egg'}``), dropping quantities,
+units, adjectives, preparation notes after a comma and filler words.
+Similar-recipe signatures and the pantry index are both built from these
+words.
+"""
+
+import re
+from fractions import Fraction
+from typing import NamedTuple, Optional
+
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+IGNORED_WORDS = frozenset("""
+    a an and or of the to for with into in on at as by from about
+    cup cups tbsp tsp tablespoon tablespoons teaspoon teaspoons
+    g kg mg ml l oz lb lbs pound pounds gram grams kilogram kilograms litre litres liter liters
+    pinch dash handful pieces piece slice slices clove cloves can cans tin tins pack packet bunch
+    large small medium big fresh dried frozen ripe whole raw cooked ground
+    chopped diced sliced minced grated peeled crushed beaten melted softened halved
+    finely roughly thinly plus more extra taste approx optional
+""".split())
+
+
+# Plurals in -ves whose singular ends in -f; "olives" and "chives" only drop the s.
+IRREGULAR_PLURALS = {
+    'leaves': 'leaf',
+    'halves': 'half',
+    'loaves': 'loaf',
+    'calves': 'calf',
+}
+
+
+def normalise_word(word):
+    """Return a crude singular form of a word, so "eggs" and "egg" or "tomatoes" and "tomato" match."""
+
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('oes') and len(word) > 5 or word.endswith(('ches', 'shes', 'xes')) and len(word) > 4:
+        return word[:-2]
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def ingredient_words(text):
+    """Return the normalised words naming the ingredient in a free-text line."""
+
+    name = text.lower().split(',', 1)[0]
+    return {
+        normalise_word(word)
+        for word in WORD_PATTERN.findall(name)
+        if len(word) > 1 and word not in IGNORED_WORDS
+    }
+
+
+# Spellings of each unit, mapped to the normalised unit stored.
+UNITS = {
+    'g': ['g', 'gram', 'grams', 'gr'],
+    'kg': ['kg', 'kgs', 'kilogram', 'kilograms'],
+    'mg': ['mg', 'milligram', 'milligrams'],
+    'ml': ['ml', 'millilitre', 'millilitres', 'milliliter', 'milliliters'],
+    'l': ['l', 'litre', 'litres', 'liter', 'liters'],
+    'tsp': ['tsp', 'tsps', 'teaspoon', 'teaspoons'],
+    'tbsp': ['tbsp', 'tbsps', 'tbs', 'tablespoon', 'tablespoons'],
+    'cup': ['cup', 'cups'],
+    'oz': ['oz', 'ounce', 'ounces'],
+    'lb': ['lb', 'lbs', 'pound', 'pounds'],
+    'pinch': ['pinch', 'pinches'],
+    'clove': ['clove', 'cloves'],
+    'can': ['can', 'cans', 'tin', 'tins'],
+    'slice': ['slice', 'slices'],
+    'bunch': ['bunch', 'bunches'],
+    'handful': ['handful', 'handfuls'],
+    'piece': ['piece', 'pieces'],
+}
+
+UNIT_ALIASES = {alias: unit for unit, aliases in UNITS.items() for alias in aliases}
+
+UNICODE_FRACTIONS = {
+    '½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4', '⅛': '1/8',
+}
+
+# Mixed fractions first, so "1 1/2" is not read as 1.
+NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?"
+
+QUANTITY_PATTERN = re.compile(
+    rf"^(?P<quantity>{NUMBER})(?:\s*(?:-|to)\s*(?P<quantity_max>{NUMBER}))?\s*"
+)
+
+UNIT_PATTERN = re.compile(r"^(?P<unit>[a-z]+)\.?(?:\s+|$)(?:of\s+)?")
+
+# Words describing how an item is prepared or sized, moved into the note.
+NOTE_WORDS = frozenset("""
+    large small medium big chopped diced sliced minced grated peeled crushed beaten
+    melted softened halved finely roughly thinly
+""".split())
+
+TRAILING_NOTES = ('to taste', 'to serve', 'optional')
+
+
+class ParsedIngredient(NamedTuple):
+    """The parts of an ingredient line; any part may be missing."""
+
+    quantity: Optional[float]
+    quantity_max: Optional[float]
+    unit: str
+    item: str
+    note: str
+
+
+def parse_number(text):
+    """Parse "2", "1.5", "1/2" or "1 1/2" into a float, or None if it is not a number ("1/0")."""
+
+    try:
+        return float(sum(Fraction(part) for part in text.split()))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def parse_ingredient(text):
+    """
+    Split a free-text ingredient line into its parts.
+
+    "200g dried pasta" gives quantity 200, unit "g" and item "dried pasta";
+    "1 courgette, sliced" gives quantity 1, no unit, item "courgette" and
+    note "sliced". Ranges such as "2-3" set ``quantity_max``, and "a"/"an"
+    count as 1. Lines that do not start with a quantity, or have nothing
+    left after it ("1 1/2"), keep their whole name as the item and have no
+    quantity.
+    """
+
+    line = text.strip().lower()
+    for symbol, fraction in UNICODE_FRACTIONS.items():
+        line = re.sub(rf"(\d)\s*{symbol}", rf"\1 {fraction}", line).replace(symbol, fraction)
+
+    notes = []
+    line = re.sub(r"\(([^)]*)\)", lambda match: notes.append(match.group(1).strip()) or ' ', line)
+    if ',' in line:
+        line, note = line.split(',', 1)
+        notes.append(note.strip())
+
+    quantity = quantity_max = None
+    match = QUANTITY_PATTERN.match(line)
+    if match and parse_number(match.group('quantity')) is not None:
+        quantity = parse_number(match.group('quantity'))
+        if match.group('quantity_max'):
+            quantity_max = parse_number(match.group('quantity_max'))
+        line = line[match.end():]
+    elif re.match(r"^an?\s", line):
+        quantity = 1.0
+        line = line.split(None, 1)[1]
+
+    unit = ''
+    match = UNIT_PATTERN.match(line)
+    if match and match.group('unit') in UNIT_ALIASES and (quantity is not None or line[match.end():]):
+        unit = UNIT_ALIASES[match.group('unit')]
+        line = line[match.end():]
+
+    for trailing in TRAILING_NOTES:
+        if line.rstrip().endswith(trailing):
+            line = line.rstrip()[:-len(trailing)]
+            notes.insert(0, trailing)
+
+    words = line.split()
+    item = re.sub(r"\s+", ' ', ' '.join(word for word in words if word not in NOTE_WORDS)).strip(' .-')
+    if not item:
+        return ParsedIngredient(
+            quantity=None, quantity_max=None, unit='', item=re.sub(r"\s+", ' ', text.strip().lower()), note='',
+        )
+    notes.insert(0, ' '.join(word for word in words if word in NOTE_WORDS))
+    return ParsedIngredient(
+        quantity=quantity,
+        quantity_max=quantity_max,
+        unit=unit,
+        item=item,
+        note=', '.join(note for note in notes if note),
+    )
@@ -0,0 +1,39 @@
+"""
+Management command that fills in ``User.email_hash`` for existing users.
+
+``User.save()`` keeps the hash in sync from now on; this command covers
+users created before the field existed, or loaded from fixtures (which
+bypass ``save()``).
+"""
+
+from django.core.management.base import BaseCommand
+from recipes.models import User
+from recipes.models.user import hash_email
+
+
+class Command(BaseCommand):
+    help = 'Stores the gravatar email hash for users that are missing it or have a stale one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of users updated per query.')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        stale = []
+        updated = 0
+        for user in User.objects.only('id', 'email', 'email_hash').order_by('id').iterator(chunk_size=batch_size):
+            email_hash = hash_email(user.email)
+            if user.email_hash != email_hash:
+                user.email_hash = email_hash
+                stale.append(user)
+            if len(stale) >= batch_size:
+                updated += self.update(stale)
+        if stale:
+            updated += self.update(stale)
+        self.stdout.write(self.style.SUCCESS(f'Updated the email hash of {updated} users.'))
+
+    def update(self, users):
+        """Write a batch of users' hashes and empty the batch."""
+        count = User.objects.bulk_update(users, ['email_hash'])
+        users.clear()
+        return count
@@ -0,0 +1,29 @@
+"""
+Management command that builds MinHash signatures and LSH buckets.
+
+New recipes are indexed when they are saved; run this once to index
+recipes created before the index existed, or after changing
+``MINHASH['NUM_PERM']`` or ``MINHASH['BANDS']``, which makes every stored
+signature stale.
+"""
+
+from django.core.management.base import BaseCommand
+from recipes.minhash import index_recipe
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = 'Computes MinHash signatures and LSH buckets for similar-recipe lookup'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='Only index recipes without a signature.')
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.order_by('id')
+        if options['missing_only']:
+            recipes = recipes.filter(signature__isnull=True)
+        count = 0
+        for recipe in recipes.iterator():
+            index_recipe(recipe)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} recipes.'))
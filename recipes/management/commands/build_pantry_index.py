@@ -0,0 +1,28 @@
+"""
+Management command that builds the pantry search index.
+
+New recipes are indexed when they are saved; run this once to index
+recipes created before the index existed, or after changing how
+ingredient lines are normalised (recipes/ingredients.py).
+"""
+
+from django.core.management.base import BaseCommand
+from recipes.models import Recipe
+from recipes.pantry import index_ingredients
+
+
+class Command(BaseCommand):
+    help = "Indexes recipes' ingredient words for pantry search"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='Only index recipes without postings.')
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.order_by('id')
+        if options['missing_only']:
+            recipes = recipes.filter(ingredient_postings__isnull=True)
+        count = 0
+        for recipe in recipes.iterator():
+            index_ingredients(recipe)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} recipes.'))
@@ -0,0 +1,56 @@
+"""
+Management command that exports public recipes.
+
+``--format jsonl`` (the default) writes one recipe per line, in the shape
+``import_recipes`` reads, to a file or standard output. ``--format html``
+writes a static snapshot of every public recipe page to a directory for a
+file server or CDN (see recipes/exports.py); re-run it, for example with
+``--interval``, to keep the snapshot fresh.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from recipes.exports import export_html, export_jsonl
+
+
+class Command(BaseCommand):
+    help = 'Exports public recipes as JSON lines or a static HTML snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['jsonl', 'html'], default='jsonl')
+        parser.add_argument(
+            '--output',
+            default='-',
+            help="File for jsonl ('-' for standard output), or directory for html.",
+        )
+        parser.add_argument('--chunk-size', type=int, help='Recipes read per query.')
+        parser.add_argument('--interval', type=float, help='Keep running, exporting every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        if options['format'] == 'html' and options['output'] == '-':
+            raise CommandError('--format html needs an --output directory.')
+
+        while True:
+            self.export(options)
+            if not options.get('interval'):
+                break
+            connection.close()
+            time.sleep(options['interval'])
+
+    def export(self, options):
+        """Run one export and report it, on standard error if the recipes went to standard output."""
+        try:
+            if options['format'] == 'html':
+                written, removed = export_html(options['output'], options['chunk_size'])
+                message = f'Wrote {written} recipe pages, removed {removed}.'
+            elif options['output'] == '-':
+                message = f'Exported {export_jsonl(self.stdout, options["chunk_size"])} recipes.'
+            else:
+                with open(options['output'], 'w', encoding='utf-8') as out:
+                    message = f'Exported {export_jsonl(out, options["chunk_size"])} recipes.'
+        except OSError as error:
+            raise CommandError(f'Cannot write {options["output"]}: {error}')
+        report = self.stderr if options['format'] == 'jsonl' and options['output'] == '-' else self.stdout
+        report.write(self.style.SUCCESS(message))
@@ -0,0 +1,30 @@
+"""
+Management command that delivers queued recipes to followers' feeds.
+
+New public recipes are queued by a signal; this command fans them out
+to followers in batches. Run it from cron, or keep it running with
+``--interval``.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from recipes.feeds import process_fanout_queue
+
+
+class Command(BaseCommand):
+    help = "Delivers queued public recipes to their authors' followers' feeds"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Followers delivered to per transaction (defaults to FEED["BATCH_SIZE"]).')
+        parser.add_argument('--interval', type=float, help='Keep running, checking the queue every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            delivered = process_fanout_queue(batch_size=options.get('batch_size'))
+            self.stdout.write(self.style.SUCCESS(f'Delivered {delivered} timeline entries.'))
+            if not options.get('interval'):
+                return
+            connection.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,48 @@
+"""
+Management command that imports recipes from a JSON lines or CSV dump.
+
+Records use the shape of ``recipe_fixtures`` in the seed command (see
+recipes/imports.py). The file is streamed and written in chunked
+transactions, so catalogues of any size import in bounded memory.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from recipes.imports import FORMATS, detect_format, import_recipes
+
+
+class Command(BaseCommand):
+    help = 'Imports recipes from a JSON lines or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Path to the dump.')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to csv for .csv files, else jsonl.')
+        parser.add_argument('--author', help='Username credited for records without an author.')
+        parser.add_argument('--chunk-size', type=int, help='Recipes written per transaction.')
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            author = get_user_model().objects.filter(username=options['author']).first()
+            if author is None:
+                raise CommandError(f"No user named {options['author']}.")
+
+        try:
+            with open(options['file'], newline='', encoding='utf-8') as lines:
+                result = import_recipes(
+                    lines,
+                    format=options['format'] or detect_format(options['file']),
+                    default_author=author,
+                    chunk_size=options['chunk_size'],
+                )
+        except OSError as error:
+            raise CommandError(f'Cannot read {options["file"]}: {error}')
+
+        for number, message in result.errors:
+            self.stderr.write(f'Record {number}: {message}')
+        if result.truncated:
+            raise CommandError(
+                f'{options["file"]} is not UTF-8 text; imported {result.created} recipes '
+                f'({result.failed} skipped) before the first invalid byte.'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Imported {result.created} recipes ({result.failed} skipped).'))
@@ -0,0 +1,302 @@
+"""
+Management command that suggests missing database indexes.
+
+The command drives a short load test through the Django test client,
+records every SQL statement the views execute, groups them into query
+shapes (SQL with literals replaced by placeholders) and asks SQLite for
+the query plan of each shape. Shapes that need a full table scan or a
+temporary B-tree to sort are reported together with a suggested index.
+
+The requests run against a throwaway copy of the database and with
+in-memory caches, so whatever the views write (sessions, trending views,
+timeline reads) never reaches the live database or the shared cache, and
+live writers are never blocked by the load test.
+"""
+
+import json
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.utils import load_backend
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from recipes.models import Recipe, User
+from recipes.sqlite import snapshot_database
+
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?(?![\w\"])")
+IN_LIST = re.compile(r"IN \((?:\?, )*\?\)")
+WHERE_CLAUSE = re.compile(r" WHERE (.*?)(?: GROUP BY | ORDER BY | LIMIT |$)")
+ORDER_CLAUSE = re.compile(r" ORDER BY (.*?)(?: LIMIT |$)")
+FROM_TABLE = re.compile(r' FROM "(\w+)"')
+
+
+@contextmanager
+def scratch_database():
+    """
+    Point the default connection at a temporary copy of the database, with every cache in memory.
+
+    The copy is taken with ``snapshot_database`` and deleted afterwards,
+    together with anything written to it or to the caches.
+    """
+    original = connections[DEFAULT_DB_ALIAS]
+    if original.in_atomic_block:
+        # The backup would wait forever for this connection's own write lock.
+        raise CommandError('The load test cannot run inside a transaction.')
+    local_caches = {
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'index-advisor-{alias}'}
+        for alias in settings.CACHES
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'index_advisor.sqlite3')
+        snapshot_database(original, path)
+        copy = load_backend(original.settings_dict['ENGINE']).DatabaseWrapper(
+            {**original.settings_dict, 'NAME': path}, DEFAULT_DB_ALIAS,
+        )
+        connections[DEFAULT_DB_ALIAS] = copy
+        try:
+            with override_settings(CACHES=local_caches):
+                yield
+        finally:
+            copy.close()
+            connections[DEFAULT_DB_ALIAS] = original
+
+
+def normalise_sql(sql):
+    """
+    Reduce a SQL statement to its shape.
+
+    String and numeric literals become ``?`` and ``IN`` lists of any length
+    collapse to ``IN (...)`` so that requests for different objects map to
+    the same shape.
+    """
+    shape = STRING_LITERAL.sub('?', sql)
+    shape = NUMBER_LITERAL.sub('?', shape)
+    shape = IN_LIST.sub('IN (...)', shape)
+    return shape
+
+
+def plan_problems(plan_rows):
+    """
+    Return the plan steps that indicate a missing index.
+
+    Args:
+        plan_rows (list): Rows returned by ``EXPLAIN QUERY PLAN``.
+
+    Returns:
+        list[str]: Details of full scans and temporary sort B-trees.
+    """
+    problems = []
+    for row in plan_rows:
+        detail = row[-1]
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            problems.append(detail)
+        elif detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            problems.append(detail)
+    return problems
+
+
+def suggest_index(sql):
+    """
+    Suggest an index for a SELECT statement.
+
+    The suggestion uses the equality/``IN`` columns of the main table's
+    WHERE clause followed by its ORDER BY columns, which is the column
+    order SQLite needs to both filter and sort from one index.
+
+    Returns:
+        tuple or None: ``(table, equality_columns, order_columns)`` or None
+        when nothing useful can be derived.
+    """
+    table_match = FROM_TABLE.search(sql)
+    if not table_match:
+        return None
+    table = table_match.group(1)
+    equality_columns = []
+    order_columns = []
+
+    where_match = WHERE_CLAUSE.search(sql)
+    if where_match:
+        for column in re.findall(rf'"{table}"\."(\w+)" (?:= |IN \()', where_match.group(1)):
+            if column not in equality_columns:
+                equality_columns.append(column)
+
+    order_match = ORDER_CLAUSE.search(sql)
+    if order_match:
+        for column, direction in re.findall(rf'"{table}"\."(\w+)" (ASC|DESC)', order_match.group(1)):
+            if column not in equality_columns:
+                order_columns.append(f'-{column}' if direction == 'DESC' else column)
+
+    if not equality_columns and not order_columns:
+        return None
+    return table, equality_columns, order_columns
+
+
+def is_covered(equality_columns, order_columns, existing_indexes):
+    """
+    Return True if an existing index can serve the suggested one.
+
+    Equality columns may appear in any order at the front of the index;
+    the ordering columns must follow them in sequence. SQLite walks an
+    index in either direction, so sort direction is ignored.
+    """
+    size = len(equality_columns)
+    wanted_order = [column.lstrip('-') for column in order_columns]
+    for index_columns in existing_indexes:
+        if set(index_columns[:size]) != set(equality_columns):
+            continue
+        if index_columns[size:size + len(wanted_order)] == wanted_order:
+            return True
+    return False
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to record query shapes and suggest indexes.
+
+    Attributes:
+        help (str): Short description shown in ``manage.py help``.
+        SAMPLE_OBJECTS (int): Number of recipes and profiles visited per round.
+    """
+
+    SAMPLE_OBJECTS = 5
+    help = 'Runs a short load test and suggests indexes for slow query shapes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to run the load test as (defaults to the first admin).')
+        parser.add_argument('--rounds', type=int, default=1, help='Number of passes over the URL list.')
+        parser.add_argument('--url', action='append', dest='urls', help='URL to request (repeatable). Replaces the default URL set.')
+        parser.add_argument('--record', help='Write the recorded query shapes to this file as JSON lines.')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options.get('user'))
+        urls = options.get('urls') or self.default_urls(user)
+        shapes = self.record_shapes(user, urls, max(options['rounds'], 1))
+
+        if options.get('record'):
+            with open(options['record'], 'w') as handle:
+                for shape, data in shapes.items():
+                    handle.write(json.dumps({'shape': shape, 'count': data['count'], 'time': data['time']}) + '\n')
+
+        suggestions = self.analyse(shapes)
+        self.stdout.write(f"Recorded {sum(d['count'] for d in shapes.values())} queries in {len(shapes)} shapes over {len(urls)} URLs.")
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS('No missing indexes found.'))
+            return
+
+        for (table, columns), data in suggestions.items():
+            columns = list(columns)
+            self.stdout.write(self.style.WARNING(
+                f"\n{table} ({', '.join(columns)}) - {data['count']} queries, {data['time']:.4f}s"
+            ))
+            for problem in sorted(data['problems']):
+                self.stdout.write(f"  plan: {problem}")
+            self.stdout.write(f"  shape: {data['shape']}")
+            self.stdout.write(f"  suggest: models.Index(fields={columns!r})")
+
+    def get_user(self, username):
+        """Return the user the load test is run as."""
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User {username} does not exist.")
+        user = User.objects.filter(role=User.Roles.ADMIN).first() or User.objects.first()
+        if user is None:
+            raise CommandError('Unable to run the load test because no users exist.')
+        return user
+
+    def default_urls(self, user):
+        """Return the URLs covering the app's main read paths."""
+        urls = [
+            reverse('dashboard'),
+            reverse('favourites'),
+            reverse('search_user'),
+            reverse('view_logs'),
+        ]
+        for sort in ['-createdAt', '-averageRating', 'totalTime', 'name']:
+            urls.append(f"{reverse('search_recipe')}?sort={sort}")
+            urls.append(f"{reverse('search_recipe')}?sort={sort}&visibility=public&difficulty=easy")
+        for recipe_id in Recipe.objects.order_by('-createdAt').values_list('id', flat=True)[:self.SAMPLE_OBJECTS]:
+            urls.append(reverse('view_recipe', kwargs={'recipe_id': recipe_id}))
+        for user_id in User.objects.order_by('-date_joined').values_list('id', flat=True)[:self.SAMPLE_OBJECTS]:
+            urls.append(reverse('view_profile', kwargs={'user_id': user_id}))
+        return urls
+
+    def record_shapes(self, user, urls, rounds):
+        """
+        Request every URL and group the executed queries by shape.
+
+        The requests run against a scratch copy of the database, see
+        ``scratch_database``.
+
+        Returns:
+            OrderedDict: Shape -> ``{'count', 'time', 'sql'}`` where ``sql`` is
+            one concrete statement of that shape, used for ``EXPLAIN``.
+        """
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost'
+        shapes = OrderedDict()
+        with scratch_database():
+            client = Client(HTTP_HOST=host)
+            client.force_login(user)
+            for _ in range(rounds):
+                for url in urls:
+                    with CaptureQueriesContext(connection) as context:
+                        response = client.get(url)
+                    if response.status_code >= 400:
+                        self.stdout.write(self.style.WARNING(f"  {url} returned {response.status_code}"))
+                    for query in context.captured_queries:
+                        shape = normalise_sql(query['sql'])
+                        data = shapes.setdefault(shape, {'count': 0, 'time': 0.0, 'sql': query['sql']})
+                        data['count'] += 1
+                        data['time'] += float(query['time'])
+        return shapes
+
+    def analyse(self, shapes):
+        """
+        Explain each SELECT shape and collect index suggestions.
+
+        Returns:
+            OrderedDict: ``(table, columns)`` tuple -> aggregated problems, counts and
+            an example shape, ordered by total time spent.
+        """
+        suggestions = {}
+        existing = {}
+        with connection.cursor() as cursor:
+            for shape, data in shapes.items():
+                if not shape.startswith('SELECT'):
+                    continue
+                try:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {data['sql']}")
+                except Exception:
+                    continue
+                problems = plan_problems(cursor.fetchall())
+                if not problems:
+                    continue
+                suggestion = suggest_index(data['sql'])
+                if suggestion is None:
+                    continue
+                table, equality_columns, order_columns = suggestion
+                if table not in existing:
+                    constraints = connection.introspection.get_constraints(cursor, table)
+                    existing[table] = [c['columns'] for c in constraints.values() if c['index'] or c['unique']]
+                if is_covered(equality_columns, order_columns, existing[table]):
+                    continue
+                columns = tuple(equality_columns + order_columns)
+                entry = suggestions.setdefault((table, columns), {
+                    'count': 0, 'time': 0.0, 'problems': set(), 'shape': shape,
+                })
+                entry['count'] += data['count']
+                entry['time'] += data['time']
+                entry['problems'].update(problems)
+
+        ordered = sorted(suggestions.items(), key=lambda item: item[1]['time'], reverse=True)
+        return OrderedDict(ordered)
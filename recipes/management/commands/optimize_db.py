@@ -0,0 +1,27 @@
+"""
+Management command that refreshes SQLite's query planner statistics.
+
+Intended to be run on a schedule (e.g. an hourly cron job or a
+PythonAnywhere scheduled task) so the planner keeps choosing the
+indexes added for the app's access patterns.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from recipes.sqlite import optimize
+
+
+class Command(BaseCommand):
+    help = 'Runs PRAGMA optimize (and optionally ANALYZE) on the SQLite database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', help='Run a full ANALYZE before PRAGMA optimize.')
+        parser.add_argument('--database', default='default', help='Database alias to optimize.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database '{options['database']}' is not SQLite.")
+
+        optimize(connection, analyze=options['analyze'])
+        self.stdout.write(self.style.SUCCESS(f"Optimized database '{options['database']}'."))
@@ -0,0 +1,64 @@
+"""
+Management command that fills in the structured fields of ingredients.
+
+``RecipeIngredient.save()`` parses new and edited lines; this command
+covers ingredients saved before the fields existed, loaded from fixtures
+(which bypass ``save()``), or written with ``bulk_create``. Re-run it with
+``--all`` after improving the parser.
+
+Each batch also rebuilds ``Recipe.content`` for the recipes it touches, which
+is what recipe pages, scaling and exports read. It bumps their ``updatedAt``,
+so caches keyed on it miss, and reindexes their similarity and pantry entries.
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from recipes.minhash import index_recipe
+from recipes.models import Recipe, RecipeIngredient
+from recipes.pantry import index_ingredients
+from recipes.writes import atomic_write
+
+
+class Command(BaseCommand):
+    help = 'Parses ingredient text into quantity, unit, item and note'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of ingredients updated per query.')
+        parser.add_argument('--all', action='store_true', help='Re-parse every ingredient, not just unparsed ones.')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        ingredients = RecipeIngredient.objects.order_by('id')
+        if not options['all']:
+            ingredients = ingredients.filter(item='')
+        batch = []
+        updated = 0
+        for ingredient in ingredients.iterator(chunk_size=batch_size):
+            ingredient.parse()
+            batch.append(ingredient)
+            if len(batch) >= batch_size:
+                updated += update_batch(batch)
+                batch = []
+        if batch:
+            updated += update_batch(batch)
+        self.stdout.write(self.style.SUCCESS(f'Parsed {updated} ingredients.'))
+
+
+@atomic_write
+def update_batch(ingredients):
+    """Write a batch of parsed ingredients and refresh their recipes' content and indexes."""
+
+    count = RecipeIngredient.objects.bulk_update(ingredients, RecipeIngredient.PARSED_FIELDS)
+    recipes = list(
+        Recipe.objects.filter(pk__in={ingredient.recipe_id for ingredient in ingredients})
+        .prefetch_related('ingredients', 'steps')
+    )
+    now = timezone.now()
+    for recipe in recipes:
+        recipe.content = Recipe.build_content(recipe.ingredients.all(), recipe.steps.all())
+        recipe.updatedAt = now
+    Recipe.objects.bulk_update(recipes, ['content', 'updatedAt'])
+    for recipe in recipes:
+        index_recipe(recipe)
+        index_ingredients(recipe)
+    return count
@@ -0,0 +1,37 @@
+"""
+Management command that downloads users' gravatars into the local avatar cache.
+
+The avatar proxy never contacts gravatar.com while serving a page; this
+command is the only thing that does. Run it on a schedule from a host
+with outbound access. Users without a gravatar keep their identicon.
+"""
+
+from django.core.management.base import BaseCommand
+from recipes.avatars import AvatarCache, fetch_remote, get_avatar_config, metrics
+from recipes.models import User
+from recipes.models.user import hash_email
+
+
+class Command(BaseCommand):
+    help = 'Downloads gravatars for users into the local avatar cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, action='append', dest='sizes', help='Avatar size to fetch (repeatable). Defaults to AVATARS["SIZES"].')
+        parser.add_argument('--missing-only', action='store_true', help='Skip avatars that are already cached.')
+
+    def handle(self, *args, **options):
+        sizes = options.get('sizes') or get_avatar_config()['SIZES']
+        cache = AvatarCache()
+        fetched = 0
+        for email, email_hash in User.objects.values_list('email', 'email_hash').iterator():
+            email_hash = email_hash or hash_email(email)
+            for size in sizes:
+                if options['missing_only'] and cache.get(email_hash, size) is not None:
+                    continue
+                image = fetch_remote(email_hash, size)
+                if image is None:
+                    continue
+                cache.put(email_hash, size, *image)
+                metrics.increment('fetched')
+                fetched += 1
+        self.stdout.write(self.style.SUCCESS(f'Cached {fetched} avatars.'))
@@ -0,0 +1,30 @@
+"""
+Management command that hard-deletes recipes their authors or admins deleted.
+
+Deleting a recipe only marks it deleted; this command removes it and every
+row that references it in batches (see recipes/purge.py). Run it from cron,
+or keep it running with ``--interval``.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from recipes.purge import purge_recipes
+
+
+class Command(BaseCommand):
+    help = 'Hard-deletes deleted recipes and their ratings, favourites, ingredients and steps'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Recipes deleted per transaction (defaults to PURGE["BATCH_SIZE"]).')
+        parser.add_argument('--interval', type=float, help='Keep running, purging every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            purged = purge_recipes(batch_size=options.get('batch_size'))
+            self.stdout.write(self.style.SUCCESS(f'Purged {purged} recipes.'))
+            if not options.get('interval'):
+                return
+            connection.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,42 @@
+"""
+Management command that refreshes the local read replica.
+
+Copies the primary database into the replica file with the SQLite backup
+API. Run it from cron, or keep it running with ``--interval``; set
+``READ_REPLICA['STICKY_SECONDS']`` longer than the refresh interval so
+users keep reading their own writes from the primary.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from recipes.routers import get_replica_config
+from recipes.sqlite import snapshot_database
+
+
+class Command(BaseCommand):
+    help = 'Copies the primary SQLite database into the read replica'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep running, refreshing every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        alias = get_replica_config()['ALIAS']
+        if alias not in connections.settings:
+            raise CommandError(f"No '{alias}' database is configured.")
+        primary = connections[DEFAULT_DB_ALIAS]
+        target = connections[alias].settings_dict['NAME']
+        if target == primary.settings_dict['NAME']:
+            raise CommandError(f"The '{alias}' database points at the primary database.")
+
+        while True:
+            started = time.monotonic()
+            snapshot_database(primary, target)
+            self.stdout.write(self.style.SUCCESS(
+                f"Refreshed '{alias}' in {time.monotonic() - started:.2f}s."
+            ))
+            if not options.get('interval'):
+                return
+            primary.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+"""
+Management command that rescales recipes' trending scores.
+
+Trending scores grow as the epoch they are measured from gets older (see
+recipes/trending.py). This command re-expresses them relative to now.
+Run it from cron (hourly is plenty), or keep it running with
+``--interval``.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from recipes.trending import rescale_trending_scores
+
+
+class Command(BaseCommand):
+    help = "Rescales recipes' trending scores to the current time"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep running, rescaling every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            factor = rescale_trending_scores()
+            self.stdout.write(self.style.SUCCESS(f'Rescaled trending scores by 1/{factor:.4g}.'))
+            if not options.get('interval'):
+                return
+            connection.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,142 @@
+"""
+Management command that benchmarks the SQLite pragma profile.
+
+The benchmark builds a throwaway database file, then runs concurrent
+reader threads (search-style sorted listings) and writer threads
+(rating inserts plus a recipe stats update) against it twice: once with
+SQLite's defaults, as Django opens it out of the box, and once with the
+pragma profile from ``recipes.sqlite``. It reports reads and writes per
+second and how many writes failed with "database is locked".
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from random import randint
+
+from django.core.management.base import BaseCommand
+from recipes.sqlite import get_pragma_profile, pragma_statements
+
+
+SCHEMA = [
+    'CREATE TABLE recipe (id INTEGER PRIMARY KEY, name TEXT, visibility TEXT, '
+    'averageRating REAL DEFAULT 0, ratingCount INTEGER DEFAULT 0, createdAt INTEGER)',
+    'CREATE INDEX recipe_visibility_created ON recipe (visibility, createdAt)',
+    'CREATE TABLE rating (id INTEGER PRIMARY KEY, recipe_id INTEGER, user_id INTEGER, rating INTEGER)',
+    'CREATE INDEX rating_recipe ON rating (recipe_id)',
+]
+
+READ_QUERY = (
+    "SELECT id, name, averageRating FROM recipe WHERE visibility = 'public' "
+    'ORDER BY createdAt DESC LIMIT 20'
+)
+
+
+class Command(BaseCommand):
+    """
+    Build automation command to compare default and tuned SQLite settings.
+
+    Attributes:
+        RECIPE_COUNT (int): Number of recipes in the benchmark database.
+        help (str): Short description shown in ``manage.py help``.
+    """
+
+    RECIPE_COUNT = 2000
+    help = 'Benchmarks concurrent reads and writes with default and tuned SQLite pragmas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run each mode for.')
+        parser.add_argument('--readers', type=int, default=4, help='Number of reader threads.')
+        parser.add_argument('--writers', type=int, default=2, help='Number of writer threads.')
+
+    def handle(self, *args, **options):
+        for mode in ['default', 'profile']:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                self.create_database(path)
+                result = self.run_mode(path, mode, options['duration'], options['readers'], options['writers'])
+            self.stdout.write(
+                f"{mode:>8}: {result['reads'] / result['elapsed']:10.1f} reads/s "
+                f"{result['writes'] / result['elapsed']:10.1f} writes/s "
+                f"{result['locked']:6d} locked errors"
+            )
+
+    def create_database(self, path):
+        """Create and populate the benchmark database."""
+        connection = sqlite3.connect(path)
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.executemany(
+            'INSERT INTO recipe (name, visibility, createdAt) VALUES (?, ?, ?)',
+            [(f'Recipe {i}', 'public' if i % 3 else 'private', i) for i in range(self.RECIPE_COUNT)],
+        )
+        connection.commit()
+        connection.close()
+
+    def connect(self, path, mode):
+        """Open a connection configured like Django would for the given mode."""
+        if mode == 'default':
+            return sqlite3.connect(path, check_same_thread=False)
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        for statement in pragma_statements(get_pragma_profile()):
+            connection.execute(statement)
+        return connection
+
+    def run_mode(self, path, mode, duration, readers, writers):
+        """Run the reader and writer threads and collect their counters."""
+        counters = {'reads': 0, 'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def count(key):
+            with lock:
+                counters[key] += 1
+
+        def reader():
+            connection = self.connect(path, mode)
+            while time.monotonic() < deadline:
+                try:
+                    connection.execute(READ_QUERY).fetchall()
+                    count('reads')
+                except sqlite3.OperationalError:
+                    count('locked')
+            connection.close()
+
+        def writer():
+            connection = self.connect(path, mode)
+            while time.monotonic() < deadline:
+                recipe_id = randint(1, self.RECIPE_COUNT)
+                try:
+                    if mode != 'default':
+                        connection.execute('BEGIN IMMEDIATE')
+                    connection.execute(
+                        'INSERT INTO rating (recipe_id, user_id, rating) VALUES (?, ?, ?)',
+                        (recipe_id, randint(1, 1000), randint(1, 5)),
+                    )
+                    connection.execute(
+                        'UPDATE recipe SET (averageRating, ratingCount) = '
+                        '(SELECT AVG(rating), COUNT(*) FROM rating WHERE recipe_id = ?) WHERE id = ?',
+                        (recipe_id, recipe_id),
+                    )
+                    if mode == 'default':
+                        connection.commit()
+                    else:
+                        connection.execute('COMMIT')
+                    count('writes')
+                except sqlite3.OperationalError:
+                    if connection.in_transaction:
+                        connection.rollback()
+                    count('locked')
+            connection.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counters['elapsed'] = time.monotonic() - started
+        return counters
@@ -0,0 +1,38 @@
+"""
+Management command that refreshes the "people who liked this also liked" data.
+
+By default only recipes whose ratings or favourites changed since the
+last run are recomputed. Run it from cron, or keep it running with
+``--interval``, and run it with ``--full`` nightly to rebuild every
+recipe's neighbour list.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from recipes.recommendations import update_similarities
+
+
+class Command(BaseCommand):
+    help = 'Recomputes item-item recipe similarities from ratings and favourites'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every recipe, not just the queued ones.')
+        parser.add_argument('--top-k', type=int, help='Neighbours kept per recipe (defaults to RECOMMENDATIONS["TOP_K"]).')
+        parser.add_argument('--interval', type=float, help='Keep running, checking the queue every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            started = time.monotonic()
+            count = update_similarities(full=full, top_k=options.get('top_k'))
+            self.stdout.write(self.style.SUCCESS(
+                f'Recomputed similarities for {count} recipes in {time.monotonic() - started:.2f}s.'
+            ))
+            if not options.get('interval'):
+                return
+            # Only the first pass is a full rebuild; later passes drain the queue.
+            full = False
+            connection.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,168 @@
+"""
+Weekly meal plans and their aggregated shopping lists.
+
+``shopping_list`` merges the parsed ingredients of every planned recipe in
+one grouped query: each ingredient row is scaled by its entry's servings,
+converted to the smallest unit of its family (g, ml, tsp or oz) and summed
+per item and unit. Only the grouped totals are promoted back to readable
+units in Python.
+
+Shopping lists are cached under a key built from the plan's ``updatedAt``
+(touched whenever its entries change) and the latest ``updatedAt`` of its
+recipes, so editing the plan or any planned recipe makes a fresh list.
+"""
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Case, Count, F, FloatField, Max, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from recipes.ingredients import normalise_word
+from recipes.metrics import get_metrics
+from recipes.models import MealPlan, MealPlanEntry
+from recipes.scaling import UNIT_FAMILIES, format_ingredient, promote_unit
+from recipes.writes import atomic_write
+
+
+DEFAULT_MEAL_PLANS = {
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Each unit's family base unit and its size in that unit.
+BASE_UNITS = {
+    unit: (min(family, key=family.get), size)
+    for family in UNIT_FAMILIES
+    for unit, size in family.items()
+}
+
+metrics = get_metrics('meal_plans')
+
+
+def get_meal_plan_config():
+    """Return the meal plan configuration, with ``settings.MEAL_PLANS`` over the defaults."""
+
+    config = dict(DEFAULT_MEAL_PLANS)
+    config.update(getattr(settings, 'MEAL_PLANS', {}) or {})
+    return config
+
+
+def week_start(day=None):
+    """Return the Monday of the week containing ``day`` (default today)."""
+
+    day = day or date.today()
+    return day - timedelta(days=day.weekday())
+
+
+def get_plan(user, week, create=False):
+    """Return ``user``'s plan for the week starting ``week``, or None if there is none and ``create`` is False."""
+
+    if create:
+        return MealPlan.objects.get_or_create(user=user, weekStart=week)[0]
+    return MealPlan.objects.filter(user=user, weekStart=week).first()
+
+
+@atomic_write
+def add_entry(user, week, recipe, day, serves=None):
+    """Plan ``recipe`` on ``day`` of a week, creating the plan if needed."""
+
+    plan = get_plan(user, week, create=True)
+    entry = MealPlanEntry.objects.create(plan=plan, recipe=recipe, day=day, serves=serves)
+    plan.save(update_fields=['updatedAt'])
+    return entry
+
+
+@atomic_write
+def remove_entry(entry):
+    """Remove an entry from its plan."""
+
+    plan = entry.plan
+    entry.delete()
+    plan.save(update_fields=['updatedAt'])
+
+
+def _unit_case(mapping, default):
+    return Case(
+        *[When(recipe__ingredients__unit=unit, then=Value(value)) for unit, value in mapping.items()],
+        default=default,
+    )
+
+
+def _grouped_ingredients(plan):
+    """Sum the planned recipes' ingredients per item and base unit, in one query."""
+
+    factor = Cast(Coalesce('serves', 'recipe__serves'), FloatField()) / Cast('recipe__serves', FloatField())
+    base_unit = _unit_case({unit: base for unit, (base, _) in BASE_UNITS.items()}, F('recipe__ingredients__unit'))
+    size = _unit_case({unit: float(size) for unit, (_, size) in BASE_UNITS.items()}, Value(1.0))
+    return (
+        # One filter() call, so the annotations below reuse its ingredient join.
+        MealPlanEntry.objects.filter(
+            plan=plan, recipe__deletedAt__isnull=True, recipe__serves__gt=0, recipe__ingredients__item__gt=''
+        )
+        .annotate(item=F('recipe__ingredients__item'), base_unit=base_unit)
+        .values('item', 'base_unit')
+        .annotate(
+            total=Sum(F('recipe__ingredients__quantity') * size * factor, output_field=FloatField()),
+            recipes=Count('recipe', distinct=True),
+        )
+        .order_by('item', 'base_unit')
+    )
+
+
+def build_shopping_list(plan):
+    """
+    Return the merged ingredients of a plan.
+
+    Grouped rows whose items differ only by plural ("egg" and "eggs") are
+    merged, and named in the plural when more than one is needed.
+
+    Returns:
+        list: Dicts with ``item``, ``quantity`` and ``unit`` (both None/''
+        for items planned without a quantity, such as "salt to taste"),
+        ``text`` for display and ``recipes`` (how many recipes use it).
+    """
+
+    merged = {}
+    for row in _grouped_ingredients(plan):
+        singular = ' '.join(normalise_word(word) for word in row['item'].split())
+        entry = merged.setdefault((singular, row['base_unit']), {'names': set(), 'total': 0.0, 'recipes': 0})
+        entry['names'].add(row['item'])
+        entry['total'] += row['total'] or 0.0
+        entry['recipes'] += row['recipes']
+
+    items = []
+    for (singular, base_unit), entry in merged.items():
+        plurals = sorted(entry['names'] - {singular})
+        if entry['total']:
+            quantity, unit, _ = promote_unit(entry['total'], base_unit)
+            name = plurals[0] if plurals and (quantity > 1 or singular not in entry['names']) else singular
+            text = format_ingredient(quantity, None, unit, name, '')
+        else:
+            quantity, unit = None, ''
+            name = text = singular if singular in entry['names'] else plurals[0]
+        items.append({
+            'item': name,
+            'quantity': quantity,
+            'unit': unit,
+            'text': text,
+            'recipes': entry['recipes'],
+        })
+    return items
+
+
+def shopping_list(plan):
+    """Return the plan's shopping list, cached until the plan or any of its recipes changes."""
+
+    config = get_meal_plan_config()
+    latest = plan.entries.aggregate(latest=Max('recipe__updatedAt'))['latest']
+    key = f'shopping_list:{plan.pk}:{plan.updatedAt.timestamp()}:{latest.timestamp() if latest else 0}'
+    cache = caches[config['CACHE']]
+    items = cache.get(key)
+    if items is None:
+        metrics.increment('misses')
+        items = build_shopping_list(plan)
+        cache.set(key, items, config['TIMEOUT'])
+    else:
+        metrics.increment('hits')
+    return items
@@ -0,0 +1,62 @@
+"""
+In-process metrics counters.
+
+Each subsystem gets a named ``Metrics`` instance from ``get_metrics()``
+and bumps counters on it. Values are per process and reset on restart;
+admins can read a snapshot of all of them from the ``metrics`` view.
+"""
+
+import threading
+
+
+class Metrics:
+    """Thread-safe set of named numeric counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def increment(self, name, amount=1):
+        """Add ``amount`` (an int, or a float for durations) to a counter."""
+
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def get(self, name):
+        """Return the current value of a counter (0 if never incremented)."""
+
+        with self._lock:
+            return self._values.get(name, 0)
+
+    def snapshot(self):
+        """Return a copy of all counters."""
+
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        """Clear all counters."""
+
+        with self._lock:
+            self._values.clear()
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_metrics(namespace):
+    """Return the ``Metrics`` instance for a namespace, creating it on first use."""
+
+    with _registry_lock:
+        if namespace not in _registry:
+            _registry[namespace] = Metrics()
+        return _registry[namespace]
+
+
+def snapshot_all():
+    """Return ``{namespace: counters}`` for every registered namespace."""
+
+    with _registry_lock:
+        namespaces = dict(_registry)
+    return {namespace: metrics.snapshot() for namespace, metrics in sorted(namespaces.items())}
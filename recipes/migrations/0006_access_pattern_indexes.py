@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_user_flagged_for_deletion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-createdAt'], name='recipes_rec_author__4fb654_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['visibility', 'difficulty', '-createdAt'], name='recipes_rec_visibil_39f1d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-createdAt'], name='recipes_rec_created_a57a8c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-averageRating'], name='recipes_rec_average_04fb8e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['totalTime'], name='recipes_rec_totalTi_f9df3a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['visibility', '-createdAt'], name='recipes_rec_visibil_ad7534_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['visibility', '-averageRating'], name='recipes_rec_visibil_58e801_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipefavourite',
+            index=models.Index(fields=['user', '-savedAt'], name='recipes_rec_user_id_c572a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipeingredient',
+            index=models.Index(fields=['recipe', 'position'], name='recipes_rec_recipe__30be05_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reciperating',
+            index=models.Index(fields=['user', '-createdAt'], name='recipes_rec_user_id_1c3520_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reciperating',
+            index=models.Index(fields=['recipe', '-createdAt'], name='recipes_rec_recipe__f6f290_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipestep',
+            index=models.Index(fields=['recipe', 'position'], name='recipes_rec_recipe__dc4d99_idx'),
+        ),
+    ]
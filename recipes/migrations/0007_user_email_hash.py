@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Gravatar hash of the email address, kept in sync by save().', max_length=32),
+        ),
+    ]
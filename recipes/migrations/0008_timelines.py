@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_user_email_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FanoutTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lastFollowerId', models.PositiveIntegerField(default=0)),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fanout_task', to='recipes.recipe')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='recipes.recipe')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-createdAt', '-recipe'], name='recipes_tim_user_id_6b4ab0_idx'), models.Index(fields=['user', 'author'], name='recipes_tim_user_id_0b0646_idx')],
+                'unique_together': {('user', 'recipe')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_follows(apps, schema_editor):
+    """Fill the new counters from the existing follow table."""
+    User = apps.get_model('recipes', 'User')
+    Follow = User.following.through
+
+    def total(column):
+        return Coalesce(Subquery(
+            Follow.objects.filter(**{column: OuterRef('pk')})
+            .values(column).annotate(total=Count('*')).values('total')
+        ), 0)
+
+    User.objects.update(
+        followers_count=total('to_user'),
+        following_count=total('from_user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_timelines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+    ]
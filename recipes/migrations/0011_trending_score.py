@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_recipe_similarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('startedAt', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='trendingScore',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-trendingScore'], name='recipes_rec_trendin_73b5f3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['visibility', '-trendingScore'], name='recipes_rec_visibil_821d5c_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:20
+
+from django.db import migrations, models
+
+
+INGREDIENT_FIELDS = ("position", "text", "quantity", "quantityMax", "unit", "item", "note")
+
+
+def fill_content(apps, schema_editor):
+    """Copy existing recipes' ingredients and steps into the new column."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    recipes = Recipe.objects.prefetch_related('ingredients', 'steps').order_by('id')
+    batch = []
+    for recipe in recipes.iterator(chunk_size=500):
+        recipe.content = {
+            "ingredients": [
+                {field: getattr(ingredient, field) for field in INGREDIENT_FIELDS}
+                for ingredient in sorted(recipe.ingredients.all(), key=lambda ingredient: ingredient.position)
+            ],
+            "steps": [
+                {"position": step.position, "text": step.text}
+                for step in sorted(recipe.steps.all(), key=lambda step: step.position)
+            ],
+        }
+        batch.append(recipe)
+        if len(batch) >= 500:
+            Recipe.objects.bulk_update(batch, ['content'])
+            batch = []
+    Recipe.objects.bulk_update(batch, ['content'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0015_meal_plans'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='content',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(fill_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0016_recipe_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('snapshot', models.JSONField(blank=True, null=True)),
+                ('delta', models.JSONField(blank=True, null=True)),
+                ('changedFields', models.JSONField(blank=True, default=list)),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recipe_revisions', to=settings.AUTH_USER_MODEL)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='recipes.recipe')),
+            ],
+            options={
+                'ordering': ['-number'],
+                'unique_together': {('recipe', 'number')},
+            },
+        ),
+    ]
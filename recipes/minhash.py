@@ -0,0 +1,208 @@
+"""
+Content-based similar and near-duplicate recipes with MinHash and LSH.
+
+A recipe is reduced to a set of tokens: the words naming its ingredients
+(see recipes/ingredients.py) and its tags. The Jaccard similarity of two
+such sets is estimated by the fraction of positions where their MinHash
+signatures agree.
+
+Signatures are split into ``MINHASH['BANDS']`` bands, each hashed into an
+``LSHBucket`` row. Recipes that share any bucket are candidates, found
+with one indexed lookup per band, so no pairwise comparison over the
+catalogue is ever made. Candidates are then ranked by estimated similarity.
+
+Signatures are computed when a recipe is written (``index_recipe``); the
+``build_minhash_index`` command backfills existing recipes.
+"""
+
+import hashlib
+import random
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import Count, Q
+from recipes.ingredients import ingredient_words
+from recipes.metrics import get_metrics
+from recipes.models import LSHBucket, Recipe, RecipeSignature
+from recipes.writes import atomic_write
+
+
+DEFAULT_MINHASH = {
+    # NUM_PERM must be a multiple of BANDS. 16 bands of 4 rows make recipes
+    # with a Jaccard similarity of about 0.5 a candidate half the time.
+    'NUM_PERM': 64,
+    'BANDS': 16,
+    # Minimum estimated similarity for "similar recipes".
+    'SIMILAR_THRESHOLD': 0.3,
+    # Minimum estimated similarity for a duplicate warning.
+    'DUPLICATE_THRESHOLD': 0.8,
+    # Candidates sharing the most buckets that are scored per lookup.
+    'MAX_CANDIDATES': 200,
+}
+
+# Mersenne prime for the (a * x + b) mod p hash family.
+PRIME = (1 << 61) - 1
+
+metrics = get_metrics('minhash')
+
+
+def get_minhash_config():
+    """Return the MinHash configuration, with ``settings.MINHASH`` over the defaults."""
+
+    config = dict(DEFAULT_MINHASH)
+    config.update(getattr(settings, 'MINHASH', {}) or {})
+    return config
+
+
+def recipe_tokens(ingredient_texts, tag_names):
+    """Return the token set for a recipe's ingredient lines and tag names."""
+
+    tokens = {f"i:{word}" for text in ingredient_texts for word in ingredient_words(text)}
+    tokens.update(f"t:{name.lower()}" for name in tag_names)
+    return tokens
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'big')
+
+
+@lru_cache(maxsize=4)
+def _permutations(num_perm):
+    # Fixed seed: signatures must be comparable across processes and restarts.
+    rng = random.Random(num_perm)
+    return [(rng.randrange(1, PRIME), rng.randrange(0, PRIME)) for _ in range(num_perm)]
+
+
+def compute_signature(tokens, num_perm=None):
+    """Return the MinHash signature of a token set, or an empty list for no tokens."""
+
+    if not tokens:
+        return []
+    hashes = [_token_hash(token) for token in tokens]
+    return [
+        min((a * value + b) % PRIME for value in hashes)
+        for a, b in _permutations(num_perm or get_minhash_config()['NUM_PERM'])
+    ]
+
+
+def band_hashes(signature, bands=None):
+    """Return one signed 64-bit bucket per band of a signature."""
+
+    bands = bands or get_minhash_config()['BANDS']
+    rows = len(signature) // bands
+    return [
+        int.from_bytes(
+            hashlib.blake2b(repr(signature[band * rows:(band + 1) * rows]).encode(), digest_size=8).digest(),
+            'big',
+            signed=True,
+        )
+        for band in range(bands)
+    ]
+
+
+def estimate_similarity(signature, other):
+    """Estimate the Jaccard similarity of two recipes from their signatures."""
+
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(a == b for a, b in zip(signature, other)) / len(signature)
+
+
+@atomic_write
+def index_recipe(recipe):
+    """
+    Compute a recipe's signature from its saved ingredients and tags and
+    replace its LSH buckets.
+
+    Returns:
+        list: The signature (empty if the recipe has no usable tokens).
+    """
+
+    signature = compute_signature(recipe_tokens(
+        [item or text for item, text in recipe.ingredients.values_list('item', 'text')],
+        recipe.tags.values_list('name', flat=True),
+    ))
+    RecipeSignature.objects.update_or_create(recipe=recipe, defaults={'minhashes': signature})
+    LSHBucket.objects.filter(recipe=recipe).delete()
+    if signature:
+        LSHBucket.objects.bulk_create([
+            LSHBucket(recipe=recipe, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_hashes(signature))
+        ])
+    metrics.increment('indexed')
+    return signature
+
+
+def find_similar(signature, visible, exclude_id=None, threshold=None, limit=6):
+    """
+    Return recipes whose estimated similarity to ``signature`` is at least ``threshold``.
+
+    Args:
+        signature (list): A signature from ``compute_signature``.
+        visible (Q): Filter on ``Recipe`` restricting which recipes may be returned.
+        exclude_id (int): A recipe to leave out, usually the one being compared.
+        threshold (float): Defaults to ``MINHASH['SIMILAR_THRESHOLD']``.
+        limit (int): Maximum number of recipes returned.
+
+    Returns:
+        list: ``(recipe, similarity)`` pairs, most similar first.
+    """
+
+    config = get_minhash_config()
+    if not signature:
+        return []
+    threshold = config['SIMILAR_THRESHOLD'] if threshold is None else threshold
+
+    in_bucket = Q()
+    for band, bucket in enumerate(band_hashes(signature)):
+        in_bucket |= Q(band=band, bucket=bucket)
+    candidates = (
+        LSHBucket.objects.filter(in_bucket)
+        .exclude(recipe_id=exclude_id)
+        .values('recipe_id')
+        .annotate(shared=Count('id'))
+        .order_by('-shared', 'recipe_id')
+        .values_list('recipe_id', flat=True)[:config['MAX_CANDIDATES']]
+    )
+    signatures = RecipeSignature.objects.filter(recipe_id__in=list(candidates)).values_list('recipe_id', 'minhashes')
+    scores = {
+        recipe_id: score
+        for recipe_id, score in (
+            (recipe_id, estimate_similarity(signature, minhashes)) for recipe_id, minhashes in signatures
+        )
+        if score >= threshold
+    }
+    metrics.increment('lookups')
+    recipes = Recipe.objects.filter(visible, id__in=scores).select_related('author').in_bulk()
+    ranked = sorted(recipes, key=lambda recipe_id: (-scores[recipe_id], recipe_id))[:limit]
+    return [(recipes[recipe_id], scores[recipe_id]) for recipe_id in ranked]
+
+
+def _stored_signature(recipe):
+    return RecipeSignature.objects.filter(recipe=recipe).values_list('minhashes', flat=True).first() or []
+
+
+def similar_by_ingredients(recipe, limit=6):
+    """Return public recipes with similar ingredients and tags to ``recipe``."""
+
+    return [
+        similar
+        for similar, _ in find_similar(
+            _stored_signature(recipe), Q(visibility='public'), exclude_id=recipe.pk, limit=limit
+        )
+    ]
+
+
+def likely_duplicates(recipe, user, limit=3):
+    """Return recipes ``user`` can see that look like near-duplicates of ``recipe``."""
+
+    return [
+        duplicate
+        for duplicate, _ in find_similar(
+            _stored_signature(recipe),
+            Q(visibility__in=['public', 'unlisted']) | Q(author=user),
+            exclude_id=recipe.pk,
+            threshold=get_minhash_config()['DUPLICATE_THRESHOLD'],
+            limit=limit,
+        )
+    ]
@@ -5,4 +5,12 @@ from .recipe_step import *
 from .recipe_rating import *
 from .recipe_favourite import *
 from .recipe_tag import *
-from .admin_log import *
\ No newline at end of file
+from .admin_log import *
+from .timeline import *
+
+from .recipe_similarity import *
+from .trending_epoch import *
+from .recipe_signature import *
+from .ingredient_term import *
+from .meal_plan import *
+from .recipe_revision import *
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
+from recipes.query_cache import CachingManager
 
 
 class AdminLog(models.Model):
@@ -83,6 +84,8 @@ class AdminLog(models.Model):
         help_text='When the action was performed'
     )
 
+    objects = CachingManager()
+
     class Meta:
         """Model options."""
         
@@ -0,0 +1,37 @@
+from django.db import models
+from .recipe import Recipe
+
+
+class IngredientTerm(models.Model):
+    """A normalised ingredient word in the pantry search index (see recipes/pantry.py)."""
+
+    term = models.CharField(max_length=64, unique=True)
+
+    def __str__(self):
+        return self.term
+
+
+class IngredientPosting(models.Model):
+    """An ingredient term used by a recipe."""
+
+    term = models.ForeignKey(
+        IngredientTerm,
+        on_delete=models.CASCADE,
+        related_name="postings",
+    )
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="ingredient_postings",
+    )
+
+    # Copied to every posting so coverage is scored from postings alone.
+    recipeTermCount = models.PositiveSmallIntegerField()
+
+    class Meta:
+        # pantry search: postings of the queried terms
+        unique_together = ("term", "recipe")
+
+    def __str__(self):
+        return f"{self.term} in {self.recipe}"
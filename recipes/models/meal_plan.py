@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import models
+from .recipe import Recipe
+
+
+class MealPlan(models.Model):
+    """A user's plan of recipes for the week starting on ``weekStart`` (a Monday)."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="meal_plans",
+    )
+
+    weekStart = models.DateField()
+    createdAt = models.DateTimeField(auto_now_add=True)
+    # Touched whenever entries change, so cached shopping lists expire.
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "weekStart")
+
+    def __str__(self):
+        return f"{self.user}'s meal plan for {self.weekStart:%d %b %Y}"
+
+
+class MealPlanEntry(models.Model):
+    """A recipe planned for one day, optionally for a different number of servings."""
+
+    DAY_CHOICES = [
+        (0, "Monday"), (1, "Tuesday"), (2, "Wednesday"), (3, "Thursday"),
+        (4, "Friday"), (5, "Saturday"), (6, "Sunday"),
+    ]
+
+    plan = models.ForeignKey(
+        MealPlan,
+        on_delete=models.CASCADE,
+        related_name="entries",
+    )
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="plan_entries",
+    )
+
+    day = models.PositiveSmallIntegerField(choices=DAY_CHOICES)
+    # Overrides recipe.serves when set.
+    serves = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["day", "id"]
+        indexes = [
+            # meal plan page: a plan's entries by day
+            models.Index(fields=["plan", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe} on {self.get_day_display()}"
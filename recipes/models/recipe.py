@@ -2,6 +2,14 @@ from django.conf import settings
 from django.db import models
 from .recipe_tag import Tag
 from django.db.models import Avg, Count
+from recipes.query_cache import CachingManager
+
+
+class RecipeManager(CachingManager):
+    """Default manager of ``Recipe``, leaving out deleted recipes awaiting purge."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deletedAt__isnull=True)
 
 
 class Recipe(models.Model):
@@ -57,8 +65,47 @@ class Recipe(models.Model):
     averageRating = models.DecimalField(max_digits=2, decimal_places=1, default = 0)
     ratingCount = models.PositiveSmallIntegerField(default = 0)
     favouritesCount = models.PositiveSmallIntegerField(default = 0)
+    # Time-decayed popularity, maintained by recipes/trending.py
+    trendingScore = models.FloatField(default=0, editable=False)
+    # Ordered ingredients and steps, copied from their tables by whoever
+    # writes them (see refresh_content), so reads need no extra queries.
+    content = models.JSONField(default=dict, blank=True, editable=False)
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
+    # Set when the recipe is deleted; recipes/purge.py removes its rows later.
+    deletedAt = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = RecipeManager()
+    # Includes deleted recipes.
+    all_objects = CachingManager()
+
+    class Meta:
+        """Model options."""
+
+        # Related objects (a rating's recipe) still resolve to deleted recipes.
+        base_manager_name = 'all_objects'
+        indexes = [
+            # dashboard / view_profile: filter by author, newest first
+            models.Index(fields=['author', '-createdAt']),
+            # search_recipe / admin_panel: filter by visibility and difficulty, newest first
+            models.Index(fields=['visibility', 'difficulty', '-createdAt']),
+            # search_recipe sort options
+            models.Index(fields=['-createdAt']),
+            models.Index(fields=['-averageRating']),
+            models.Index(fields=['totalTime']),
+            models.Index(fields=['-trendingScore']),
+            # public listings: filter by visibility, sorted
+            models.Index(fields=['visibility', '-createdAt']),
+            models.Index(fields=['visibility', '-averageRating']),
+            models.Index(fields=['visibility', '-trendingScore']),
+            # purge_recipes: find deleted recipes. Partial, so live-recipe
+            # queries (deletedAt IS NULL) keep their sort indexes.
+            models.Index(
+                fields=['deletedAt'],
+                name='recipes_recipe_deleted_idx',
+                condition=models.Q(deletedAt__isnull=False),
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         self.totalTime = self.prepTime + self.cookTime
@@ -80,5 +127,38 @@ class Recipe(models.Model):
         self.save(update_fields=['favouritesCount'])
 
 
+    CONTENT_INGREDIENT_FIELDS = ("position", "text", "quantity", "quantityMax", "unit", "item", "note")
+
+    @classmethod
+    def build_content(cls, ingredients, steps):
+        """Return the ``content`` document for ingredient and step rows, in position order."""
+        return {
+            "ingredients": [
+                {field: getattr(ingredient, field) for field in cls.CONTENT_INGREDIENT_FIELDS}
+                for ingredient in sorted(ingredients, key=lambda ingredient: ingredient.position)
+            ],
+            "steps": [
+                {"position": step.position, "text": step.text}
+                for step in sorted(steps, key=lambda step: step.position)
+            ],
+        }
+
+    def refresh_content(self):
+        """Rebuild and save ``content`` from the ingredient and step tables."""
+        self.content = self.build_content(self.ingredients.all(), self.steps.all())
+        self.save(update_fields=['content'])
+
+    def get_ingredients(self):
+        """Return the ordered ingredients, from ``content`` when it has been written."""
+        if self.content:
+            return self.content["ingredients"]
+        return self.ingredients.order_by("position")
+
+    def get_steps(self):
+        """Return the ordered steps, from ``content`` when it has been written."""
+        if self.content:
+            return self.content["steps"]
+        return self.steps.order_by("position")
+
     def __str__(self):
         return self.name
@@ -20,6 +20,10 @@ class RecipeFavourite(models.Model):
 
     class Meta: 
         unique_together=("recipe", "user")
+        indexes = [
+            # favourites view: a user's saved recipes, newest first
+            models.Index(fields=["user", "-savedAt"]),
+        ]
 
     def __str__(self):
         return f"{self.user} likes {self.recipe}"
\ No newline at end of file
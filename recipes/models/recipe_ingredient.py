@@ -1,4 +1,5 @@
 from django.db import models
+from recipes.ingredients import parse_ingredient
 
 
 class RecipeIngredient(models.Model):
@@ -9,9 +10,40 @@ class RecipeIngredient(models.Model):
     )
     text = models.CharField(max_length = 255)
     position = models.PositiveIntegerField()
+
+    # Parsed from text by save() (see recipes/ingredients.py)
+    PARSED_FIELDS = ("quantity", "quantityMax", "unit", "item", "note")
+    quantity = models.FloatField(null=True, blank=True, editable=False)
+    quantityMax = models.FloatField(null=True, blank=True, editable=False)
+    unit = models.CharField(max_length=16, blank=True, editable=False)
+    item = models.CharField(max_length=255, blank=True, editable=False)
+    note = models.CharField(max_length=255, blank=True, editable=False)
     
     class Meta:
         ordering = ["position"]
+        indexes = [
+            # view_recipe: a recipe's ingredients in order
+            models.Index(fields=["recipe", "position"]),
+            # shopping lists / pantry: ingredients by item
+            models.Index(fields=["item"]),
+        ]
+
+    def parse(self):
+        """Fill the structured fields from ``text``."""
+        parsed = parse_ingredient(self.text)
+        self.quantity = parsed.quantity
+        self.quantityMax = parsed.quantity_max
+        self.unit = parsed.unit
+        self.item = parsed.item[:255]
+        self.note = parsed.note[:255]
+
+    def save(self, *args, **kwargs):
+        """Parse the text, so reads never have to."""
+        self.parse()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *self.PARSED_FIELDS}
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.text} ({self.recipe})"
\ No newline at end of file
+        return f"{self.text} ({self.recipe})"
@@ -22,6 +22,12 @@ class RecipeRating(models.Model):
 
     class Meta: 
         unique_together=("recipe", "user")
+        indexes = [
+            # view_profile: a user's reviews, newest first
+            models.Index(fields=["user", "-createdAt"]),
+            # view_recipe: a recipe's reviews, newest first
+            models.Index(fields=["recipe", "-createdAt"]),
+        ]
     
     def __str__(self):
         return f"{self.rating}★ on {self.recipe} by {self.user}"
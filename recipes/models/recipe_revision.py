@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import models
+from .recipe import Recipe
+
+
+class RecipeRevision(models.Model):
+    """
+    One saved version of a recipe, numbered from 1.
+
+    Every ``REVISIONS['SNAPSHOT_EVERY']`` revisions (and the first) store the
+    whole recipe document in ``snapshot``; the others store only a
+    JSON-patch style ``delta`` from the revision before (see
+    recipes/revisions.py).
+    """
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="revisions",
+    )
+    number = models.PositiveIntegerField()
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="recipe_revisions",
+    )
+    snapshot = models.JSONField(null=True, blank=True)
+    delta = models.JSONField(null=True, blank=True)
+    # Top-level fields changed from the revision before, for listing history.
+    changedFields = models.JSONField(default=list, blank=True)
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Also the index that history listings and reconstruction read.
+        unique_together = ("recipe", "number")
+        ordering = ["-number"]
+
+    def __str__(self):
+        return f"Revision {self.number} of {self.recipe}"
@@ -0,0 +1,41 @@
+from django.db import models
+from .recipe import Recipe
+
+
+class RecipeSignature(models.Model):
+    """MinHash signature of a recipe's ingredient words and tags (see recipes/minhash.py)."""
+
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="signature",
+    )
+
+    minhashes = models.JSONField(default=list)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Signature of {self.recipe}"
+
+
+class LSHBucket(models.Model):
+    """One band of a recipe's signature, hashed; recipes sharing a bucket are candidates."""
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="lsh_buckets",
+    )
+
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        unique_together = ("recipe", "band")
+        indexes = [
+            # candidate lookup: recipes in the same bucket of a band
+            models.Index(fields=["band", "bucket"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe} in band {self.band} bucket {self.bucket}"
@@ -0,0 +1,43 @@
+from django.db import models
+from .recipe import Recipe
+
+
+class RecipeSimilarity(models.Model):
+    """One of a recipe's most similar recipes, computed by update_similarities."""
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="similarities",
+    )
+
+    similar = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    # Cosine similarity of the two recipes' rating/favourite vectors.
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ("recipe", "similar")
+        indexes = [
+            # view_recipe / dashboard: a recipe's neighbours, most similar first
+            models.Index(fields=["recipe", "-score"]),
+        ]
+
+    def __str__(self):
+        return f"{self.similar} is like {self.recipe} ({self.score:.2f})"
+
+
+class SimilarityUpdate(models.Model):
+    """A recipe whose ratings or favourites changed since similarities were last computed."""
+
+    # A plain id rather than a foreign key: rows are queued from the
+    # post_delete signals that fire while a recipe is being deleted.
+    recipeId = models.PositiveIntegerField(unique=True)
+    queuedAt = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Similarity update for recipe {self.recipeId}"
@@ -14,6 +14,10 @@ class RecipeStep(models.Model):
 
     class Meta:
         ordering = ["position"]
+        indexes = [
+            # view_recipe: a recipe's steps in order
+            models.Index(fields=["recipe", "position"]),
+        ]
     
     def __str__(self):
         return f"Step {self.position} for {self.recipe}"
\ No newline at end of file
@@ -1,8 +1,14 @@
 from django.db import models
+from recipes.query_cache import CachingManager
 
 
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
+    # Tags change rarely and are listed on most pages, so cache every query.
+    query_cache_ttl = 300
+
+    objects = CachingManager()
+
     def __str__(self):
         return self.name
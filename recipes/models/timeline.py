@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import models
+from .recipe import Recipe
+
+
+class TimelineEntry(models.Model):
+    """A public recipe delivered to the feed of one of its author's followers."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+
+    # Copied from the recipe so reading and unfollowing only touch this table.
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    createdAt = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "recipe")
+        indexes = [
+            # dashboard feed: a user's entries, newest first (keyset pagination)
+            models.Index(fields=["user", "-createdAt", "-recipe"]),
+            # unfollow: remove one author's entries from a user's feed
+            models.Index(fields=["user", "author"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe} in {self.user}'s feed"
+
+
+class FanoutTask(models.Model):
+    """A queued delivery of a new public recipe to its author's followers."""
+
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="fanout_task",
+    )
+
+    # Followers are delivered to in id order; this is the last one done.
+    lastFollowerId = models.PositiveIntegerField(default=0)
+    createdAt = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Fan-out of {self.recipe}"
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class TrendingEpoch(models.Model):
+    """
+    Reference time that recipes' trending scores are measured from.
+
+    There is a single row. Scores are stored as if every event happened at
+    this time, so rescaling them moves it forward (see recipes/trending.py).
+    """
+
+    startedAt = models.DateTimeField()
+
+    def __str__(self):
+        return f"Trending scores since {self.startedAt:%Y-%m-%d %H:%M}"
@@ -1,7 +1,33 @@
+import hashlib
+from functools import lru_cache
+
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from libgravatar import Gravatar
+from django.urls import reverse
+
+
+GRAVATAR_URL = 'https://www.gravatar.com/avatar/{hash}?size={size}&default=mp'
+
+
+def hash_email(email):
+    """Return the gravatar hash of an email address (MD5 of the trimmed, lowercased address)."""
+
+    return hashlib.md5(email.strip().lower().encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def gravatar_url(email_hash, size):
+    """Return the gravatar URL for an email hash at the given size."""
+
+    return GRAVATAR_URL.format(hash=email_hash, size=size)
+
+
+@lru_cache(maxsize=4096)
+def avatar_url(email_hash, size):
+    """Return the URL of the local avatar proxy for an email hash at the given size."""
+
+    return reverse('avatar', kwargs={'email_hash': email_hash, 'size': size})
 
 
 class User(AbstractUser):
@@ -38,6 +64,17 @@ class User(AbstractUser):
         default=False,
         help_text='Whether this user has been flagged for deletion by a moderator or admin'
     )
+    # Maintained by recipes.views.follow_user.toggle_follow; never written by save().
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    email_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text='Gravatar hash of the email address, kept in sync by save().'
+    )
+
+    COUNTER_FIELDS = ('followers_count', 'following_count')
 
     class Meta:
         """Model options."""
@@ -45,10 +82,31 @@ class User(AbstractUser):
         ordering = ['last_name', 'first_name']
 
     def save(self, *args, **kwargs):
-        """Ensure staff and superuser flags mirror the user role."""
+        """
+        Ensure staff and superuser flags mirror the user role, and the email hash the email.
+
+        Updates of existing users never write the follow counters.
+        """
 
         self.is_staff = self.role in {self.Roles.ADMIN, self.Roles.MODERATOR}
         self.is_superuser = self.role == self.Roles.ADMIN
+        self.email_hash = hash_email(self.email)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_hash'}
+        elif update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # Leave the follow counters alone, so saving a stale instance
+            # cannot undo concurrent follows. Only rows that still exist are
+            # updated this way; a deleted one is inserted again by a full save.
+            using = kwargs.get('using') or self._state.db
+            if type(self)._base_manager.using(using).filter(pk=self.pk).exists():
+                deferred = self.get_deferred_fields()
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in self.COUNTER_FIELDS
+                    and field.attname not in deferred
+                ]
 
         super().save(*args, **kwargs)
 
@@ -60,15 +118,23 @@ class User(AbstractUser):
     def gravatar(self, size=120):
         """Return a URL to the user's gravatar."""
 
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='mp')
-        return gravatar_url
+        return gravatar_url(self.email_hash or hash_email(self.email), size)
 
     def mini_gravatar(self):
         """Return a URL to a miniature version of the user's gravatar."""
 
         return self.gravatar(size=60)
 
+    def avatar(self, size=120):
+        """Return a URL to the user's avatar, served locally by the avatar proxy."""
+
+        return avatar_url(self.email_hash or hash_email(self.email), size)
+
+    def mini_avatar(self):
+        """Return a URL to a miniature version of the user's avatar."""
+
+        return self.avatar(size=60)
+
     @property
     def is_admin(self):
         """Return True when user has administrator role."""
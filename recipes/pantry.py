@@ -0,0 +1,104 @@
+"""
+"Cook with what I have": recipes ranked by how much of them a pantry covers.
+
+When a recipe is saved, ``index_ingredients`` reduces its parsed ingredient
+items to normalised words (see recipes/ingredients.py) and stores one
+``IngredientPosting`` per word. A pantry search looks up the postings of
+the pantry's words and groups them by recipe. A recipe's coverage is the
+share of its words the pantry has, so the query only reads postings for
+the words searched for, never the ingredient text.
+"""
+
+from django.conf import settings
+from django.db.models import Count, F, FloatField, Max, Q
+from django.db.models.functions import Cast
+from recipes.ingredients import ingredient_words
+from recipes.metrics import get_metrics
+from recipes.models import IngredientPosting, IngredientTerm, Recipe
+from recipes.writes import atomic_write
+
+
+DEFAULT_PANTRY = {
+    # Recipes covering less than this share of their ingredient words are left out.
+    'MIN_COVERAGE': 0.5,
+    'MAX_RESULTS': 50,
+}
+
+metrics = get_metrics('pantry')
+
+
+def get_pantry_config():
+    """Return the pantry search configuration, with ``settings.PANTRY`` over the defaults."""
+
+    config = dict(DEFAULT_PANTRY)
+    config.update(getattr(settings, 'PANTRY', {}) or {})
+    return config
+
+
+def pantry_words(text):
+    """Return the normalised words of a pantry listed one item per line or comma."""
+
+    return {word for item in text.replace('\n', ',').split(',') for word in ingredient_words(item)}
+
+
+@atomic_write
+def index_ingredients(recipe):
+    """Replace a recipe's postings with the words of its saved ingredients."""
+
+    words = {
+        word
+        for item, text in recipe.ingredients.values_list('item', 'text')
+        for word in ingredient_words(item or text)
+    }
+    IngredientPosting.objects.filter(recipe=recipe).delete()
+    if not words:
+        return
+    IngredientTerm.objects.bulk_create([IngredientTerm(term=word) for word in words], ignore_conflicts=True)
+    IngredientPosting.objects.bulk_create([
+        IngredientPosting(term_id=term_id, recipe=recipe, recipeTermCount=len(words))
+        for term_id in IngredientTerm.objects.filter(term__in=words).values_list('id', flat=True)
+    ])
+    metrics.increment('indexed')
+
+
+def pantry_search(text, user, min_coverage=None, limit=None):
+    """
+    Return recipes ``user`` can see, ranked by how much of them the pantry covers.
+
+    Each recipe is annotated with ``matched`` (pantry words it uses),
+    ``termCount`` (its ingredient words) and ``coverage`` (their ratio).
+
+    Returns:
+        list: Recipes, best covered first.
+    """
+
+    config = get_pantry_config()
+    min_coverage = config['MIN_COVERAGE'] if min_coverage is None else min_coverage
+    words = pantry_words(text)
+    term_ids = list(IngredientTerm.objects.filter(term__in=words).values_list('id', flat=True))
+    if not term_ids:
+        return []
+
+    ranked = list(
+        IngredientPosting.objects.filter(term_id__in=term_ids)
+        .filter(Q(recipe__visibility__in=['public', 'unlisted']) | Q(recipe__author=user), recipe__deletedAt__isnull=True)
+        .values('recipe_id')
+        .annotate(matched=Count('id'), total=Max('recipeTermCount'))
+        .annotate(coverage=Cast(F('matched'), FloatField()) / F('total'))
+        .filter(coverage__gte=min_coverage)
+        .order_by('-coverage', '-matched', 'recipe_id')[:limit or config['MAX_RESULTS']]
+    )
+    metrics.increment('searches')
+
+    recipes = Recipe.objects.select_related('author').in_bulk([row['recipe_id'] for row in ranked])
+    results = []
+    for row in ranked:
+        recipe = recipes.get(row['recipe_id'])
+        if recipe is None:
+            # Deleted since it was ranked.
+            continue
+        recipe.matched = row['matched']
+        recipe.termCount = row['total']
+        recipe.coverage = row['coverage']
+        results.append(recipe)
+    return results
@@ -0,0 +1,112 @@
+"""
+Soft deletion of recipes and the background purge that removes them.
+
+Deleting a recipe only sets its ``deletedAt`` tombstone (``tombstone_recipe``),
+one UPDATE however many ratings, favourites or timeline entries it has.
+``Recipe.objects`` leaves tombstoned recipes out, and queries that reach
+recipes through other tables filter on ``recipe__deletedAt__isnull``.
+
+The ``purge_recipes`` command then hard-deletes tombstoned recipes,
+``PURGE['BATCH_SIZE']`` per transaction. Each table that references
+``Recipe`` is cleared with one DELETE per batch, without the per-row
+``post_delete`` signals of ``Model.delete()``: those only keep the counts and
+similarities of the recipe being removed up to date. Cached queries of the
+tables are invalidated directly instead.
+"""
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from recipes.metrics import get_metrics
+from recipes.models import Recipe
+from recipes.query_cache import invalidate_tables
+from recipes.writes import atomic_write
+
+
+DEFAULT_PURGE = {
+    # Recipes hard-deleted per transaction.
+    'BATCH_SIZE': 100,
+}
+
+metrics = get_metrics('purge')
+
+
+def get_purge_config():
+    """Return the purge configuration, with ``settings.PURGE`` over the defaults."""
+
+    config = dict(DEFAULT_PURGE)
+    config.update(getattr(settings, 'PURGE', {}) or {})
+    return config
+
+
+def tombstone_recipe(recipe):
+    """
+    Mark ``recipe`` deleted, hiding it everywhere until it is purged.
+
+    ``updatedAt`` moves too, so caches keyed on it (shopping lists) miss.
+    """
+
+    recipe.deletedAt = recipe.updatedAt = timezone.now()
+    Recipe.all_objects.filter(pk=recipe.pk).update(deletedAt=recipe.deletedAt, updatedAt=recipe.updatedAt)
+    metrics.increment('tombstoned')
+
+
+def recipe_references():
+    """
+    Return ``(model, field name)`` for every foreign key to ``Recipe``.
+
+    Includes the tag table and relations without a reverse accessor.
+    Every one cascades, so a purge deletes the rows.
+    """
+
+    return [
+        (relation.related_model, relation.field.name)
+        for relation in Recipe._meta.get_fields(include_hidden=True)
+        if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+        and relation.on_delete is models.CASCADE
+    ]
+
+
+@atomic_write
+def purge_batch(batch_size):
+    """
+    Hard-delete up to ``batch_size`` tombstoned recipes, oldest first, and every row that references them.
+
+    Returns:
+        int: The number of recipes deleted.
+    """
+
+    recipe_ids = list(
+        Recipe.all_objects.filter(deletedAt__isnull=False)
+        .order_by('deletedAt', 'id').values_list('id', flat=True)[:batch_size]
+    )
+    if not recipe_ids:
+        return 0
+    references = recipe_references()
+    for model, field in references:
+        rows = model._base_manager.filter(**{f'{field}__in': recipe_ids})._raw_delete(model._base_manager.db)
+        metrics.increment('rows', rows)
+    deleted = Recipe.all_objects.filter(pk__in=recipe_ids)._raw_delete(Recipe.all_objects.db)
+    invalidate_tables([Recipe._meta.db_table] + [model._meta.db_table for model, _ in references])
+    return deleted
+
+
+def purge_recipes(batch_size=None, max_batches=None):
+    """
+    Hard-delete tombstoned recipes in batches until none are left.
+
+    Returns:
+        int: The number of recipes deleted.
+    """
+
+    batch_size = max(batch_size or get_purge_config()['BATCH_SIZE'], 1)
+    purged = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        deleted = purge_batch(batch_size)
+        if not deleted:
+            break
+        purged += deleted
+        batches += 1
+    metrics.increment('recipes', purged)
+    return purged
@@ -0,0 +1,222 @@
+"""
+Opt-in ORM query-result cache with table-level invalidation.
+
+Models that use ``CachingManager`` get querysets with a ``.cached(ttl)``
+method; a model can also set ``query_cache_ttl`` to cache all of its
+queries by default (``.uncached()`` opts a single query out).
+
+Cached results are keyed by the compiled SQL and parameters. Every table
+has a version token in the cache, and each entry remembers the tokens of
+the tables its SQL reads. Writing to a table replaces its token (see the
+receivers in ``recipes.signals`` and the bulk methods below), so every
+entry that read the table misses on its next lookup.
+
+Queries inside a transaction bypass the cache, so uncommitted rows are
+never cached. With the default per-process cache, writes made by other
+processes are only picked up when entries expire; configure a shared
+cache in ``QUERY_CACHE['CACHE']`` to invalidate across processes.
+"""
+
+import hashlib
+import re
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, transaction
+from recipes.metrics import get_metrics
+
+
+DEFAULT_QUERY_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 60,
+}
+
+TABLE_PATTERN = re.compile(r'(?:FROM|JOIN) "(\w+)"')
+
+metrics = get_metrics('query_cache')
+
+
+def get_cache_config():
+    """Return the query cache configuration, with ``settings.QUERY_CACHE`` over the defaults."""
+
+    config = dict(DEFAULT_QUERY_CACHE)
+    config.update(getattr(settings, 'QUERY_CACHE', {}) or {})
+    return config
+
+
+def _cache():
+    return caches[get_cache_config()['CACHE']]
+
+
+def _version_key(table):
+    return f'qc:v:{table}'
+
+
+def table_versions(tables):
+    """Return the current version token of each table, creating missing ones."""
+
+    cache = _cache()
+    keys = {_version_key(table): table for table in tables}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def invalidate_tables(tables, using=None):
+    """
+    Invalidate every cached query that reads any of ``tables``.
+
+    Inside a transaction the tables are invalidated again on commit, so
+    a query cached by another thread mid-transaction cannot outlive it.
+    """
+
+    def bump():
+        _cache().set_many({_version_key(table): uuid.uuid4().hex for table in tables}, timeout=None)
+        metrics.increment('invalidations', len(tables))
+
+    tables = set(tables)
+    if not tables:
+        return
+    bump()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(bump, using=using)
+
+
+def invalidate_model(model, using=None):
+    """Invalidate cached queries that read ``model``'s table."""
+
+    invalidate_tables([model._meta.db_table], using=using)
+
+
+def fetch_cached(queryset):
+    """
+    Return the rows for ``queryset`` from the cache, running it on a miss.
+
+    Returns:
+        list or None: The rows, or None if the queryset cannot be cached.
+    """
+
+    try:
+        sql, params = queryset.query.clone().get_compiler(using=queryset.db).as_sql()
+    except EmptyResultSet:
+        return None
+
+    tables = set(TABLE_PATTERN.findall(sql))
+    digest = hashlib.sha1(
+        repr((queryset.db, queryset._iterable_class.__name__, sql, params)).encode()
+    ).hexdigest()
+    key = f'qc:q:{digest}'
+
+    cache = _cache()
+    versions = table_versions(tables)
+    entry = cache.get(key)
+    if entry is not None and entry['versions'] == versions:
+        metrics.increment('hits')
+        return entry['rows']
+
+    metrics.increment('misses')
+    rows = list(queryset._iterable_class(queryset))
+    cache.set(key, {'versions': versions, 'rows': rows}, timeout=queryset._cache_ttl)
+    return rows
+
+
+class CachingQuerySet(models.QuerySet):
+    """QuerySet with an opt-in result cache and invalidating bulk writes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache_ttl = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cache_ttl = self._cache_ttl
+        return clone
+
+    def cached(self, ttl=None):
+        """Return a copy whose results are cached for ``ttl`` seconds."""
+
+        clone = self._chain()
+        clone._cache_ttl = ttl if ttl is not None else get_cache_config()['TIMEOUT']
+        return clone
+
+    def uncached(self):
+        """Return a copy that always queries the database."""
+
+        clone = self._chain()
+        clone._cache_ttl = None
+        return clone
+
+    def _fetch_all(self):
+        if (
+            self._result_cache is None
+            and self._cache_ttl is not None
+            and not self.query.select_for_update
+            and not connections[self.db].in_atomic_block
+        ):
+            self._result_cache = fetch_cached(self)
+        super()._fetch_all()
+
+    # Bulk writes do not send model signals, so they invalidate directly.
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        invalidate_model(self.model, using=self.db)
+        return rows
+
+    update.alters_data = True
+
+    def quiet_update(self, **kwargs):
+        """
+        Update rows without invalidating cached queries.
+
+        For columns that may lag in cached results until they expire, such
+        as scores bumped on every page view: invalidating would empty the
+        table's cache on every hit.
+        """
+
+        return super().update(**kwargs)
+
+    quiet_update.alters_data = True
+
+    def delete(self):
+        result = super().delete()
+        invalidate_model(self.model, using=self.db)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def _raw_delete(self, using):
+        rows = super()._raw_delete(using)
+        invalidate_model(self.model, using=using)
+        return rows
+
+    def bulk_create(self, *args, **kwargs):
+        objs = super().bulk_create(*args, **kwargs)
+        invalidate_model(self.model, using=self.db)
+        return objs
+
+    def bulk_update(self, *args, **kwargs):
+        rows = super().bulk_update(*args, **kwargs)
+        invalidate_model(self.model, using=self.db)
+        return rows
+
+
+class CachingManager(models.Manager.from_queryset(CachingQuerySet)):
+    """
+    Manager returning ``CachingQuerySet``s.
+
+    If the model defines ``query_cache_ttl``, its queries are cached for
+    that many seconds by default.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        ttl = getattr(self.model, 'query_cache_ttl', None)
+        if ttl is not None:
+            queryset = queryset.cached(ttl)
+        return queryset
@@ -0,0 +1,237 @@
+"""
+Item-item collaborative filtering over ratings and favourites.
+
+``update_similarities`` builds a sparse user x recipe matrix, where a rating
+counts as ``rating / 5`` and a favourite as 1 (a user's stronger signal
+wins). It stores each recipe's ``RECOMMENDATIONS['TOP_K']`` nearest
+neighbours by cosine similarity in ``RecipeSimilarity``.
+
+Runs are incremental. Rating and favourite signals queue the recipe in
+``SimilarityUpdate``; a run loads only the interactions around the queued
+recipes (their users' rows, and the full columns of the recipes those users
+touched, for the norms), recomputes the queued recipes, then patches the
+scores for those recipes into their neighbours' lists. Queue entries are
+cleared only if they were not re-queued while the run was computing. Patching
+cannot promote a third recipe into a neighbour's list, so rebuild
+everything with ``full=True`` now and then (e.g. nightly).
+
+Serving is an indexed lookup on ``(recipe, -score)``.
+"""
+
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.utils import timezone
+from recipes.metrics import get_metrics
+from recipes.models import Recipe, RecipeFavourite, RecipeRating, RecipeSimilarity, SimilarityUpdate
+from recipes.writes import atomic_write
+
+
+DEFAULT_RECOMMENDATIONS = {
+    'TOP_K': 20,
+    # Recipes whose queued updates are written per transaction.
+    'BATCH_SIZE': 100,
+    # Recent favourites/high ratings used to build a user's recommendations.
+    'SEED_RECIPES': 10,
+}
+
+metrics = get_metrics('recommendations')
+
+
+def get_recommendation_config():
+    """Return the recommender configuration, with ``settings.RECOMMENDATIONS`` over the defaults."""
+
+    config = dict(DEFAULT_RECOMMENDATIONS)
+    config.update(getattr(settings, 'RECOMMENDATIONS', {}) or {})
+    return config
+
+
+def queue_similarity_update(recipe_id):
+    """Mark a recipe's similarities as out of date."""
+
+    # Re-queueing moves queuedAt, so a run already underway keeps the entry.
+    SimilarityUpdate.objects.bulk_create(
+        [SimilarityUpdate(recipeId=recipe_id)],
+        update_conflicts=True, unique_fields=['recipeId'], update_fields=['queuedAt'],
+    )
+
+
+def load_interactions(recipe_ids=None):
+    """
+    Load the user x recipe interaction matrix.
+
+    With ``recipe_ids``, only the part needed to score those recipes is
+    loaded: the columns of every recipe that shares a user with one of them.
+    That covers the rows of those users and every norm the scores need.
+
+    Returns:
+        tuple: ``(by_recipe, by_user)``, nested dicts of weights indexed
+        ``[recipe_id][user_id]`` and ``[user_id][recipe_id]``.
+    """
+
+    by_recipe = defaultdict(dict)
+    by_user = defaultdict(dict)
+
+    def add(user_id, recipe_id, weight):
+        weight = max(weight, by_recipe[recipe_id].get(user_id, 0.0))
+        by_recipe[recipe_id][user_id] = weight
+        by_user[user_id][recipe_id] = weight
+
+    ratings = RecipeRating.objects.all()
+    favourites = RecipeFavourite.objects.all()
+    if recipe_ids is not None:
+        users = (
+            Q(user_id__in=RecipeRating.objects.filter(recipe_id__in=recipe_ids).values('user_id'))
+            | Q(user_id__in=RecipeFavourite.objects.filter(recipe_id__in=recipe_ids).values('user_id'))
+        )
+        neighbours = (
+            Q(recipe_id__in=RecipeRating.objects.filter(users).values('recipe_id'))
+            | Q(recipe_id__in=RecipeFavourite.objects.filter(users).values('recipe_id'))
+        )
+        ratings = ratings.filter(neighbours)
+        favourites = favourites.filter(neighbours)
+
+    for user_id, recipe_id, rating in ratings.values_list('user_id', 'recipe_id', 'rating').iterator():
+        add(user_id, recipe_id, rating / 5)
+    for user_id, recipe_id in favourites.values_list('user_id', 'recipe_id').iterator():
+        add(user_id, recipe_id, 1.0)
+    return by_recipe, by_user
+
+
+def neighbour_scores(recipe_id, by_recipe, by_user, norms):
+    """Return the cosine similarity of ``recipe_id`` to every recipe sharing a user with it."""
+
+    dot = defaultdict(float)
+    for user_id, weight in by_recipe.get(recipe_id, {}).items():
+        for other_id, other_weight in by_user[user_id].items():
+            if other_id != recipe_id:
+                dot[other_id] += weight * other_weight
+    return {other_id: total / (norms[recipe_id] * norms[other_id]) for other_id, total in dot.items()}
+
+
+def _top(scores, top_k):
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+
+def update_similarities(full=False, top_k=None, batch_size=None):
+    """
+    Recompute similarities for queued recipes (or all recipes with ``full``).
+
+    Returns:
+        int: The number of recipes whose neighbour lists were recomputed.
+    """
+
+    config = get_recommendation_config()
+    top_k = top_k or config['TOP_K']
+    batch_size = batch_size or config['BATCH_SIZE']
+
+    started = timezone.now()
+    queued = list(SimilarityUpdate.objects.values_list('recipeId', flat=True))
+    if full:
+        targets = list(Recipe.objects.order_by('id').values_list('id', flat=True))
+    else:
+        targets = sorted(queued)
+    if not targets and not queued:
+        return 0
+
+    by_recipe, by_user = load_interactions(None if full else targets)
+    norms = {
+        recipe_id: math.sqrt(sum(weight * weight for weight in users.values()))
+        for recipe_id, users in by_recipe.items()
+    }
+    existing = set(Recipe.objects.values_list('id', flat=True))
+
+    for start in range(0, len(targets), batch_size):
+        _write_batch(targets[start:start + batch_size], by_recipe, by_user, norms, existing, top_k, patch=not full)
+
+    # Entries queued again since the run started are left for the next one.
+    SimilarityUpdate.objects.filter(recipeId__in=queued, queuedAt__lt=started).delete()
+    metrics.increment('recomputed', len(targets))
+    return len(targets)
+
+
+@atomic_write
+def _write_batch(recipe_ids, by_recipe, by_user, norms, existing, top_k, patch):
+    """Replace the neighbour lists of a batch of recipes and patch their neighbours."""
+
+    batch = set(recipe_ids)
+    RecipeSimilarity.objects.filter(recipe_id__in=recipe_ids).delete()
+    rows = []
+    patches = defaultdict(dict)
+    for recipe_id in recipe_ids:
+        if recipe_id not in existing:
+            continue
+        scores = {
+            other_id: score
+            for other_id, score in neighbour_scores(recipe_id, by_recipe, by_user, norms).items()
+            if other_id in existing
+        }
+        rows += [
+            RecipeSimilarity(recipe_id=recipe_id, similar_id=other_id, score=score)
+            for other_id, score in _top(scores, top_k)
+        ]
+        if patch:
+            for other_id, score in scores.items():
+                if other_id not in batch:
+                    patches[other_id][recipe_id] = score
+    RecipeSimilarity.objects.bulk_create(rows)
+
+    if not patch:
+        return
+    # Recipes that no longer share a user with a recomputed recipe drop it.
+    for recipe_id in recipe_ids:
+        RecipeSimilarity.objects.filter(similar_id=recipe_id).exclude(
+            recipe_id__in=[other_id for other_id, scores in patches.items() if recipe_id in scores]
+        ).exclude(recipe_id__in=batch).delete()
+    for other_id, scores in patches.items():
+        current = dict(RecipeSimilarity.objects.filter(recipe_id=other_id).values_list('similar_id', 'score'))
+        current.update(scores)
+        keep = _top(current, top_k)
+        RecipeSimilarity.objects.filter(recipe_id=other_id).delete()
+        RecipeSimilarity.objects.bulk_create([
+            RecipeSimilarity(recipe_id=other_id, similar_id=similar_id, score=score) for similar_id, score in keep
+        ])
+
+
+def similar_recipes(recipe, limit=6):
+    """Return the public recipes most similar to ``recipe``."""
+
+    return [
+        similarity.similar
+        for similarity in RecipeSimilarity.objects.filter(recipe=recipe, similar__visibility='public', similar__deletedAt__isnull=True)
+        .select_related('similar__author')
+        .order_by('-score')[:limit]
+    ]
+
+
+def recommended_recipes(user, limit=6):
+    """
+    Return public recipes recommended for ``user``.
+
+    Neighbours of the user's most recent favourites and 4-5 star ratings
+    are ranked by their summed similarity, leaving out recipes the user has
+    already rated, favourited or written.
+    """
+
+    seeds = get_recommendation_config()['SEED_RECIPES']
+    favourites = RecipeFavourite.objects.filter(user=user).order_by('-savedAt').values_list('recipe_id', flat=True)
+    liked = RecipeRating.objects.filter(user=user, rating__gte=4).order_by('-createdAt').values_list('recipe_id', flat=True)
+    seed_ids = set(favourites[:seeds]) | set(liked[:seeds])
+    if not seed_ids:
+        return []
+
+    seen_ids = set(RecipeRating.objects.filter(user=user).values_list('recipe_id', flat=True))
+    seen_ids |= set(RecipeFavourite.objects.filter(user=user).values_list('recipe_id', flat=True))
+    ranked = (
+        RecipeSimilarity.objects.filter(recipe_id__in=seed_ids, similar__visibility='public', similar__deletedAt__isnull=True)
+        .exclude(similar_id__in=seed_ids)
+        .exclude(similar__author=user)
+        .values('similar_id')
+        .annotate(total=Sum('score'))
+        .order_by('-total', 'similar_id')
+    )
+    ids = [row['similar_id'] for row in ranked if row['similar_id'] not in seen_ids][:limit]
+    recipes = Recipe.objects.select_related('author').in_bulk(ids)
+    return [recipes[recipe_id] for recipe_id in ids if recipe_id in recipes]
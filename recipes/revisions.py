@@ -0,0 +1,204 @@
+"""
+Recipe revision history stored as deltas.
+
+Each revision is the recipe's document: its editable fields, tag names and
+ingredient and step texts (``recipe_document``). The first revision and
+every ``REVISIONS['SNAPSHOT_EVERY']``-th after it store the whole document.
+The others store a JSON-patch style delta from the revision before: a list
+of ``add``, ``remove`` and ``replace`` operations on paths such as
+``/name`` or ``/ingredients/3`` (``make_patch``). A revision's size grows
+with its change, not with the recipe.
+
+Any version is rebuilt from the nearest snapshot at or before it plus at
+most ``SNAPSHOT_EVERY - 1`` deltas, read in one query on the
+``(recipe, number)`` index (``revision_document``).
+
+Revisions are recorded when a recipe is created or edited. Recipes that
+predate history, or were bulk imported, get the stored version as their
+first revision when they are first edited (``record_baseline``).
+"""
+
+import copy
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from recipes.metrics import get_metrics
+from recipes.models import Recipe, RecipeRevision
+from recipes.writes import atomic_write
+
+
+DEFAULT_REVISIONS = {
+    # A revision in every SNAPSHOT_EVERY stores the whole recipe.
+    'SNAPSHOT_EVERY': 10,
+}
+
+metrics = get_metrics('revisions')
+
+
+def get_revision_config():
+    """Return the revision configuration, with ``settings.REVISIONS`` over the defaults."""
+
+    config = dict(DEFAULT_REVISIONS)
+    config.update(getattr(settings, 'REVISIONS', {}) or {})
+    return config
+
+
+def recipe_document(recipe):
+    """Return the versioned document of a recipe as stored."""
+
+    content = recipe.content or Recipe.build_content(recipe.ingredients.all(), recipe.steps.all())
+    return {
+        'name': recipe.name,
+        'description': recipe.description,
+        'serves': recipe.serves,
+        'difficulty': recipe.difficulty,
+        'prepTime': str(recipe.prepTime),
+        'cookTime': str(recipe.cookTime),
+        'cuisine': recipe.cuisine,
+        'visibility': recipe.visibility,
+        'tags': sorted(recipe.tags.values_list('name', flat=True)),
+        'ingredients': [ingredient['text'] for ingredient in content['ingredients']],
+        'steps': [step['text'] for step in content['steps']],
+    }
+
+
+def _list_patch(path, old, new):
+    # Work from the end of the list, so earlier indexes stay valid.
+    operations = []
+    opcodes = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+    for tag, old_start, old_end, new_start, new_end in reversed(opcodes):
+        if tag == 'equal':
+            continue
+        common = min(old_end - old_start, new_end - new_start)
+        for index in range(old_end - 1, old_start + common - 1, -1):
+            operations.append({'op': 'remove', 'path': f'{path}/{index}'})
+        for offset in range(common):
+            operations.append({'op': 'replace', 'path': f'{path}/{old_start + offset}', 'value': new[new_start + offset]})
+        for offset in range(common, new_end - new_start):
+            operations.append({'op': 'add', 'path': f'{path}/{old_start + offset}', 'value': new[new_start + offset]})
+    return operations
+
+
+def make_patch(old, new):
+    """
+    Return the operations that turn document ``old`` into ``new``.
+
+    Changed lists are patched item by item; other changed values are replaced.
+    """
+
+    operations = []
+    for key in sorted(old.keys() | new.keys()):
+        if key not in new:
+            operations.append({'op': 'remove', 'path': f'/{key}'})
+        elif key not in old:
+            operations.append({'op': 'add', 'path': f'/{key}', 'value': new[key]})
+        elif old[key] != new[key]:
+            if isinstance(old[key], list) and isinstance(new[key], list):
+                operations.extend(_list_patch(f'/{key}', old[key], new[key]))
+            else:
+                operations.append({'op': 'replace', 'path': f'/{key}', 'value': new[key]})
+    return operations
+
+
+def apply_patch(document, patch):
+    """Return a copy of ``document`` with the operations of ``patch`` applied in order."""
+
+    document = copy.deepcopy(document)
+    for operation in patch:
+        key, _, index = operation['path'][1:].partition('/')
+        if not index:
+            if operation['op'] == 'remove':
+                del document[key]
+            else:
+                document[key] = operation['value']
+        elif operation['op'] == 'remove':
+            del document[key][int(index)]
+        elif operation['op'] == 'add':
+            document[key].insert(int(index), operation['value'])
+        else:
+            document[key][int(index)] = operation['value']
+    return document
+
+
+def changed_fields(patch):
+    """Return the top-level fields a patch touches, in order."""
+
+    return sorted({operation['path'][1:].partition('/')[0] for operation in patch})
+
+
+def revision_document(recipe, number):
+    """
+    Rebuild the document of revision ``number`` of ``recipe``.
+
+    Raises:
+        RecipeRevision.DoesNotExist: If there is no such revision.
+    """
+
+    chain = (
+        RecipeRevision.objects.filter(recipe=recipe, number__lte=number)
+        .order_by('-number')
+        .values_list('number', 'snapshot', 'delta')
+        .iterator(chunk_size=get_revision_config()['SNAPSHOT_EVERY'])
+    )
+    deltas = []
+    for found, snapshot, delta in chain:
+        if not deltas and found != number:
+            break
+        if snapshot is not None:
+            document = snapshot
+            for patch in reversed(deltas):
+                document = apply_patch(document, patch)
+            metrics.increment('deltas_applied', len(deltas))
+            return document
+        deltas.append(delta)
+    raise RecipeRevision.DoesNotExist(f'Recipe {recipe.pk} has no revision {number}.')
+
+
+def revision_history(recipe):
+    """Return a recipe's revisions, newest first, without their stored documents."""
+
+    return (
+        RecipeRevision.objects.filter(recipe=recipe)
+        .select_related('author')
+        .defer('snapshot', 'delta')
+        .order_by('-number')
+    )
+
+
+@atomic_write
+def record_revision(recipe, author=None):
+    """
+    Record the saved state of ``recipe`` as its next revision.
+
+    Returns:
+        RecipeRevision: The new revision, or None if nothing changed since the last one.
+    """
+
+    document = recipe_document(recipe)
+    latest = RecipeRevision.objects.filter(recipe=recipe).order_by('-number').values_list('number', flat=True).first()
+    if latest is None:
+        metrics.increment('snapshots')
+        return RecipeRevision.objects.create(recipe=recipe, number=1, author=author, snapshot=document)
+
+    patch = make_patch(revision_document(recipe, latest), document)
+    if not patch:
+        return None
+    number = latest + 1
+    snapshot = (number - 1) % get_revision_config()['SNAPSHOT_EVERY'] == 0
+    metrics.increment('snapshots' if snapshot else 'deltas')
+    return RecipeRevision.objects.create(
+        recipe=recipe,
+        number=number,
+        author=author,
+        snapshot=document if snapshot else None,
+        delta=None if snapshot else patch,
+        changedFields=changed_fields(patch),
+    )
+
+
+def record_baseline(recipe_id):
+    """Record the stored recipe as its first revision if it has no history yet."""
+
+    if not RecipeRevision.objects.filter(recipe_id=recipe_id).exists():
+        recipe = Recipe.objects.select_related('author').get(pk=recipe_id)
+        record_revision(recipe, author=recipe.author)
@@ -0,0 +1,132 @@
+"""
+Database router that sends read-only views to a local read replica.
+
+``ReplicaMiddleware`` marks a request as replica-safe when it is a GET/HEAD
+for one of ``READ_REPLICA['VIEWS']``; ``ReplicaRouter`` then sends that
+request's reads to the replica alias. All writes go to the primary.
+
+After a user writes (any non-GET request, or any write during a GET) they
+get a short-lived cookie that keeps their reads on the primary until the
+replica has caught up, so they always see their own changes.
+
+The replica is a snapshot of the primary written by
+``manage.py refresh_replica``. Until that file exists, or when the replica
+alias points at the primary itself (as under test), reads stay on the
+primary.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+DEFAULT_READ_REPLICA = {
+    'ALIAS': 'replica',
+    'VIEWS': [],
+    'STICKY_SECONDS': 60,
+    'COOKIE_NAME': 'primary_reads_until',
+}
+
+_request_state = ContextVar('replica_request_state', default=None)
+
+
+def get_replica_config():
+    """Return the replica configuration, with ``settings.READ_REPLICA`` over the defaults."""
+
+    config = dict(DEFAULT_READ_REPLICA)
+    config.update(getattr(settings, 'READ_REPLICA', {}) or {})
+    return config
+
+
+def replica_available(alias):
+    """Return True if ``alias`` is a separate, existing replica database."""
+
+    if alias not in connections.settings:
+        return False
+    replica_name = connections[alias].settings_dict['NAME']
+    if replica_name == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']:
+        return False
+    return os.path.exists(replica_name)
+
+
+class ReplicaRouter:
+    """Route reads of replica-safe requests to the replica; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state and state['use_replica'] and not state['wrote']:
+            alias = get_replica_config()['ALIAS']
+            if replica_available(alias):
+                return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so objects from either relate.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the snapshot, never from migrations.
+        return db != get_replica_config()['ALIAS']
+
+
+class ReplicaMiddleware:
+    """
+    Enable replica reads for read-only views and keep writers on the primary.
+
+    Must come after ``AuthenticationMiddleware``: the session and user are
+    loaded from the primary before replica reads are switched on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = {'use_replica': False, 'wrote': False}
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state['wrote'] or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            config = get_replica_config()
+            response.set_cookie(
+                config['COOKIE_NAME'],
+                str(int(time.time() + config['STICKY_SECONDS'])),
+                max_age=config['STICKY_SECONDS'],
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        config = get_replica_config()
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if request.resolver_match is None or request.resolver_match.url_name not in config['VIEWS']:
+            return None
+        if self.is_sticky(request, config):
+            return None
+
+        # Load the session and user from the primary before switching.
+        request.user.is_authenticated
+        _request_state.get()['use_replica'] = True
+        return None
+
+    def is_sticky(self, request, config):
+        """Return True while the user's recent write keeps them on the primary."""
+
+        try:
+            until = int(request.COOKIES.get(config['COOKIE_NAME'], 0))
+        except ValueError:
+            return False
+        return until > time.time()
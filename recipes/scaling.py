@@ -0,0 +1,187 @@
+"""
+Serving-size scaling of recipes' parsed ingredients.
+
+Quantities come from the structured fields stored on ``RecipeIngredient``
+when it is saved (read from ``Recipe.content``), so scaling never re-parses
+text. Scaled quantities are
+moved to the largest unit of their family that keeps them at least 1
+(1000 g becomes 1 kg, 6 tsp become 2 tbsp, but 4 tsp stay 4 tsp rather
+than 1 1/3 tbsp) and rounded: metric amounts to a sensible precision,
+spoons, cups and counts to the nearest common fraction.
+
+A scaled ingredient list is cached per ``(recipe, serves, updatedAt)``, so
+editing a recipe never serves stale quantities.
+"""
+
+from fractions import Fraction
+
+from django.conf import settings
+from django.core.cache import caches
+from recipes.metrics import get_metrics
+from recipes.models import Recipe, RecipeIngredient
+
+
+DEFAULT_SCALING = {
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+    'MAX_SERVES': 100,
+}
+
+# Units that convert into each other, with their size in the family's smallest unit.
+UNIT_FAMILIES = [
+    {'mg': 1, 'g': 1000, 'kg': 1000000},
+    {'ml': 1, 'l': 1000},
+    {'tsp': 1, 'tbsp': 3, 'cup': 48},
+    {'oz': 1, 'lb': 16},
+]
+
+UNIT_FAMILY = {unit: family for family in UNIT_FAMILIES for unit in family}
+
+METRIC_UNITS = frozenset(['mg', 'g', 'kg', 'ml', 'l'])
+
+# Units that take a plural, and how.
+PLURAL_UNITS = {
+    'cup': 'cups', 'clove': 'cloves', 'can': 'cans', 'slice': 'slices', 'piece': 'pieces',
+    'pinch': 'pinches', 'bunch': 'bunches', 'handful': 'handfuls',
+}
+
+FRACTIONS = [Fraction(0), Fraction(1, 4), Fraction(1, 3), Fraction(1, 2), Fraction(2, 3), Fraction(3, 4), Fraction(1)]
+
+metrics = get_metrics('scaling')
+
+
+def get_scaling_config():
+    """Return the scaling configuration, with ``settings.SCALING`` over the defaults."""
+
+    config = dict(DEFAULT_SCALING)
+    config.update(getattr(settings, 'SCALING', {}) or {})
+    return config
+
+
+def promote_unit(quantity, unit, quantity_max=None):
+    """
+    Move a quantity to the largest unit of its family that keeps it at least 1.
+
+    Non-metric units only move up if the result is a whole number of quarters.
+
+    Returns:
+        tuple: ``(quantity, unit, quantity_max)`` in the chosen unit.
+    """
+
+    family = UNIT_FAMILY.get(unit)
+    if not family:
+        return quantity, unit, quantity_max
+    base = quantity * family[unit]
+    best = min(family, key=family.get)
+    for candidate, size in sorted(family.items(), key=lambda item: item[1]):
+        value = base / size
+        if value >= 1 and (unit in METRIC_UNITS or abs(value * 4 - round(value * 4)) < 0.01):
+            best = candidate
+    factor = family[unit] / family[best]
+    return quantity * factor, best, quantity_max * factor if quantity_max is not None else None
+
+
+def round_quantity(quantity, unit):
+    """Round a quantity for display, as a string ("1.25", "300", "1 1/2")."""
+
+    if unit in METRIC_UNITS:
+        if quantity >= 100:
+            value = round(quantity / 5) * 5
+        elif quantity >= 10:
+            value = round(quantity)
+        else:
+            value = round(quantity, 2)
+        return f'{value:g}'
+
+    whole = int(quantity)
+    fraction = min(FRACTIONS, key=lambda option: abs(option - (quantity - whole)))
+    if fraction == 1:
+        whole, fraction = whole + 1, Fraction(0)
+    if whole == 0 and fraction == 0:
+        # Never round a real amount away entirely.
+        fraction = Fraction(1, 4)
+    if not fraction:
+        return str(whole)
+    return f'{whole} {fraction}' if whole else str(fraction)
+
+
+def format_ingredient(quantity, quantity_max, unit, item, note):
+    """Rebuild an ingredient line from (scaled) parts."""
+
+    amount = round_quantity(quantity, unit)
+    if quantity_max is not None:
+        amount = f'{amount}-{round_quantity(quantity_max, unit)}'
+    if unit:
+        plural = (quantity_max or quantity) > 1
+        amount = f"{amount}{unit}" if unit in METRIC_UNITS else f"{amount} {PLURAL_UNITS.get(unit, unit) if plural else unit}"
+    text = f'{amount} {item}'.strip()
+    return f'{text}, {note}' if note else text
+
+
+def scale_ingredients(ingredients, factor):
+    """
+    Scale parsed ingredient rows by ``factor``.
+
+    Args:
+        ingredients (iterable): Dicts with ``position``, ``text`` and the
+            parsed fields of ``RecipeIngredient``.
+        factor (float): New servings divided by the recipe's servings.
+
+    Returns:
+        list: Dicts with ``position``, ``text`` (rebuilt from the scaled
+        parts), ``original``, ``quantity``, ``quantityMax``, ``unit``,
+        ``item`` and ``note``. Lines without a quantity are left as written.
+    """
+
+    scaled = []
+    for row in ingredients:
+        entry = {
+            'position': row['position'],
+            'text': row['text'],
+            'original': row['text'],
+            'quantity': None,
+            'quantityMax': None,
+            'unit': row['unit'],
+            'item': row['item'],
+            'note': row['note'],
+        }
+        if row['quantity'] is not None and row['item']:
+            quantity_max = row['quantityMax'] * factor if row['quantityMax'] is not None else None
+            quantity, unit, quantity_max = promote_unit(row['quantity'] * factor, row['unit'], quantity_max)
+            entry.update(
+                quantity=quantity,
+                quantityMax=quantity_max,
+                unit=unit,
+                text=format_ingredient(quantity, quantity_max, unit, row['item'], row['note']),
+            )
+        scaled.append(entry)
+    return scaled
+
+
+def scaled_ingredients(recipe, serves):
+    """Return ``recipe``'s ingredients scaled to ``serves`` servings, cached until the recipe changes."""
+
+    config = get_scaling_config()
+    cache = caches[config['CACHE']]
+    key = f'scaled_ingredients:{recipe.pk}:{serves}:{recipe.updatedAt.timestamp()}'
+    result = cache.get(key)
+    if result is None:
+        metrics.increment('misses')
+        rows = recipe.content.get('ingredients') if recipe.content else (
+            RecipeIngredient.objects.filter(recipe=recipe).order_by('position').values(*Recipe.CONTENT_INGREDIENT_FIELDS)
+        )
+        result = scale_ingredients(rows, serves / recipe.serves if recipe.serves else 1)
+        cache.set(key, result, config['TIMEOUT'])
+    else:
+        metrics.increment('hits')
+    return result
+
+
+def parse_serves(value):
+    """Return ``value`` as a serving count, or None if it is missing or out of range."""
+
+    try:
+        serves = int(value)
+    except (TypeError, ValueError):
+        return None
+    return serves if 1 <= serves <= get_scaling_config()['MAX_SERVES'] else None
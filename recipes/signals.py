@@ -1,9 +1,22 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
 from django.dispatch import receiver
 from recipes.models import (
+    AdminLog,
+    Recipe,
     RecipeFavourite,
-    RecipeRating
+    RecipeRating,
+    Tag,
+    TimelineEntry,
+    User
 )
+from recipes.backends import invalidate_user
+from recipes.feeds import backfill_timeline, enqueue_fanout, remove_from_timeline
+from recipes.query_cache import invalidate_model
+from recipes.recommendations import queue_similarity_update
+from recipes.sqlite import apply_pragmas, get_pragma_profile
+from recipes.trending import record_event
 
 
 @receiver([post_save, post_delete], sender=RecipeRating)
@@ -15,4 +28,108 @@ def update_recipe_rating_stats(sender, instance, **kwargs):
 @receiver([post_save, post_delete], sender=RecipeFavourite)
 def update_recipe_favourite_count(sender, instance, **kwargs):
     """Update recipe favourite count when a favourite is added/deleted."""
-    instance.recipe.update_favourite_count()
\ No newline at end of file
+    instance.recipe.update_favourite_count()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop a saved or deleted user from the authentication user cache."""
+    invalidate_user(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def update_follow_counts_on_delete(sender, instance, **kwargs):
+    """Take a deleted user off the follow counters of everyone they followed or were followed by."""
+    follows = User.following.through.objects
+    followed_ids = list(follows.filter(from_user=instance).values_list('to_user_id', flat=True))
+    follower_ids = list(follows.filter(to_user=instance).values_list('from_user_id', flat=True))
+    User.objects.filter(pk__in=followed_ids).update(followers_count=F('followers_count') - 1)
+    User.objects.filter(pk__in=follower_ids).update(following_count=F('following_count') - 1)
+    for user_id in {*followed_ids, *follower_ids}:
+        invalidate_user(user_id)
+
+
+@receiver(post_save, sender=Recipe)
+def queue_recipe_fanout(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Queue new public recipes for followers' feeds, and pull recipes that stop being public."""
+    if raw or (update_fields is not None and 'visibility' not in update_fields):
+        return
+    if instance.visibility != 'public':
+        if not created:
+            instance.timeline_entries.all().delete()
+    elif created or not instance.timeline_entries.exists():
+        enqueue_fanout(instance)
+
+
+@receiver(m2m_changed, sender=User.following.through)
+def update_timelines_on_follow(sender, instance, action, reverse, pk_set, **kwargs):
+    """Backfill a feed when its owner follows someone, and prune it on unfollow."""
+    if action == 'post_add':
+        if reverse:
+            for follower_id in pk_set:
+                backfill_timeline(follower_id, [instance.pk])
+        else:
+            backfill_timeline(instance.pk, pk_set)
+    elif action == 'post_remove':
+        if reverse:
+            for follower_id in pk_set:
+                remove_from_timeline(follower_id, [instance.pk])
+        else:
+            remove_from_timeline(instance.pk, pk_set)
+    elif action == 'post_clear':
+        if reverse:
+            TimelineEntry.objects.filter(author=instance).delete()
+        else:
+            instance.timeline_entries.all().delete()
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Apply the SQLite pragma profile to every new database connection."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            apply_pragmas(cursor, get_pragma_profile(connection.alias))
+
+
+@receiver([post_save, post_delete], sender=RecipeRating)
+@receiver([post_save, post_delete], sender=RecipeFavourite)
+def queue_recipe_similarity_update(sender, instance, raw=False, **kwargs):
+    """Queue a recipe for the next similarity run when its ratings or favourites change."""
+    if not raw:
+        queue_similarity_update(instance.recipe_id)
+
+
+@receiver(post_save, sender=RecipeRating)
+def record_rating_trend(sender, instance, created, raw=False, **kwargs):
+    """Count a new rating towards its recipe's trending score, weighted by its stars."""
+    if created and not raw:
+        record_event(instance.recipe_id, 'rating', instance.rating / 5)
+
+
+@receiver(post_save, sender=RecipeFavourite)
+def record_favourite_trend(sender, instance, created, raw=False, **kwargs):
+    """Count a new favourite towards its recipe's trending score."""
+    if created and not raw:
+        record_event(instance.recipe_id, 'favourite')
+
+
+@receiver(post_save)
+@receiver(post_delete, sender=AdminLog)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=Tag)
+def invalidate_query_cache(sender, using, **kwargs):
+    """
+    Invalidate cached queries that read the table of a saved or deleted row.
+
+    Saves are tracked for every model. Deletes are only tracked for models
+    with a caching manager, because any post_delete receiver disables
+    Django's fast (signal-free) deletes for that model.
+    """
+    invalidate_model(sender, using=using)
+
+
+@receiver(m2m_changed)
+def invalidate_query_cache_m2m(sender, action, using, **kwargs):
+    """Invalidate cached queries that read a many-to-many table that changed."""
+    if action.startswith('post_'):
+        invalidate_model(sender, using=using)
@@ -0,0 +1,115 @@
+"""
+SQLite connection tuning.
+
+Every new SQLite connection gets the pragma profile from
+``settings.SQLITE_PRAGMAS`` (merged over ``DEFAULT_PRAGMAS``). The profile
+switches the database to WAL so readers no longer block behind a writer,
+and gives writers a busy timeout so they wait for the lock instead of
+failing with "database is locked".
+"""
+
+import os
+import sqlite3
+
+from django.conf import settings
+from recipes.routers import get_replica_config
+
+
+DEFAULT_PRAGMAS = {
+    # Must come first so the journal mode switch below can wait for the lock.
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    # Negative values are KiB: 20 MB page cache per connection.
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+ALLOWED_PRAGMAS = set(DEFAULT_PRAGMAS) | {'wal_autocheckpoint', 'journal_size_limit', 'query_only'}
+
+# The read replica is a snapshot file swapped in whole by refresh_replica, so
+# it must not grow a -wal file of its own and must never be written to.
+REPLICA_PRAGMAS = {
+    'journal_mode': None,
+    'query_only': 'ON',
+}
+
+
+def get_pragma_profile(alias=None):
+    """Return the pragma profile configured for this deployment (and database alias)."""
+
+    profile = dict(DEFAULT_PRAGMAS)
+    profile.update(getattr(settings, 'SQLITE_PRAGMAS', {}) or {})
+    if alias is not None and alias == get_replica_config()['ALIAS']:
+        profile.update(REPLICA_PRAGMAS)
+    return profile
+
+
+def pragma_statements(profile):
+    """
+    Build the ``PRAGMA`` statements for a profile.
+
+    Pragma names cannot be bound as parameters, so names are checked against
+    ``ALLOWED_PRAGMAS`` and values must be plain numbers or words. Entries set
+    to None are skipped.
+
+    Raises:
+        ValueError: If a pragma name or value is not allowed.
+    """
+
+    statements = []
+    for name, value in profile.items():
+        if value is None:
+            continue
+        if name not in ALLOWED_PRAGMAS:
+            raise ValueError(f"Unsupported SQLite pragma '{name}'.")
+        value = str(value)
+        if not value.lstrip('-').isalnum():
+            raise ValueError(f"Invalid value '{value}' for SQLite pragma '{name}'.")
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_pragmas(cursor, profile=None):
+    """Apply a pragma profile (the configured one by default) using a DB-API cursor."""
+
+    for statement in pragma_statements(profile or get_pragma_profile()):
+        cursor.execute(statement)
+
+
+def snapshot_database(connection, target_path):
+    """
+    Copy a live database into ``target_path`` using the SQLite backup API.
+
+    The copy is written to a temporary file next to the target, switched to
+    a rollback journal, then moved over the target in one rename, so readers
+    of the old file never see a half-written snapshot.
+    """
+
+    temporary_path = f'{target_path}.tmp'
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    connection.ensure_connection()
+    target = sqlite3.connect(temporary_path)
+    try:
+        connection.connection.backup(target)
+        target.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        target.close()
+    os.replace(temporary_path, target_path)
+
+
+def optimize(connection, analyze=False):
+    """
+    Refresh the query planner statistics.
+
+    ``PRAGMA optimize`` only re-analyses tables whose statistics are stale, so
+    it is cheap enough to run on a schedule. ``analyze=True`` runs a full
+    ``ANALYZE`` first, which is useful after bulk imports or new indexes.
+    """
+
+    with connection.cursor() as cursor:
+        if analyze:
+            cursor.execute('ANALYZE')
+        cursor.execute('PRAGMA optimize')
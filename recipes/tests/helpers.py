@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 from django.urls import reverse
 from with_asserts.mixin import AssertHTMLMixin
+from recipes.models import Recipe, RecipeIngredient
 
 def reverse_with_next(url_name, next_url):
     """Extended version of reverse to generate URLs with redirects"""
@@ -8,6 +11,24 @@ def reverse_with_next(url_name, next_url):
     return url
 
 
+def make_recipe(author, name, ingredients=(), tags=(), **fields):
+    """Create a public recipe with the given ingredient lines and tags; ``fields`` override the defaults."""
+    defaults = {
+        'description': 'Desc',
+        'serves': 2,
+        'difficulty': 'easy',
+        'prepTime': timedelta(minutes=10),
+        'cookTime': timedelta(minutes=20),
+        'visibility': 'public',
+    }
+    recipe = Recipe.objects.create(author=author, name=name, **{**defaults, **fields})
+    for position, text in enumerate(ingredients, 1):
+        RecipeIngredient.objects.create(recipe=recipe, text=text, position=position)
+    if tags:
+        recipe.tags.set(tags)
+    return recipe
+
+
 class LogInTester:
     """Class support login in tests."""
  
@@ -0,0 +1,28 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipes.models import User
+from recipes.models.user import hash_email
+
+
+class BackfillEmailHashesTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def test_fills_missing_and_stale_hashes(self):
+        User.objects.filter(username='@johndoe').update(email_hash='stale')
+        out = StringIO()
+        call_command('backfill_email_hashes', batch_size=2, stdout=out)
+        self.assertIn('Updated the email hash of 4 users.', out.getvalue())
+        for user in User.objects.all():
+            self.assertEqual(user.email_hash, hash_email(user.email))
+
+    def test_second_run_updates_nothing(self):
+        call_command('backfill_email_hashes', stdout=StringIO())
+        out = StringIO()
+        call_command('backfill_email_hashes', stdout=out)
+        self.assertIn('Updated the email hash of 0 users.', out.getvalue())
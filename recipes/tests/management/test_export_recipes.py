@@ -0,0 +1,44 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from recipes.models import Recipe, User
+
+
+class ExportRecipesCommandTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.recipe = Recipe.objects.create(
+            author=User.objects.get(username='@johndoe'),
+            name='Soup',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+
+    def test_writes_json_lines_to_standard_output(self):
+        out, err = StringIO(), StringIO()
+        call_command('export_recipes', stdout=out, stderr=err)
+        self.assertEqual(json.loads(out.getvalue())['name'], 'Soup')
+        self.assertIn('Exported 1 recipes.', err.getvalue())
+
+    def test_writes_html_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = StringIO()
+            call_command('export_recipes', format='html', output=directory, stdout=out)
+            self.assertIn('Wrote 1 recipe pages, removed 0.', out.getvalue())
+            self.assertTrue(os.path.exists(os.path.join(directory, 'recipes', str(self.recipe.pk), 'index.html')))
+
+    def test_html_needs_a_directory(self):
+        with self.assertRaises(CommandError):
+            call_command('export_recipes', format='html', stdout=StringIO())
@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from recipes.models import Recipe
+
+
+class ImportRecipesCommandTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def write_dump(self, suffix, text):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as dump:
+            dump.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_imports_json_lines_file(self):
+        path = self.write_dump('.jsonl', json.dumps({
+            'name': 'Toast', 'description': 'Toasted bread.', 'serves': 1, 'difficulty': 'easy',
+            'prep_minutes': 1, 'cook_minutes': 3, 'visibility': 'public',
+            'ingredients': ['2 slices bread'], 'steps': ['Toast the bread.'],
+        }) + '\n{"name": "Broken"}\n')
+        out, err = StringIO(), StringIO()
+        call_command('import_recipes', path, author='@johndoe', stdout=out, stderr=err)
+
+        self.assertIn('Imported 1 recipes (1 skipped).', out.getvalue())
+        self.assertIn('Record 2:', err.getvalue())
+        self.assertEqual(Recipe.objects.get(name='Toast').author.username, '@johndoe')
+
+    def test_invalid_utf8_is_an_error_after_importing_what_was_read(self):
+        line = json.dumps({
+            'name': 'Toast', 'description': 'Toasted bread.', 'serves': 1, 'difficulty': 'easy',
+            'prep_minutes': 1, 'cook_minutes': 3, 'visibility': 'public',
+            'ingredients': ['2 slices bread'], 'steps': ['Toast the bread.'],
+        }) + '\n'
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(handle, 'wb') as dump:
+            dump.write((line * 100).encode() + b'\xff\n')
+        self.addCleanup(os.remove, path)
+
+        with self.assertRaisesMessage(CommandError, 'is not UTF-8 text'):
+            call_command('import_recipes', path, author='@johndoe', stdout=StringIO(), stderr=StringIO())
+        self.assertGreater(Recipe.objects.filter(name='Toast').count(), 0)
+
+    def test_unknown_author_is_an_error(self):
+        path = self.write_dump('.csv', 'name\n')
+        with self.assertRaises(CommandError):
+            call_command('import_recipes', path, author='@nobody', stdout=StringIO())
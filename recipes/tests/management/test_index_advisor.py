@@ -0,0 +1,90 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from recipes.management.commands.index_advisor import is_covered, normalise_sql, suggest_index
+from recipes.models import Recipe, User
+from recipes.tests.helpers import make_recipe
+
+
+class IndexAdvisorHelperTests(TestCase):
+    def test_normalise_sql_replaces_literals(self):
+        sql = 'SELECT "t"."id" FROM "t" WHERE ("t"."name" = \'it\'\'s\' AND "t"."id" IN (1, 2, 3)) LIMIT 21'
+        self.assertEqual(
+            normalise_sql(sql),
+            'SELECT "t"."id" FROM "t" WHERE ("t"."name" = ? AND "t"."id" IN (...)) LIMIT ?',
+        )
+
+    def test_normalise_sql_keeps_identifiers_with_digits(self):
+        sql = 'SELECT "recipes_recipe"."id" FROM "recipes_recipe" WHERE "recipes_recipe"."author_id" = 12'
+        self.assertIn('"recipes_recipe"."author_id" = ?', normalise_sql(sql))
+
+    def test_suggest_index_puts_equality_before_ordering(self):
+        sql = (
+            'SELECT "r"."id" FROM "r" WHERE ("r"."difficulty" = \'easy\' AND "r"."visibility" = \'public\') '
+            'ORDER BY "r"."createdAt" DESC'
+        )
+        self.assertEqual(suggest_index(sql), ('r', ['difficulty', 'visibility'], ['-createdAt']))
+
+    def test_suggest_index_without_filters_or_ordering(self):
+        self.assertIsNone(suggest_index('SELECT "r"."id" FROM "r"'))
+
+    def test_is_covered_ignores_equality_order_and_direction(self):
+        existing = [['visibility', 'difficulty', 'createdAt']]
+        self.assertTrue(is_covered(['difficulty', 'visibility'], ['-createdAt'], existing))
+        self.assertFalse(is_covered(['difficulty', 'visibility'], ['totalTime'], existing))
+
+
+class IndexAdvisorCommandTests(TransactionTestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json', 'recipes/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.recipe = Recipe.objects.create(
+            author=self.user,
+            name='Advisor Recipe',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+
+    def test_command_records_query_shapes(self):
+        out = StringIO()
+        call_command('index_advisor', user='@johndoe', stdout=out)
+        self.assertIn('Recorded', out.getvalue())
+        self.assertIn('shapes', out.getvalue())
+
+    def test_command_does_not_flag_indexed_dashboard_query(self):
+        out = StringIO()
+        call_command('index_advisor', user='@johndoe', url=['/dashboard/'], stdout=out)
+        self.assertIn('No missing indexes found.', out.getvalue())
+
+    def test_command_leaves_database_and_caches_alone(self):
+        recipe = make_recipe(self.jane, 'Jane Recipe')
+        url = reverse('view_recipe', kwargs={'recipe_id': recipe.id})
+        out = StringIO()
+        call_command('index_advisor', user='@johndoe', url=[url], rounds=2, stdout=out)
+        self.assertIn('Recorded', out.getvalue())
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.trendingScore, 0)
+        self.assertFalse(Session.objects.exists())
+        self.assertIsNone(caches['default'].get(f'trending:view:{recipe.pk}:user:{self.user.pk}'))
+
+    def test_command_refuses_to_run_inside_a_transaction(self):
+        with transaction.atomic(), self.assertRaises(CommandError):
+            call_command('index_advisor', user='@johndoe', url=['/dashboard/'], stdout=StringIO())
+
+    def test_command_rejects_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('index_advisor', user='@nobody', stdout=StringIO())
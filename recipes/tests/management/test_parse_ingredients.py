@@ -0,0 +1,60 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipes.models import IngredientPosting, Recipe, RecipeIngredient, RecipeSignature, User
+
+
+class ParseIngredientsTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.recipe = recipe = Recipe.objects.create(
+            author=User.objects.get(username='@johndoe'),
+            name='Soup',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+        # bulk_create bypasses save(), like ingredients saved before parsing existed.
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(recipe=recipe, text='1 onion, diced', position=1),
+            RecipeIngredient(recipe=recipe, text='500ml stock', position=2),
+            RecipeIngredient(recipe=recipe, text='2 carrots', position=3),
+            RecipeIngredient(recipe=recipe, text='1 1/2', position=4),
+        ])
+
+    def test_parses_unparsed_ingredients(self):
+        out = StringIO()
+        call_command('parse_ingredients', batch_size=2, stdout=out)
+        self.assertIn('Parsed 4 ingredients.', out.getvalue())
+        stock = RecipeIngredient.objects.get(text='500ml stock')
+        self.assertEqual((stock.quantity, stock.unit, stock.item), (500, 'ml', 'stock'))
+
+    def test_second_run_parses_nothing_unless_all(self):
+        call_command('parse_ingredients', stdout=StringIO())
+        out = StringIO()
+        call_command('parse_ingredients', stdout=out)
+        self.assertIn('Parsed 0 ingredients.', out.getvalue())
+        call_command('parse_ingredients', '--all', stdout=out)
+        self.assertIn('Parsed 4 ingredients.', out.getvalue())
+
+    def test_refreshes_content_and_indexes_of_touched_recipes(self):
+        updated_at = self.recipe.updatedAt
+        call_command('parse_ingredients', batch_size=2, stdout=StringIO())
+        self.recipe.refresh_from_db()
+        self.assertEqual(
+            [(row['quantity'], row['unit'], row['item']) for row in self.recipe.content['ingredients']],
+            [(1, '', 'onion'), (500, 'ml', 'stock'), (2, '', 'carrots'), (None, '', '1 1/2')],
+        )
+        self.assertGreater(self.recipe.updatedAt, updated_at)
+        self.assertTrue(RecipeSignature.objects.filter(recipe=self.recipe).exclude(minhashes=[]).exists())
+        self.assertEqual(
+            set(IngredientPosting.objects.filter(recipe=self.recipe).values_list('term__term', flat=True)),
+            {'onion', 'stock', 'carrot'},
+        )
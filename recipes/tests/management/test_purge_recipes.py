@@ -0,0 +1,29 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipes.models import Recipe, User
+from recipes.purge import tombstone_recipe
+
+
+class PurgeRecipesCommandTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def test_purges_tombstoned_recipes(self):
+        recipe = Recipe.objects.create(
+            author=User.objects.get(username='@johndoe'),
+            name='Soup',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+        tombstone_recipe(recipe)
+        out = StringIO()
+        call_command('purge_recipes', batch_size=10, stdout=out)
+        self.assertIn('Purged 1 recipes.', out.getvalue())
+        self.assertFalse(Recipe.all_objects.exists())
@@ -0,0 +1,50 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from recipes.sqlite import get_pragma_profile, pragma_statements
+
+
+class SqlitePragmaProfileTests(TestCase):
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_profile_is_applied_to_connections(self):
+        self.assertEqual(self._pragma('busy_timeout'), 5000)
+        self.assertEqual(self._pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self._pragma('temp_store'), 2)  # MEMORY
+        self.assertEqual(self._pragma('cache_size'), -20000)
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 100, 'mmap_size': None})
+    def test_settings_override_defaults(self):
+        profile = get_pragma_profile()
+        self.assertEqual(profile['busy_timeout'], 100)
+        self.assertEqual(profile['journal_mode'], 'WAL')
+        statements = pragma_statements(profile)
+        self.assertIn('PRAGMA busy_timeout = 100', statements)
+        self.assertFalse(any('mmap_size' in statement for statement in statements))
+
+    def test_unknown_pragma_is_rejected(self):
+        with self.assertRaises(ValueError):
+            pragma_statements({'writable_schema': 'ON'})
+
+    def test_invalid_pragma_value_is_rejected(self):
+        with self.assertRaises(ValueError):
+            pragma_statements({'journal_mode': 'WAL; DROP TABLE recipes_recipe'})
+
+
+class SqliteCommandTests(TestCase):
+    def test_optimize_db(self):
+        out = StringIO()
+        call_command('optimize_db', analyze=True, stdout=out)
+        self.assertIn("Optimized database 'default'", out.getvalue())
+
+    def test_sqlite_benchmark_reports_both_modes(self):
+        out = StringIO()
+        call_command('sqlite_benchmark', duration=0.2, readers=1, writers=1, stdout=out)
+        self.assertIn('default:', out.getvalue())
+        self.assertIn('profile:', out.getvalue())
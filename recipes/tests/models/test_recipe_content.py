@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import Recipe, RecipeIngredient, RecipeStep, User
+
+
+class RecipeContentTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.recipe = Recipe.objects.create(
+            author=self.user,
+            name='Omelette',
+            description='Desc',
+            serves=1,
+            difficulty='easy',
+            prepTime=timedelta(minutes=5),
+            cookTime=timedelta(minutes=5),
+            visibility='public',
+        )
+        RecipeIngredient.objects.create(recipe=self.recipe, text='20g butter', position=2)
+        RecipeIngredient.objects.create(recipe=self.recipe, text='3 eggs', position=1)
+        RecipeStep.objects.create(recipe=self.recipe, text='Whisk.', position=1)
+
+    def test_refresh_content_copies_rows_in_order(self):
+        self.recipe.refresh_content()
+        self.recipe.refresh_from_db()
+        self.assertEqual(
+            [ingredient['text'] for ingredient in self.recipe.content['ingredients']],
+            ['3 eggs', '20g butter'],
+        )
+        self.assertEqual(self.recipe.content['ingredients'][1]['unit'], 'g')
+        self.assertEqual(self.recipe.content['steps'], [{'position': 1, 'text': 'Whisk.'}])
+
+    def test_getters_fall_back_to_rows_until_content_is_written(self):
+        self.assertEqual([ingredient.text for ingredient in self.recipe.get_ingredients()], ['3 eggs', '20g butter'])
+        self.recipe.refresh_content()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.recipe.get_steps(), [{'position': 1, 'text': 'Whisk.'}])
+
+    def test_detail_page_reads_content_without_row_queries(self):
+        self.recipe.refresh_content()
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('view_recipe', args=[self.recipe.id]))
+        self.assertContains(response, '20g butter')
+        self.assertContains(response, 'Whisk.')
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('FROM "recipes_recipeingredient"', sql)
+        self.assertNotIn('FROM "recipes_recipestep"', sql)
+
+    def test_create_view_writes_content(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse('create_recipe'), {
+            'name': 'Toast',
+            'description': 'Desc',
+            'serves': 1,
+            'difficulty': 'easy',
+            'visibility': 'public',
+            'prepTime': '00:01:00',
+            'cookTime': '00:03:00',
+            'ingredients-TOTAL_FORMS': '2',
+            'ingredients-INITIAL_FORMS': '0',
+            'ingredients-0-text': '2 slices bread',
+            'ingredients-1-text': 'Butter',
+            'steps-TOTAL_FORMS': '1',
+            'steps-INITIAL_FORMS': '0',
+            'steps-0-text': 'Toast the bread.',
+        })
+        recipe = Recipe.objects.get(name='Toast')
+        self.assertEqual(
+            [(ingredient['position'], ingredient['text']) for ingredient in recipe.content['ingredients']],
+            [(1, '2 slices bread'), (2, 'Butter')],
+        )
+        self.assertEqual(recipe.content['steps'][0]['text'], 'Toast the bread.')
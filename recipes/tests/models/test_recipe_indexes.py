@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+
+from recipes.models import Recipe, RecipeIngredient, RecipeRating, User
+
+
+class RecipeIndexTests(TestCase):
+    """Check that the hot read paths are served by an index rather than a sort."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.recipe = Recipe.objects.create(
+            author=self.user,
+            name='Indexed Recipe',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+        RecipeIngredient.objects.create(recipe=self.recipe, text='1 egg', position=1)
+        RecipeRating.objects.create(recipe=self.recipe, user=self.other_user, rating=4)
+
+    def _plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_sorted_by_index(self, queryset):
+        plan = self._plan(queryset)
+        self.assertFalse(
+            any('TEMP B-TREE FOR ORDER BY' in detail for detail in plan),
+            f'Query needs a temporary sort: {plan}',
+        )
+
+    def test_dashboard_recipes_use_author_index(self):
+        self.assert_sorted_by_index(Recipe.objects.filter(author=self.user).order_by('-createdAt'))
+
+    def test_filtered_search_uses_composite_index(self):
+        self.assert_sorted_by_index(
+            Recipe.objects.filter(visibility='public', difficulty='easy').order_by('-createdAt')
+        )
+
+    def test_search_sorts_use_index(self):
+        for sort in ['-createdAt', '-averageRating', 'totalTime', '-trendingScore']:
+            self.assert_sorted_by_index(Recipe.objects.order_by(sort))
+
+    def test_public_listing_uses_visibility_index(self):
+        self.assert_sorted_by_index(Recipe.objects.filter(visibility='public').order_by('-createdAt'))
+
+    def test_trending_listing_uses_visibility_index(self):
+        self.assert_sorted_by_index(
+            Recipe.objects.filter(visibility='public', trendingScore__gt=0).order_by('-trendingScore')
+        )
+
+    def test_profile_reviews_use_user_index(self):
+        self.assert_sorted_by_index(RecipeRating.objects.filter(user=self.other_user).order_by('-createdAt'))
+
+    def test_recipe_ingredients_use_position_index(self):
+        self.assert_sorted_by_index(RecipeIngredient.objects.filter(recipe=self.recipe).order_by('position'))
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.test import TestCase
+
+from recipes.ingredients import parse_ingredient
+from recipes.models import Recipe, RecipeIngredient, User
+
+
+class ParseIngredientTests(TestCase):
+    def assert_parsed(self, text, quantity, unit, item, note='', quantity_max=None):
+        parsed = parse_ingredient(text)
+        self.assertEqual(
+            (parsed.quantity, parsed.quantity_max, parsed.unit, parsed.item, parsed.note),
+            (quantity, quantity_max, unit, item, note),
+        )
+
+    def test_quantity_attached_to_unit(self):
+        self.assert_parsed('200g dried pasta', 200, 'g', 'dried pasta')
+
+    def test_preparation_note_after_comma(self):
+        self.assert_parsed('1 courgette, sliced', 1, '', 'courgette', 'sliced')
+
+    def test_fractions(self):
+        self.assert_parsed('1 1/2 tbsp olive oil', 1.5, 'tbsp', 'olive oil')
+        self.assert_parsed('½ cup milk', 0.5, 'cup', 'milk')
+        self.assert_parsed('1½ Cups flour', 1.5, 'cup', 'flour')
+
+    def test_ranges(self):
+        self.assert_parsed('2-3 cloves garlic, crushed', 2, 'clove', 'garlic', 'crushed', quantity_max=3)
+        self.assert_parsed('2 to 3 apples', 2, '', 'apples', quantity_max=3)
+
+    def test_units_are_normalised(self):
+        self.assert_parsed('2 tablespoons honey', 2, 'tbsp', 'honey')
+        self.assert_parsed('1 tin of chickpeas', 1, 'can', 'chickpeas')
+        self.assert_parsed('10 ml. vinegar', 10, 'ml', 'vinegar')
+
+    def test_adjectives_and_parentheses_become_notes(self):
+        self.assert_parsed('2 large eggs (beaten)', 2, '', 'eggs', 'large, beaten')
+        self.assert_parsed('1 onion, finely chopped', 1, '', 'onion', 'finely chopped')
+
+    def test_lines_without_quantity(self):
+        self.assert_parsed('a pinch of salt', 1, 'pinch', 'salt')
+        self.assert_parsed('Salt and pepper to taste', None, '', 'salt and pepper', 'to taste')
+        self.assert_parsed('Olive oil', None, '', 'olive oil')
+
+    def test_invalid_fractions_are_not_quantities(self):
+        self.assert_parsed('1/0 cup sugar', None, '', '1/0 cup sugar')
+        self.assert_parsed('2-1/0 eggs', 2, '', 'eggs')
+
+    def test_lines_with_nothing_after_the_quantity_keep_their_text(self):
+        self.assert_parsed('1 1/2', None, '', '1 1/2')
+        self.assert_parsed('2 Cloves', None, '', '2 cloves')
+
+
+class RecipeIngredientTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(username='@author', email='author@test.com', password='Password123')
+        self.recipe = Recipe.objects.create(
+            author=author,
+            name='Test Recipe',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+
+    def test_save_stores_parsed_fields(self):
+        ingredient = RecipeIngredient.objects.create(recipe=self.recipe, text='400g chopped tomatoes', position=1)
+        ingredient.refresh_from_db()
+        self.assertEqual(
+            (ingredient.quantity, ingredient.unit, ingredient.item, ingredient.note),
+            (400, 'g', 'tomatoes', 'chopped'),
+        )
+
+    def test_save_with_update_fields_reparses(self):
+        ingredient = RecipeIngredient.objects.create(recipe=self.recipe, text='1 lemon', position=1)
+        ingredient.text = '2 limes'
+        ingredient.save(update_fields=['text'])
+        ingredient.refresh_from_db()
+        self.assertEqual((ingredient.quantity, ingredient.item), (2, 'limes'))
+
+    def test_save_with_zero_denominator(self):
+        ingredient = RecipeIngredient.objects.create(recipe=self.recipe, text='1/0 cup sugar', position=1)
+        self.assertIsNone(ingredient.quantity)
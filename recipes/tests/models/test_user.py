@@ -143,6 +143,16 @@ class UserModelTestCase(TestCase):
         expected_gravatar_url = self._gravatar_url(size=60)
         self.assertEqual(actual_gravatar_url, expected_gravatar_url)
 
+    def test_save_stores_email_hash(self):
+        self.user.save()
+        self.assertEqual(self.user.email_hash, UserModelTestCase.GRAVATAR_URL.rsplit('/', 1)[1])
+
+    def test_email_hash_follows_email_changes(self):
+        self.user.email = 'Someone.Else@Example.org '
+        self.user.save(update_fields=['email'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email_hash, 'e36eeca80731a6dbd9d94f4083516886')
+
     def _gravatar_url(self, size):
         gravatar_url = f"{UserModelTestCase.GRAVATAR_URL}?size={size}&default=mp"
         return gravatar_url
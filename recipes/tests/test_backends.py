@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.backends import CachedModelBackend, clear_user_cache, metrics
+from recipes.models import User
+
+
+class CachedModelBackendTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        clear_user_cache()
+        metrics.reset()
+        self.backend = CachedModelBackend()
+        self.user = User.objects.get(username='@johndoe')
+
+    def test_repeated_lookups_are_cached(self):
+        self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        self.assertEqual(metrics.get('hits'), 1)
+
+    def test_tests_never_use_the_on_disk_shared_cache(self):
+        self.assertIsInstance(caches['shared'], LocMemCache)
+
+    def test_each_lookup_returns_a_separate_object(self):
+        first = self.backend.get_user(self.user.pk)
+        first.first_name = 'Unsaved'
+        self.assertEqual(self.backend.get_user(self.user.pk).first_name, 'John')
+
+    def test_role_change_is_picked_up_immediately(self):
+        self.backend.get_user(self.user.pk)
+        self.user.role = User.Roles.ADMIN
+        self.user.save()
+        self.assertTrue(self.backend.get_user(self.user.pk).is_admin)
+
+    def test_deleted_user_is_not_returned(self):
+        self.backend.get_user(self.user.pk)
+        self.user.delete()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_requests_skip_the_session_and_user_queries(self):
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(reverse('dashboard'))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('dashboard'))
+        tables = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('"django_session"', tables)
+        self.assertNotIn('WHERE "recipes_user"."id" = ', tables)
+        self.assertEqual(get_user(response.wsgi_request), self.user)
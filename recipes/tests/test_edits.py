@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from recipes.edits import diff_rows
+
+
+def stored(*texts):
+    return [SimpleNamespace(pk=index + 1, text=text, position=index + 1) for index, text in enumerate(texts)]
+
+
+def make_row(**fields):
+    return SimpleNamespace(pk=None, **fields)
+
+
+class DiffRowsTests(SimpleTestCase):
+    def test_unchanged_rows_write_nothing(self):
+        changes = diff_rows(stored('a', 'b', 'c'), ['a', 'b', 'c'], make_row)
+        self.assertEqual(changes.written, 0)
+        self.assertFalse(changes.edited)
+        self.assertEqual([row.pk for row in changes.rows], [1, 2, 3])
+
+    def test_edited_line_updates_only_its_row(self):
+        changes = diff_rows(stored('a', 'b', 'c'), ['a', 'B', 'c'], make_row)
+        self.assertEqual([(row.pk, row.text) for row in changes.changed], [(2, 'B')])
+        self.assertEqual((changes.moved, changes.created, changes.deleted), ([], [], []))
+
+    def test_inserted_line_creates_a_row_and_shifts_the_rest(self):
+        changes = diff_rows(stored('a', 'b', 'c'), ['a', 'new', 'b', 'c'], make_row)
+        self.assertEqual([(row.text, row.position) for row in changes.created], [('new', 2)])
+        self.assertEqual([(row.pk, row.position) for row in changes.moved], [(2, 3), (3, 4)])
+        self.assertEqual(changes.changed, [])
+
+    def test_removed_line_deletes_its_row_and_shifts_the_rest(self):
+        changes = diff_rows(stored('a', 'b', 'c'), ['b', 'c'], make_row)
+        self.assertEqual([row.pk for row in changes.deleted], [1])
+        self.assertEqual([(row.pk, row.position) for row in changes.moved], [(2, 1), (3, 2)])
+
+    def test_replacing_more_lines_than_before_reuses_rows_first(self):
+        changes = diff_rows(stored('a', 'b', 'c'), ['a', 'x', 'y', 'c'], make_row)
+        self.assertEqual([(row.pk, row.text) for row in changes.changed], [(2, 'x')])
+        self.assertEqual([(row.text, row.position) for row in changes.created], [('y', 3)])
+        self.assertEqual([(row.pk, row.position) for row in changes.moved], [(3, 4)])
+
+    def test_rows_are_returned_in_submitted_order(self):
+        changes = diff_rows(stored('a', 'b'), ['b', 'a'], make_row)
+        self.assertEqual([(row.text, row.position) for row in changes.rows], [('b', 1), ('a', 2)])
@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.exports import export_html, export_jsonl
+from recipes.imports import import_recipes
+from recipes.models import Recipe, RecipeIngredient, RecipeRating, RecipeStep, Tag, User
+
+
+class ExportRecipesTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json', 'recipes/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.john = User.objects.get(username='@johndoe')
+        self.quick = Tag.objects.create(name='Quick')
+
+    def create_recipe(self, name, visibility='public', ingredients=('200g pasta', '2 eggs'), steps=('Boil.', 'Mix.')):
+        recipe = Recipe.objects.create(
+            author=self.john,
+            name=name,
+            description='A recipe.',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            cuisine='Italian',
+            visibility=visibility,
+        )
+        recipe.tags.add(self.quick)
+        for position, text in enumerate(ingredients, start=1):
+            RecipeIngredient.objects.create(recipe=recipe, text=text, position=position)
+        for position, text in enumerate(steps, start=1):
+            RecipeStep.objects.create(recipe=recipe, text=text, position=position)
+        recipe.refresh_content()
+        return recipe
+
+    def export(self, chunk_size=None):
+        out = io.StringIO()
+        count = export_jsonl(out, chunk_size=chunk_size)
+        return count, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_exports_public_recipes_with_ingredients_steps_and_tags(self):
+        recipe = self.create_recipe('Carbonara')
+        self.create_recipe('Secret', visibility='private')
+
+        count, records = self.export()
+
+        self.assertEqual(count, 1)
+        self.assertEqual(records[0]['id'], recipe.pk)
+        self.assertEqual(records[0]['author'], '@johndoe')
+        self.assertEqual(records[0]['tags'], ['Quick'])
+        self.assertEqual(records[0]['ingredients'], ['200g pasta', '2 eggs'])
+        self.assertEqual(records[0]['steps'], ['Boil.', 'Mix.'])
+        self.assertEqual((records[0]['prep_minutes'], records[0]['cook_minutes']), (10, 20))
+
+    def test_recipes_without_content_are_read_from_their_rows(self):
+        recipe = self.create_recipe('Legacy')
+        Recipe.objects.filter(pk=recipe.pk).update(content={})
+
+        _, records = self.export()
+        self.assertEqual(records[0]['ingredients'], ['200g pasta', '2 eggs'])
+        self.assertEqual(records[0]['steps'], ['Boil.', 'Mix.'])
+
+    def test_query_count_does_not_grow_with_recipes(self):
+        for i in range(3):
+            self.create_recipe(f'Recipe {i}')
+        with CaptureQueriesContext(connection) as few:
+            self.export(chunk_size=10)
+        for i in range(3, 9):
+            self.create_recipe(f'Recipe {i}')
+        with CaptureQueriesContext(connection) as many:
+            count, _ = self.export(chunk_size=10)
+
+        self.assertEqual(count, 9)
+        self.assertEqual(len(few), len(many))
+
+    def test_export_can_be_imported(self):
+        self.create_recipe('Carbonara')
+        _, records = self.export()
+        Recipe.objects.all().delete()
+
+        result = import_recipes(io.StringIO(''.join(json.dumps(record) + '\n' for record in records)))
+
+        self.assertEqual(result.created, 1)
+        recipe = Recipe.objects.get(name='Carbonara')
+        self.assertEqual([row['text'] for row in recipe.get_ingredients()], ['200g pasta', '2 eggs'])
+
+
+class ExportHtmlTests(ExportRecipesTests):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def page(self, recipe):
+        return os.path.join(self.directory.name, 'recipes', str(recipe.pk), 'index.html')
+
+    def test_writes_anonymous_page_for_each_public_recipe(self):
+        recipe = self.create_recipe('Carbonara')
+        secret = self.create_recipe('Secret', visibility='private')
+        RecipeRating.objects.create(recipe=recipe, user=User.objects.get(username='@janedoe'), rating=5, comment='Lovely')
+
+        written, removed = export_html(self.directory.name)
+
+        self.assertEqual((written, removed), (1, 0))
+        with open(self.page(recipe), encoding='utf-8') as page:
+            html = page.read()
+        self.assertIn('Carbonara', html)
+        self.assertIn('200g pasta', html)
+        self.assertIn('Lovely', html)
+        self.assertNotIn('csrfmiddlewaretoken', html)
+        self.assertFalse(os.path.exists(self.page(secret)))
+
+    def test_removes_pages_of_recipes_no_longer_public(self):
+        recipe = self.create_recipe('Carbonara')
+        export_html(self.directory.name)
+        recipe.visibility = 'private'
+        recipe.save()
+
+        written, removed = export_html(self.directory.name)
+
+        self.assertEqual((written, removed), (0, 1))
+        self.assertFalse(os.path.exists(self.page(recipe)))
+
+    def test_exporting_pages_does_not_count_as_views(self):
+        recipe = self.create_recipe('Carbonara')
+        export_html(self.directory.name)
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.trendingScore, 0)
@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from recipes.feeds import decode_cursor, encode_cursor, get_feed, process_fanout_queue
+from recipes.models import FanoutTask, TimelineEntry, User
+from recipes.tests.helpers import make_recipe
+from recipes.views.follow_user import toggle_follow
+
+
+class FeedTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.reader = User.objects.get(username='@johndoe')
+        self.author = User.objects.get(username='@janedoe')
+        self.other_follower = User.objects.get(username='@petrapickles')
+        toggle_follow(self.reader, self.author)
+        toggle_follow(self.other_follower, self.author)
+        self.author.refresh_from_db()
+
+    def test_public_recipe_is_queued_and_fanned_out(self):
+        recipe = make_recipe(self.author, 'Soup')
+        self.assertTrue(FanoutTask.objects.filter(recipe=recipe).exists())
+        self.assertEqual(process_fanout_queue(batch_size=1), 2)
+        self.assertFalse(FanoutTask.objects.exists())
+        self.assertEqual(get_feed(self.reader)[0], [recipe])
+        self.assertEqual(get_feed(self.other_follower)[0], [recipe])
+
+    def test_private_recipe_is_not_queued(self):
+        make_recipe(self.author, 'Secret', visibility='private')
+        self.assertFalse(FanoutTask.objects.exists())
+
+    def test_recipe_made_private_leaves_feeds(self):
+        recipe = make_recipe(self.author, 'Soup')
+        process_fanout_queue()
+        recipe.visibility = 'private'
+        recipe.save()
+        self.assertEqual(get_feed(self.reader)[0], [])
+
+    def test_feed_is_paginated_by_cursor(self):
+        recipes = [make_recipe(self.author, f'Recipe {i}') for i in range(5)]
+        process_fanout_queue()
+        first_page, cursor = get_feed(self.reader, page_size=2)
+        self.assertEqual(first_page, [recipes[4], recipes[3]])
+        second_page, cursor = get_feed(self.reader, cursor, page_size=2)
+        self.assertEqual(second_page, [recipes[2], recipes[1]])
+        last_page, cursor = get_feed(self.reader, cursor, page_size=2)
+        self.assertEqual(last_page, [recipes[0]])
+        self.assertIsNone(cursor)
+
+    def test_feed_page_query_count(self):
+        make_recipe(self.author, 'Soup')
+        process_fanout_queue()
+        with self.assertNumQueries(2):
+            self.assertEqual(len(get_feed(self.reader)[0]), 1)
+
+    def test_cursor_round_trip(self):
+        recipe = make_recipe(self.author, 'Soup')
+        self.assertEqual(decode_cursor(encode_cursor(recipe.createdAt, recipe.id)), (recipe.createdAt, recipe.id))
+        self.assertIsNone(decode_cursor('garbage'))
+        self.assertIsNone(decode_cursor(None))
+
+    def test_follow_backfills_and_unfollow_removes(self):
+        someone = User.objects.get(username='@peterpickles')
+        recipe = make_recipe(someone, 'Stew')
+        process_fanout_queue()
+        self.reader.following.add(someone)
+        self.assertIn(recipe, get_feed(self.reader)[0])
+        self.reader.following.remove(someone)
+        self.assertNotIn(recipe, get_feed(self.reader)[0])
+        someone.followers.add(self.reader)
+        self.assertIn(recipe, get_feed(self.reader)[0])
+
+    @override_settings(FEED={'FANOUT_LIMIT': 1})
+    def test_high_fanout_authors_are_read_on_demand(self):
+        recipe = make_recipe(self.author, 'Popular')
+        self.assertEqual(process_fanout_queue(), 0)
+        self.assertFalse(TimelineEntry.objects.filter(recipe=recipe).exists())
+        self.assertEqual(get_feed(self.reader)[0], [recipe])
+
+    def test_command_drains_queue(self):
+        make_recipe(self.author, 'Soup')
+        out = StringIO()
+        call_command('fanout_timelines', stdout=out)
+        self.assertIn('Delivered 2 timeline entries.', out.getvalue())
+
+    def test_dashboard_shows_feed(self):
+        recipe = make_recipe(self.author, 'Soup')
+        process_fanout_queue()
+        self.client.login(username=self.reader.username, password='Password123')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(list(response.context['feed']), [recipe])
+        self.assertContains(response, 'Soup')
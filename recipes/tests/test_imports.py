@@ -0,0 +1,158 @@
+import io
+import json
+
+from unittest.mock import patch
+
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from recipes.imports import import_recipes, read_records
+from recipes.minhash import similar_by_ingredients
+from recipes.models import FanoutTask, LSHBucket, Recipe, Tag, User
+from recipes.pantry import pantry_search
+
+
+def record(name, **overrides):
+    data = {
+        'name': name,
+        'author': '@johndoe',
+        'description': 'An imported recipe.',
+        'serves': 2,
+        'difficulty': 'easy',
+        'prep_minutes': 10,
+        'cook_minutes': 20,
+        'cuisine': 'Italian',
+        'visibility': 'public',
+        'tags': ['Quick'],
+        'ingredients': ['200g dried pasta', '2 eggs, beaten'],
+        'steps': ['Boil the pasta.', 'Stir in the eggs.'],
+    }
+    data.update(overrides)
+    return data
+
+
+def jsonl(*records):
+    return io.StringIO(''.join(json.dumps(data) + '\n' for data in records))
+
+
+class ImportRecipesTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json', 'recipes/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.john = User.objects.get(username='@johndoe')
+        Tag.objects.create(name='Quick')
+
+    def test_imports_recipe_with_rows_content_and_tags(self):
+        result = import_recipes(jsonl(record('Carbonara', tags=['Quick', 'Dinner'])))
+
+        self.assertEqual((result.created, result.failed), (1, 0))
+        recipe = Recipe.objects.get(name='Carbonara')
+        self.assertEqual(recipe.author, self.john)
+        self.assertEqual(recipe.totalTime.total_seconds(), 30 * 60)
+        self.assertEqual(
+            list(recipe.ingredients.values_list('position', 'quantity', 'unit', 'item', 'note')),
+            [(1, 200.0, 'g', 'dried pasta', ''), (2, 2.0, '', 'eggs', 'beaten')],
+        )
+        self.assertEqual([step['text'] for step in recipe.get_steps()], ['Boil the pasta.', 'Stir in the eggs.'])
+        self.assertEqual(sorted(recipe.tags.values_list('name', flat=True)), ['Dinner', 'Quick'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_imported_recipes_are_indexed_and_queued_for_feeds(self):
+        import_recipes(jsonl(record('Carbonara'), record('Carbonara Again'), record('Secret', visibility='private')))
+
+        carbonara = Recipe.objects.get(name='Carbonara')
+        self.assertEqual([recipe.name for recipe in similar_by_ingredients(carbonara)], ['Carbonara Again'])
+        self.assertEqual(len(pantry_search('pasta, eggs', self.john)), 3)
+        self.assertEqual(FanoutTask.objects.count(), 2)
+
+    def test_invalid_records_are_skipped_and_reported(self):
+        lines = io.StringIO(
+            json.dumps(record('Good')) + '\n'
+            + 'not json\n'
+            + json.dumps(record('No Author', author='@nobody')) + '\n'
+            + json.dumps(record('Bad Difficulty', difficulty='impossible')) + '\n'
+            + json.dumps(record('Bad Ingredients', ingredients='pasta')) + '\n'
+        )
+        result = import_recipes(lines)
+
+        self.assertEqual((result.created, result.failed), (1, 4))
+        self.assertEqual([number for number, _ in result.errors], [2, 3, 4, 5])
+        self.assertIn('Unknown author: @nobody', result.errors[1][1])
+        self.assertIn('difficulty', result.errors[2][1])
+        self.assertEqual(list(Recipe.objects.values_list('name', flat=True)), ['Good'])
+
+    def test_author_must_be_a_username(self):
+        result = import_recipes(jsonl(record('Listed', author=['@johndoe']), record('Good')))
+        self.assertEqual((result.created, result.failed), (1, 1))
+        self.assertEqual(result.errors, [(1, 'author must be a username')])
+
+    def test_default_author_is_used_for_records_without_one(self):
+        jane = User.objects.get(username='@janedoe')
+        import_recipes(jsonl(record('Anonymous', author=None)), default_author=jane)
+        self.assertEqual(Recipe.objects.get(name='Anonymous').author, jane)
+
+    def test_reads_csv_with_separated_lists(self):
+        lines = io.StringIO(
+            'name,author,description,serves,difficulty,prep_minutes,cook_minutes,cuisine,visibility,tags,ingredients,steps\n'
+            'Salad,@johndoe,Fresh.,2,easy,5,0,,public,Quick|Light,1 lettuce|2 tomatoes,Chop.|Toss.\n'
+        )
+        records = list(read_records(lines, 'csv'))
+        self.assertEqual(records[0][1]['ingredients'], ['1 lettuce', '2 tomatoes'])
+
+        lines.seek(0)
+        result = import_recipes(lines, format='csv')
+        self.assertEqual(result.created, 1)
+        self.assertEqual(Recipe.objects.get(name='Salad').steps.count(), 2)
+
+    def test_chunk_is_written_in_bulk(self):
+        def count(size):
+            records = [record(f'Recipe {size} {i}') for i in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                import_recipes(jsonl(*records), chunk_size=size)
+            return len(queries)
+
+        count(1)
+        small = count(2)
+        # Large chunks only add statements where SQLite's parameter limit splits a bulk insert.
+        self.assertLess(count(50), small + 10)
+        self.assertEqual(Recipe.objects.count(), 53)
+
+    def test_each_chunk_is_a_transaction(self):
+        result = import_recipes(jsonl(*[record(f'Recipe {i}') for i in range(5)]), chunk_size=2)
+        self.assertEqual(result.created, 5)
+        self.assertEqual(Recipe.objects.count(), 5)
+
+    def test_invalid_utf8_keeps_records_read_before_it(self):
+        def lines():
+            for i in range(3):
+                yield json.dumps(record(f'Recipe {i}')) + '\n'
+            raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+        result = import_recipes(lines(), chunk_size=2)
+
+        self.assertTrue(result.truncated)
+        self.assertEqual((result.created, result.failed), (3, 0))
+        self.assertEqual(result.errors, [(4, 'Not UTF-8 text; the rest of the file was not read.')])
+        self.assertEqual(Recipe.objects.count(), 3)
+
+
+@override_settings(DB_WRITE_RETRY={'ATTEMPTS': 3, 'BASE_DELAY': 0, 'MAX_DELAY': 0})
+class ImportRetryTests(TransactionTestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def test_retried_chunk_recreates_tags_from_the_rolled_back_attempt(self):
+        bulk_create = LSHBucket.objects.bulk_create
+        attempts = []
+
+        def locked_once(*args, **kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OperationalError('database is locked')
+            return bulk_create(*args, **kwargs)
+
+        with patch.object(LSHBucket.objects, 'bulk_create', side_effect=locked_once):
+            result = import_recipes(jsonl(record('Carbonara', tags=['Brand New'])))
+
+        self.assertEqual((result.created, len(attempts)), (1, 2))
+        self.assertEqual(list(Recipe.objects.get().tags.values_list('name', flat=True)), ['Brand New'])
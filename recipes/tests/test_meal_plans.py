@@ -0,0 +1,106 @@
+from datetime import date
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.meal_plans import add_entry, get_plan, remove_entry, shopping_list, week_start
+from recipes.models import MealPlanEntry, RecipeIngredient, User
+from recipes.tests.helpers import make_recipe
+
+
+class MealPlanTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        caches['default'].clear()
+        self.john = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.week = week_start(date(2026, 10, 21))
+        self.pancakes = make_recipe(self.jane, 'Pancakes', ['200g flour', '2 eggs', '1 tsp sugar', 'Salt to taste'], serves=2)
+        self.bread = make_recipe(self.jane, 'Bread', ['1 kg flour', '2 tbsp sugar', '1 egg, beaten'], serves=4)
+
+    def _texts(self):
+        return [item['text'] for item in shopping_list(get_plan(self.john, self.week))]
+
+    def test_week_start_is_monday(self):
+        self.assertEqual(self.week, date(2026, 10, 19))
+
+    def test_shopping_list_merges_scales_and_normalises_units(self):
+        add_entry(self.john, self.week, self.pancakes, 0, serves=4)
+        add_entry(self.john, self.week, self.bread, 2)
+        self.assertEqual(self._texts(), ['5 eggs', '1.4kg flour', 'salt', '8 tsp sugar'])
+
+    def test_single_item_is_named_in_the_singular(self):
+        add_entry(self.john, self.week, self.bread, 2, serves=2)
+        self.assertIn('1/2 egg', self._texts())
+
+    def test_same_recipe_twice_counts_twice(self):
+        add_entry(self.john, self.week, self.pancakes, 0)
+        add_entry(self.john, self.week, self.pancakes, 1)
+        self.assertIn('400g flour', self._texts())
+
+    def test_shopping_list_is_one_grouped_query(self):
+        add_entry(self.john, self.week, self.pancakes, 0)
+        add_entry(self.john, self.week, self.bread, 2)
+        plan = get_plan(self.john, self.week)
+        with CaptureQueriesContext(connection) as queries:
+            shopping_list(plan)
+        # The cache key lookup plus the grouped query.
+        self.assertEqual(len(queries), 2)
+        with CaptureQueriesContext(connection) as queries:
+            shopping_list(plan)
+        self.assertEqual(len(queries), 1)
+
+    def test_cache_expires_when_plan_changes(self):
+        entry = add_entry(self.john, self.week, self.pancakes, 0)
+        add_entry(self.john, self.week, self.bread, 2)
+        self.assertIn('1.2kg flour', self._texts())
+        remove_entry(entry)
+        self.assertIn('1kg flour', self._texts())
+
+    def test_cache_expires_when_recipe_changes(self):
+        add_entry(self.john, self.week, self.bread, 2)
+        self.assertIn('1kg flour', self._texts())
+        self.bread.serves = 2
+        self.bread.save()
+        self.assertIn('1kg flour', self._texts())
+        RecipeIngredient.objects.filter(recipe=self.bread, item='flour').update(quantity=500, unit='g')
+        self.bread.save()
+        self.assertIn('500g flour', self._texts())
+
+    def test_views_add_list_and_remove(self):
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.post(
+            reverse('add_to_meal_plan', args=[self.pancakes.id]),
+            {'day': 3, 'serves': 6, 'week': '2026-10-22'},
+        )
+        self.assertRedirects(response, f"{reverse('meal_plan')}?week=2026-10-19")
+        entry = MealPlanEntry.objects.get()
+        self.assertEqual((entry.day, entry.serves, entry.plan.user), (3, 6, self.john))
+
+        response = self.client.get(reverse('meal_plan'), {'week': '2026-10-19'})
+        self.assertContains(response, 'Pancakes')
+        response = self.client.get(reverse('shopping_list'), {'week': '2026-10-19'})
+        self.assertContains(response, '600g flour')
+
+        self.client.post(reverse('remove_from_meal_plan', args=[entry.id]))
+        self.assertFalse(MealPlanEntry.objects.exists())
+
+    def test_cannot_plan_others_private_recipes(self):
+        secret = make_recipe(self.jane, 'Secret', ['1 egg'], serves=2, visibility='private')
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.post(reverse('add_to_meal_plan', args=[secret.id]), {'day': 0})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cannot_remove_others_entries(self):
+        entry = add_entry(self.jane, self.week, self.pancakes, 0)
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.post(reverse('remove_from_meal_plan', args=[entry.id]))
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(MealPlanEntry.objects.filter(pk=entry.pk).exists())
@@ -0,0 +1,125 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.minhash import (
+    band_hashes,
+    compute_signature,
+    estimate_similarity,
+    find_similar,
+    index_recipe,
+    recipe_tokens,
+    similar_by_ingredients,
+)
+from recipes.models import LSHBucket, RecipeSignature, Tag, User
+from recipes.tests.helpers import make_recipe
+
+
+CARBONARA = ['200g spaghetti', '100g pancetta', '2 large eggs', '50g pecorino cheese', 'black pepper']
+
+
+class MinHashTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.john = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.pasta = Tag.objects.create(name='Pasta')
+
+    def _recipe(self, name, ingredients, tags=(), author=None, **fields):
+        recipe = make_recipe(author or self.jane, name, ingredients, tags, **fields)
+        index_recipe(recipe)
+        return recipe
+
+    def test_tokens_drop_quantities_and_units(self):
+        self.assertEqual(
+            recipe_tokens(['2 cups of chopped Onions', '1 tsp salt'], ['Vegan']),
+            {'i:onion', 'i:salt', 't:vegan'},
+        )
+
+    def test_signature_estimates_jaccard(self):
+        tokens = {f'i:word{i}' for i in range(40)}
+        other = {f'i:word{i}' for i in range(20, 60)}
+        estimate = estimate_similarity(compute_signature(tokens), compute_signature(other))
+        # True Jaccard is 20 / 60.
+        self.assertAlmostEqual(estimate, 1 / 3, delta=0.15)
+        self.assertEqual(compute_signature(tokens), compute_signature(set(tokens)))
+
+    def test_index_stores_signature_and_one_bucket_per_band(self):
+        recipe = self._recipe('Carbonara', CARBONARA)
+        self.assertEqual(len(RecipeSignature.objects.get(recipe=recipe).minhashes), 64)
+        self.assertEqual(LSHBucket.objects.filter(recipe=recipe).count(), 16)
+
+        index_recipe(recipe)
+        self.assertEqual(LSHBucket.objects.filter(recipe=recipe).count(), 16)
+
+    def test_similar_recipes_share_ingredients_and_tags(self):
+        original = self._recipe('Carbonara', CARBONARA, [self.pasta])
+        variant = self._recipe('Carbonara with peas', CARBONARA + ['100g peas'], [self.pasta])
+        self._recipe('Fruit salad', ['1 apple', '1 banana', '100g grapes'])
+        self._recipe('Secret carbonara', CARBONARA, [self.pasta], visibility='private')
+
+        self.assertEqual(similar_by_ingredients(original), [variant])
+
+    def test_lookup_is_bounded_by_bands_not_catalogue(self):
+        original = self._recipe('Carbonara', CARBONARA)
+        for i in range(5):
+            self._recipe(f'Unrelated {i}', [f'ingredient{i}x', f'other{i}y'])
+        signature = RecipeSignature.objects.get(recipe=original).minhashes
+        with CaptureQueriesContext(connection) as queries:
+            find_similar(signature, Q(), exclude_id=original.id)
+        self.assertLessEqual(len(queries), 3)
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {queries[0]["sql"]}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('USING INDEX', plan)
+        self.assertNotIn('SCAN recipes_lshbucket', plan)
+        self.assertEqual(len(band_hashes(signature)), 16)
+
+    def test_recipe_page_lists_similar_recipes(self):
+        original = self._recipe('Carbonara', CARBONARA)
+        variant = self._recipe('Carbonara with peas', CARBONARA + ['100g peas'])
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('view_recipe', args=[original.id]))
+        self.assertEqual(response.context['similar_by_ingredients'], [variant])
+        self.assertContains(response, 'Similar recipes')
+
+    def test_create_warns_about_likely_duplicate(self):
+        self._recipe('Carbonara', CARBONARA)
+        self.client.login(username='@johndoe', password='Password123')
+        data = {
+            'name': 'My carbonara',
+            'description': 'Desc',
+            'serves': 2,
+            'difficulty': 'easy',
+            'visibility': 'public',
+            'prepTime': '00:10:00',
+            'cookTime': '00:20:00',
+            'ingredients-TOTAL_FORMS': str(len(CARBONARA)),
+            'ingredients-INITIAL_FORMS': '0',
+            'steps-TOTAL_FORMS': '1',
+            'steps-INITIAL_FORMS': '0',
+            'steps-0-text': 'Cook.',
+        }
+        for i, text in enumerate(CARBONARA):
+            data[f'ingredients-{i}-text'] = text
+        response = self.client.post(reverse('create_recipe'), data)
+        self.assertTrue(RecipeSignature.objects.filter(recipe__name='My carbonara').exists())
+        self.assertContains(response, "looks very similar to &#x27;Carbonara&#x27; by @janedoe")
+
+    def test_command_indexes_missing_recipes(self):
+        recipe = self._recipe('Carbonara', CARBONARA)
+        RecipeSignature.objects.all().delete()
+        LSHBucket.objects.all().delete()
+        out = StringIO()
+        call_command('build_minhash_index', '--missing-only', stdout=out)
+        self.assertIn('Indexed 1 recipes.', out.getvalue())
+        self.assertEqual(LSHBucket.objects.filter(recipe=recipe).count(), 16)
@@ -0,0 +1,102 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from recipes.ingredients import ingredient_words
+from recipes.models import IngredientPosting, IngredientTerm, RecipeIngredient, User
+from recipes.pantry import index_ingredients, pantry_search, pantry_words
+from recipes.tests.helpers import make_recipe
+
+
+class PantryTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.john = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.omelette = self._recipe('Omelette', ['3 large eggs', '20g butter', 'pinch of salt'])
+        self.carbonara = self._recipe(
+            'Carbonara', ['200g dried spaghetti', '2 eggs, beaten', '100g pancetta', '50g pecorino']
+        )
+
+    def _recipe(self, name, ingredients, author=None, **fields):
+        recipe = make_recipe(author or self.jane, name, ingredients, **fields)
+        index_ingredients(recipe)
+        return recipe
+
+    def test_ingredient_words_strip_quantities_units_and_notes(self):
+        self.assertEqual(ingredient_words('200g dried pasta'), {'pasta'})
+        self.assertEqual(ingredient_words('1 courgette, sliced'), {'courgette'})
+        self.assertEqual(ingredient_words('2 tbsp Olive Oil'), {'olive', 'oil'})
+        self.assertEqual(ingredient_words('3 cherries'), {'cherry'})
+        self.assertEqual(pantry_words('Eggs\nbutter, salt'), {'egg', 'butter', 'salt'})
+
+    def test_ingredient_words_singularise_oes_ves_and_es_plurals(self):
+        self.assertEqual(ingredient_words('4 tomatoes'), {'tomato'})
+        self.assertEqual(ingredient_words('2 bay leaves'), {'bay', 'leaf'})
+        self.assertEqual(ingredient_words('2 peaches'), {'peach'})
+        self.assertEqual(ingredient_words('100g olives'), {'olive'})
+        self.assertEqual(ingredient_words('1 bunch chives'), {'chive'})
+
+    def test_pantry_singular_matches_oes_and_ves_plurals(self):
+        salad = self._recipe('Salad', ['4 tomatoes', '2 potatoes', '2 bay leaves'])
+        self.assertEqual(
+            set(IngredientPosting.objects.filter(recipe=salad).values_list('term__term', flat=True)),
+            {'tomato', 'potato', 'bay', 'leaf'},
+        )
+        self.assertEqual(pantry_search('tomato, potato, bay leaf', self.john), [salad])
+
+    def test_index_stores_postings_with_term_count(self):
+        postings = IngredientPosting.objects.filter(recipe=self.omelette)
+        self.assertEqual(
+            set(postings.values_list('term__term', flat=True)), {'egg', 'butter', 'salt'}
+        )
+        self.assertEqual(set(postings.values_list('recipeTermCount', flat=True)), {3})
+        # Shared words reuse one term.
+        self.assertEqual(IngredientTerm.objects.filter(term='egg').count(), 1)
+
+    def test_reindex_replaces_postings(self):
+        RecipeIngredient.objects.filter(recipe=self.omelette, text='20g butter').delete()
+        index_ingredients(self.omelette)
+        self.assertFalse(IngredientPosting.objects.filter(recipe=self.omelette, term__term='butter').exists())
+
+    def test_results_are_ranked_by_coverage(self):
+        results = pantry_search('eggs, butter, salt, spaghetti', self.john)
+        self.assertEqual(results, [self.omelette, self.carbonara])
+        self.assertEqual(results[0].coverage, 1.0)
+        self.assertEqual((results[1].matched, results[1].termCount), (2, 4))
+
+    def test_poorly_covered_recipes_are_left_out(self):
+        self.assertEqual(pantry_search('eggs', self.john), [])
+        self.assertEqual(pantry_search('eggs', self.john, min_coverage=0.25), [self.omelette, self.carbonara])
+        self.assertEqual(pantry_search('truffle', self.john), [])
+
+    def test_private_recipes_only_show_to_their_author(self):
+        secret = self._recipe('Secret', ['eggs', 'butter'], visibility='private')
+        self.assertNotIn(secret, pantry_search('eggs, butter', self.john))
+        self.assertIn(secret, pantry_search('eggs, butter', self.jane))
+
+    def test_view_lists_covered_recipes(self):
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('pantry_search'), {'ingredients': 'eggs\nbutter\nsalt'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['recipes'], [self.omelette])
+        self.assertContains(response, '100% covered')
+
+    def test_view_without_ingredients_shows_form(self):
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('pantry_search'))
+        self.assertEqual(response.context['recipes'], [])
+        self.assertNotContains(response, 'Results:')
+
+    def test_command_indexes_missing_recipes(self):
+        IngredientPosting.objects.filter(recipe=self.omelette).delete()
+        out = StringIO()
+        call_command('build_pantry_index', '--missing-only', stdout=out)
+        self.assertIn('Indexed 1 recipes.', out.getvalue())
+        self.assertTrue(IngredientPosting.objects.filter(recipe=self.omelette).exists())
@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import (
+    FanoutTask,
+    MealPlan,
+    MealPlanEntry,
+    Recipe,
+    RecipeFavourite,
+    RecipeRating,
+    RecipeSimilarity,
+    RecipeStep,
+    Tag,
+    TimelineEntry,
+    User,
+)
+from recipes.feeds import get_feed, process_fanout_queue
+from recipes.meal_plans import build_shopping_list, week_start
+from recipes.pantry import index_ingredients, pantry_search
+from recipes.purge import purge_recipes, recipe_references, tombstone_recipe
+from recipes.recommendations import similar_recipes
+from recipes.tests.helpers import make_recipe
+
+
+@override_settings(PURGE={'BATCH_SIZE': 2})
+class PurgeTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json', 'recipes/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.john = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.recipes = [self._recipe(f'Soup {number}') for number in range(3)]
+        self.recipe = self.recipes[0]
+
+    def _recipe(self, name):
+        recipe = make_recipe(self.john, name, ['200g leeks'], [Tag.objects.get_or_create(name='soup')[0]])
+        RecipeStep.objects.create(recipe=recipe, text='Simmer.', position=1)
+        RecipeRating.objects.create(recipe=recipe, user=self.jane, rating=5)
+        RecipeFavourite.objects.create(recipe=recipe, user=self.jane)
+        TimelineEntry.objects.create(user=self.jane, recipe=recipe, author=self.john, createdAt=recipe.createdAt)
+        return recipe
+
+    def test_tombstone_is_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            tombstone_recipe(self.recipe)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+        self.assertFalse(Recipe.objects.filter(pk=self.recipe.pk).exists())
+        self.assertTrue(Recipe.all_objects.filter(pk=self.recipe.pk).exists())
+        self.assertEqual(RecipeRating.objects.filter(recipe=self.recipe).count(), 1)
+
+    def test_tombstoned_recipe_is_hidden_from_related_reads(self):
+        index_ingredients(self.recipe)
+        plan = MealPlan.objects.create(user=self.jane, weekStart=week_start())
+        MealPlanEntry.objects.create(plan=plan, recipe=self.recipe, day=0)
+        RecipeSimilarity.objects.create(recipe=self.recipes[1], similar=self.recipe, score=0.5)
+        tombstone_recipe(self.recipe)
+
+        self.assertNotIn(self.recipe, get_feed(self.jane)[0])
+        self.assertNotIn(self.recipe, pantry_search('leeks', self.jane))
+        self.assertEqual(build_shopping_list(plan), [])
+        self.assertEqual(similar_recipes(self.recipes[1]), [])
+        self.assertNotIn(self.recipe, self.john.recipes.all())
+        # Rows that outlive it still reach it until the purge.
+        self.assertEqual(RecipeRating.objects.get(recipe_id=self.recipe.pk).recipe, self.recipe)
+
+    def test_purge_deletes_recipes_and_every_reference_in_batches(self):
+        RecipeSimilarity.objects.create(recipe=self.recipes[1], similar=self.recipe, score=0.5)
+        for recipe in self.recipes:
+            tombstone_recipe(recipe)
+        kept = self._recipe('Stew')
+
+        self.assertEqual(purge_recipes(max_batches=1), 2)
+        self.assertEqual(purge_recipes(), 1)
+        self.assertEqual(list(Recipe.all_objects.all()), [kept])
+        for model, field in recipe_references():
+            self.assertFalse(model._base_manager.exclude(**{field: kept}).exists(), model)
+
+    def test_purge_sends_no_rating_or_favourite_signals(self):
+        tombstone_recipe(self.recipe)
+        with patch.object(Recipe, 'update_rating_stats') as ratings, \
+                patch.object(Recipe, 'update_favourite_count') as favourites:
+            purge_recipes()
+        ratings.assert_not_called()
+        favourites.assert_not_called()
+
+    def test_purge_leaves_live_recipes_alone(self):
+        self.assertEqual(purge_recipes(), 0)
+        self.assertEqual(Recipe.objects.count(), 3)
+
+    def test_fanout_skips_tombstoned_recipes(self):
+        self.john.followers.add(self.jane)
+        TimelineEntry.objects.all().delete()
+        tombstone_recipe(self.recipe)
+        process_fanout_queue()
+        self.assertFalse(TimelineEntry.objects.filter(recipe=self.recipe).exists())
+        self.assertTrue(FanoutTask.objects.filter(recipe=self.recipe).exists())
+        purge_recipes()
+        self.assertFalse(FanoutTask.objects.filter(recipe_id=self.recipe.pk).exists())
+
+
+class DeleteRecipeViewTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.recipe = make_recipe(self.user, 'Soup')
+        self.client.login(username='@johndoe', password='Password123')
+
+    def test_delete_tombstones_and_hides_the_recipe(self):
+        response = self.client.get(reverse('delete_recipe', args=[self.recipe.pk]))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.assertIsNotNone(Recipe.all_objects.get(pk=self.recipe.pk).deletedAt)
+        self.assertEqual(self.client.get(reverse('view_recipe', args=[self.recipe.pk])).status_code, 404)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from recipes.models import AdminLog, Recipe, Tag, User
+from recipes.query_cache import metrics
+
+
+class QueryCacheTests(TransactionTestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.user = User.objects.get(username='@johndoe')
+        self.tag = Tag.objects.create(name='quick')
+        self.recipe = Recipe.objects.create(
+            author=self.user,
+            name='Cached Recipe',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+
+    def test_repeated_query_is_served_from_cache(self):
+        self.assertEqual([tag.name for tag in Tag.objects.order_by('name')], ['quick'])
+        with self.assertNumQueries(0):
+            self.assertEqual([tag.name for tag in Tag.objects.order_by('name')], ['quick'])
+        self.assertEqual(metrics.get('hits'), 1)
+
+    def test_models_without_default_ttl_are_opt_in(self):
+        list(Recipe.objects.all())
+        with self.assertNumQueries(1):
+            list(Recipe.objects.all())
+        list(Recipe.objects.cached())
+        with self.assertNumQueries(0):
+            list(Recipe.objects.cached())
+
+    def test_uncached_opts_out(self):
+        list(Tag.objects.all())
+        with self.assertNumQueries(1):
+            list(Tag.objects.uncached())
+
+    def test_values_list_is_cached_separately_from_rows(self):
+        list(Tag.objects.all())
+        self.assertEqual(list(Tag.objects.values_list('name', flat=True)), ['quick'])
+
+    def test_save_invalidates(self):
+        list(Tag.objects.all())
+        Tag.objects.create(name='vegan')
+        self.assertEqual(sorted(tag.name for tag in Tag.objects.all()), ['quick', 'vegan'])
+
+    def test_delete_invalidates(self):
+        list(Tag.objects.all())
+        self.tag.delete()
+        self.assertEqual(list(Tag.objects.all()), [])
+
+    def test_bulk_update_invalidates(self):
+        list(Tag.objects.all())
+        Tag.objects.filter(pk=self.tag.pk).update(name='slow')
+        self.assertEqual([tag.name for tag in Tag.objects.all()], ['slow'])
+
+    def test_joined_table_write_invalidates(self):
+        query = Recipe.objects.filter(tags__name='quick').cached()
+        self.assertEqual(list(query), [])
+        self.recipe.tags.add(self.tag)
+        self.assertEqual(list(query.all()), [self.recipe])
+
+    def test_write_to_unrelated_table_keeps_entry(self):
+        list(Tag.objects.all())
+        AdminLog.objects.create(actor=self.user, description='Something happened')
+        with self.assertNumQueries(0):
+            list(Tag.objects.all())
+
+    def test_cache_is_bypassed_inside_transactions(self):
+        list(Tag.objects.all())
+        with transaction.atomic():
+            Tag.objects.create(name='pending')
+            with self.assertNumQueries(1):
+                self.assertEqual(len(Tag.objects.all()), 2)
+            transaction.set_rollback(True)
+        self.assertEqual([tag.name for tag in Tag.objects.all()], ['quick'])
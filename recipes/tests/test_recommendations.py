@@ -0,0 +1,130 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from recipes.models import RecipeFavourite, RecipeRating, RecipeSimilarity, SimilarityUpdate, User
+from recipes import recommendations
+from recipes.recommendations import load_interactions, recommended_recipes, similar_recipes, update_similarities
+from recipes.tests.helpers import make_recipe
+
+
+class RecommendationTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.john = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.petra = User.objects.get(username='@petrapickles')
+        self.peter = User.objects.get(username='@peterpickles')
+        self.soup = make_recipe(self.peter, 'Soup')
+        self.bread = make_recipe(self.peter, 'Bread')
+        self.cake = make_recipe(self.peter, 'Cake')
+
+    def _neighbours(self, recipe):
+        return list(
+            RecipeSimilarity.objects.filter(recipe=recipe).order_by('-score').values_list('similar__name', flat=True)
+        )
+
+    def test_interactions_queue_recipes(self):
+        RecipeRating.objects.create(user=self.jane, recipe=self.soup, rating=5)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        self.assertEqual(
+            set(SimilarityUpdate.objects.values_list('recipeId', flat=True)),
+            {self.soup.id, self.bread.id},
+        )
+
+    def test_co_liked_recipes_are_similar(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        RecipeFavourite.objects.create(user=self.petra, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.petra, recipe=self.bread)
+        RecipeRating.objects.create(user=self.petra, recipe=self.cake, rating=1)
+
+        self.assertEqual(update_similarities(), 3)
+        self.assertFalse(SimilarityUpdate.objects.exists())
+        self.assertEqual(self._neighbours(self.soup), ['Bread', 'Cake'])
+        self.assertEqual(similar_recipes(self.soup, limit=1), [self.bread])
+
+    def test_incremental_update_patches_neighbours(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        update_similarities()
+
+        RecipeFavourite.objects.create(user=self.petra, recipe=self.cake)
+        RecipeFavourite.objects.create(user=self.petra, recipe=self.soup)
+        self.assertEqual(update_similarities(), 2)
+        self.assertIn('Soup', self._neighbours(self.cake))
+        self.assertIn('Cake', self._neighbours(self.soup))
+
+        # Bread was not queued, but soup's score in its list is refreshed.
+        RecipeFavourite.objects.filter(user=self.jane, recipe=self.soup).delete()
+        update_similarities()
+        self.assertEqual(self._neighbours(self.bread), [])
+
+    def test_incremental_load_is_limited_to_the_neighbourhood(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        RecipeFavourite.objects.create(user=self.petra, recipe=self.bread)
+        RecipeFavourite.objects.create(user=self.john, recipe=self.cake)
+
+        by_recipe, by_user = load_interactions([self.soup.id])
+        self.assertEqual(set(by_recipe), {self.soup.id, self.bread.id})
+        # Bread's whole column is loaded, for its norm.
+        self.assertEqual(set(by_recipe[self.bread.id]), {self.jane.id, self.petra.id})
+        self.assertNotIn(self.john.id, by_user)
+
+    def test_recipes_queued_during_a_run_stay_queued(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        load = recommendations.load_interactions
+
+        def load_and_requeue(*args, **kwargs):
+            interactions = load(*args, **kwargs)
+            RecipeFavourite.objects.create(user=self.petra, recipe=self.soup)
+            return interactions
+
+        with patch('recipes.recommendations.load_interactions', side_effect=load_and_requeue):
+            update_similarities()
+        self.assertEqual(list(SimilarityUpdate.objects.values_list('recipeId', flat=True)), [self.soup.id])
+
+    def test_private_recipes_are_not_shown(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        update_similarities()
+        self.bread.visibility = 'private'
+        self.bread.save()
+        self.assertEqual(similar_recipes(self.soup), [])
+
+    def test_recommended_recipes_skip_seen_recipes(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.cake)
+        RecipeRating.objects.create(user=self.john, recipe=self.soup, rating=5)
+        RecipeRating.objects.create(user=self.john, recipe=self.cake, rating=2)
+        update_similarities()
+
+        self.assertEqual(recommended_recipes(self.john), [self.bread])
+        self.assertEqual(recommended_recipes(self.petra), [])
+
+    def test_recipe_page_lists_similar_recipes(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        update_similarities()
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('view_recipe', args=[self.soup.id]))
+        self.assertEqual(response.context['similar_recipes'], [self.bread])
+        self.assertContains(response, 'People who liked this also liked')
+
+    def test_command_rebuilds_everything_with_full(self):
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.soup)
+        RecipeFavourite.objects.create(user=self.jane, recipe=self.bread)
+        SimilarityUpdate.objects.all().delete()
+        out = StringIO()
+        call_command('update_similarities', '--full', stdout=out)
+        self.assertIn('Recomputed similarities for 3 recipes', out.getvalue())
+        self.assertEqual(self._neighbours(self.soup), ['Bread'])
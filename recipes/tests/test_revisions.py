@@ -0,0 +1,116 @@
+import random
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from recipes.models import Recipe, RecipeIngredient, RecipeRevision, RecipeStep, Tag, User
+from recipes.revisions import (
+    apply_patch,
+    make_patch,
+    record_baseline,
+    record_revision,
+    recipe_document,
+    revision_document,
+    revision_history,
+)
+
+
+class PatchTests(SimpleTestCase):
+    def test_changed_scalar_is_replaced(self):
+        patch = make_patch({'name': 'Soup', 'serves': 2}, {'name': 'Stew', 'serves': 2})
+        self.assertEqual(patch, [{'op': 'replace', 'path': '/name', 'value': 'Stew'}])
+
+    def test_one_changed_line_is_one_operation(self):
+        old = {'ingredients': [f'line {i}' for i in range(50)]}
+        new = {'ingredients': list(old['ingredients'])}
+        new['ingredients'][20] = 'changed'
+        self.assertEqual(make_patch(old, new), [{'op': 'replace', 'path': '/ingredients/20', 'value': 'changed'}])
+
+    def test_patch_round_trips_list_edits(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            old = {'steps': [rng.choice('abcdef') for _ in range(rng.randrange(8))], 'name': 'x'}
+            new = {'steps': [rng.choice('abcdef') for _ in range(rng.randrange(8))], 'name': rng.choice('xy')}
+            self.assertEqual(apply_patch(old, make_patch(old, new)), new)
+
+    def test_apply_patch_leaves_the_original_alone(self):
+        old = {'tags': ['a']}
+        apply_patch(old, [{'op': 'add', 'path': '/tags/1', 'value': 'b'}])
+        self.assertEqual(old, {'tags': ['a']})
+
+
+@override_settings(REVISIONS={'SNAPSHOT_EVERY': 4})
+class RecordRevisionTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.recipe = Recipe.objects.create(
+            author=self.user,
+            name='Soup',
+            description='Warming.',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+        for position, text in enumerate(['1 onion', '500ml stock'], start=1):
+            RecipeIngredient.objects.create(recipe=self.recipe, text=text, position=position)
+        RecipeStep.objects.create(recipe=self.recipe, text='Simmer.', position=1)
+        self.recipe.refresh_content()
+
+    def edit(self, number):
+        self.recipe.name = f'Soup {number}'
+        ingredients = self.recipe.content['ingredients'] + [{'text': f'{number} carrots', 'position': number + 2}]
+        self.recipe.content = {**self.recipe.content, 'ingredients': ingredients}
+        self.recipe.save()
+        return record_revision(self.recipe, self.user)
+
+    def test_first_revision_is_a_snapshot(self):
+        revision = record_revision(self.recipe, self.user)
+        self.assertEqual((revision.number, revision.delta), (1, None))
+        self.assertEqual(revision.snapshot, recipe_document(self.recipe))
+
+    def test_deltas_between_snapshots(self):
+        record_revision(self.recipe, self.user)
+        documents = {1: recipe_document(self.recipe)}
+        for number in range(2, 11):
+            revision = self.edit(number)
+            documents[number] = recipe_document(self.recipe)
+            self.assertEqual(revision.number, number)
+            self.assertEqual(revision.snapshot is not None, number in (5, 9))
+            if revision.delta:
+                self.assertEqual(len(revision.delta), 2)
+                self.assertEqual(revision.changedFields, ['ingredients', 'name'])
+
+        for number, document in documents.items():
+            with self.assertNumQueries(1):
+                self.assertEqual(revision_document(self.recipe, number), document)
+
+    def test_unchanged_recipe_records_nothing(self):
+        record_revision(self.recipe, self.user)
+        self.assertIsNone(record_revision(self.recipe, self.user))
+        self.assertEqual(self.recipe.revisions.count(), 1)
+
+    def test_tags_are_versioned(self):
+        record_revision(self.recipe, self.user)
+        self.recipe.tags.add(Tag.objects.create(name='Winter'))
+        revision = record_revision(self.recipe, self.user)
+        self.assertEqual(revision.delta, [{'op': 'add', 'path': '/tags/0', 'value': 'Winter'}])
+
+    def test_history_is_one_query_without_documents(self):
+        record_revision(self.recipe, self.user)
+        self.edit(2)
+        with self.assertNumQueries(1):
+            history = [(revision.number, revision.author.username) for revision in revision_history(self.recipe)]
+        self.assertEqual(history, [(2, '@johndoe'), (1, '@johndoe')])
+
+    def test_missing_revision(self):
+        with self.assertRaises(RecipeRevision.DoesNotExist):
+            revision_document(self.recipe, 3)
+
+    def test_baseline_only_recorded_once(self):
+        record_baseline(self.recipe.pk)
+        record_baseline(self.recipe.pk)
+        self.assertEqual(list(self.recipe.revisions.values_list('number', 'author')), [(1, self.user.pk)])
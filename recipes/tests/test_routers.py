@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import Recipe, User
+from recipes.routers import ReplicaRouter, _request_state, replica_available
+from recipes.sqlite import snapshot_database
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def _with_state(self, **state):
+        token = _request_state.set({'use_replica': False, 'wrote': False, **state})
+        self.addCleanup(_request_state.reset, token)
+
+    def test_mirrored_replica_is_not_available(self):
+        self.assertFalse(replica_available('replica'))
+        self.assertFalse(replica_available('missing'))
+
+    @mock.patch('recipes.routers.replica_available', return_value=True)
+    def test_reads_go_to_replica_for_replica_requests(self, available):
+        self._with_state(use_replica=True)
+        self.assertEqual(self.router.db_for_read(Recipe), 'replica')
+
+    @mock.patch('recipes.routers.replica_available', return_value=True)
+    def test_reads_stay_on_primary_outside_requests(self, available):
+        self.assertIsNone(self.router.db_for_read(Recipe))
+
+    @mock.patch('recipes.routers.replica_available', return_value=True)
+    def test_reads_return_to_primary_after_a_write(self, available):
+        self._with_state(use_replica=True)
+        self.assertEqual(self.router.db_for_write(Recipe), 'default')
+        self.assertIsNone(self.router.db_for_read(Recipe))
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'recipes'))
+        self.assertTrue(self.router.allow_migrate('default', 'recipes'))
+
+
+@mock.patch('recipes.routers.replica_available', return_value=True)
+class ReplicaMiddlewareTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.recipe = Recipe.objects.create(
+            author=self.user,
+            name='Replica Recipe',
+            description='Desc',
+            serves=2,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+        self.client.login(username=self.user.username, password='Password123')
+
+    def _get(self, url):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(url)
+        return response, len(replica_queries)
+
+    def test_read_only_view_uses_replica(self, available):
+        response, replica_queries = self._get(reverse('search_recipe'))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(replica_queries, 0)
+        self.assertNotIn('primary_reads_until', response.cookies)
+
+    def test_other_views_use_primary(self, available):
+        response, replica_queries = self._get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica_queries, 0)
+
+    def test_write_makes_user_sticky_to_primary(self, available):
+        response = self.client.post(reverse('favourite_recipe', kwargs={'recipe_id': self.recipe.id}))
+        self.assertIn('primary_reads_until', response.cookies)
+
+        response, replica_queries = self._get(reverse('view_recipe', kwargs={'recipe_id': self.recipe.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica_queries, 0)
+
+
+class ReplicaSnapshotTests(TransactionTestCase):
+    def test_snapshot_database_copies_primary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'replica.sqlite3')
+            snapshot_database(connection, path)
+            copy = sqlite3.connect(path)
+            try:
+                tables = {row[0] for row in copy.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                journal_mode = copy.execute('PRAGMA journal_mode').fetchone()[0]
+            finally:
+                copy.close()
+        self.assertIn('recipes_recipe', tables)
+        self.assertEqual(journal_mode, 'delete')
+
+    def test_refresh_replica_refuses_to_overwrite_primary(self):
+        with self.assertRaises(CommandError):
+            call_command('refresh_replica', stdout=StringIO())
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import Recipe, RecipeIngredient, User
+from recipes.scaling import promote_unit, round_quantity, scaled_ingredients
+
+
+class ScalingTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        caches['default'].clear()
+        self.recipe = Recipe.objects.create(
+            author=User.objects.get(username='@johndoe'),
+            name='Pasta bake',
+            description='Desc',
+            serves=4,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=20),
+            visibility='public',
+        )
+        for position, text in enumerate([
+            '500g dried pasta',
+            '2 tsp oregano',
+            '1 onion, diced',
+            '2-3 cloves garlic',
+            'Salt to taste',
+        ], 1):
+            RecipeIngredient.objects.create(recipe=self.recipe, text=text, position=position)
+
+    def _texts(self, serves):
+        return [row['text'] for row in scaled_ingredients(self.recipe, serves)]
+
+    def test_units_are_promoted_and_demoted(self):
+        self.assertEqual(promote_unit(1500, 'g'), (1.5, 'kg', None))
+        self.assertEqual(promote_unit(0.5, 'kg'), (500, 'g', None))
+        self.assertEqual(promote_unit(6, 'tsp'), (2, 'tbsp', None))
+        self.assertEqual(promote_unit(3, 'onion'), (3, 'onion', None))
+
+    def test_rounding(self):
+        self.assertEqual(round_quantity(333.3, 'g'), '335')
+        self.assertEqual(round_quantity(1.25, 'kg'), '1.25')
+        self.assertEqual(round_quantity(1.52, ''), '1 1/2')
+        self.assertEqual(round_quantity(0.3, 'tsp'), '1/3')
+        self.assertEqual(round_quantity(0.01, 'tsp'), '1/4')
+
+    def test_scaling_up(self):
+        self.assertEqual(self._texts(8), [
+            '1kg dried pasta',
+            '4 tsp oregano',
+            '2 onion, diced',
+            '4-6 cloves garlic',
+            'Salt to taste',
+        ])
+
+    def test_scaling_down(self):
+        self.assertEqual(self._texts(2)[:4], [
+            '250g dried pasta',
+            '1 tsp oregano',
+            '1/2 onion, diced',
+            '1-1 1/2 cloves garlic',
+        ])
+
+    def test_scaled_list_is_cached_until_recipe_changes(self):
+        self._texts(8)
+        with CaptureQueriesContext(connection) as queries:
+            self._texts(8)
+        self.assertEqual(len(queries), 0)
+
+        RecipeIngredient.objects.filter(recipe=self.recipe, position=1).delete()
+        self.recipe.save()
+        self.assertEqual(self._texts(8)[0], '4 tsp oregano')
+
+    def test_view_recipe_scales_with_serves(self):
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('view_recipe', args=[self.recipe.id]), {'serves': 8})
+        self.assertEqual(response.context['serves'], 8)
+        self.assertContains(response, '1kg dried pasta')
+        self.assertContains(response, 'Scaled from 4 to 8 servings.')
+
+    def test_view_recipe_ignores_invalid_serves(self):
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('view_recipe', args=[self.recipe.id]), {'serves': 'lots'})
+        self.assertEqual(response.context['serves'], 4)
+        self.assertContains(response, '500g dried pasta')
+
+    def test_json_variant(self):
+        response = self.client.get(reverse('recipe_ingredients', args=[self.recipe.id]), {'serves': 2})
+        data = response.json()
+        self.assertEqual((data['serves'], data['originalServes']), (2, 4))
+        self.assertEqual(data['ingredients'][0]['quantity'], 250)
+        self.assertEqual(data['ingredients'][0]['unit'], 'g')
+        self.assertEqual(data['ingredients'][4]['quantity'], None)
+
+    def test_json_variant_rejects_invalid_serves(self):
+        response = self.client.get(reverse('recipe_ingredients', args=[self.recipe.id]), {'serves': 0})
+        self.assertEqual(response.status_code, 400)
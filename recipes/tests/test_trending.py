@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.models import Recipe, RecipeFavourite, RecipeRating, TrendingEpoch, User
+from recipes.query_cache import table_versions
+from recipes.trending import get_epoch, record_event, rescale_trending_scores, trending_recipes
+from recipes.tests.helpers import make_recipe
+
+
+class TrendingTests(TestCase):
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        caches['default'].clear()
+        self.john = User.objects.get(username='@johndoe')
+        self.jane = User.objects.get(username='@janedoe')
+        self.soup = make_recipe(self.jane, 'Soup')
+        self.bread = make_recipe(self.jane, 'Bread')
+
+    def _score(self, recipe):
+        recipe.refresh_from_db(fields=['trendingScore'])
+        return recipe.trendingScore
+
+    def test_events_raise_the_score(self):
+        RecipeRating.objects.create(user=self.john, recipe=self.soup, rating=5)
+        self.assertAlmostEqual(self._score(self.soup), 3, places=3)
+        RecipeFavourite.objects.create(user=self.john, recipe=self.soup)
+        self.assertAlmostEqual(self._score(self.soup), 8, places=3)
+
+    def test_older_events_count_for_less(self):
+        epoch = get_epoch()
+        record_event(self.soup.id, 'favourite', now=epoch.startedAt)
+        record_event(self.bread.id, 'view', now=epoch.startedAt + timedelta(hours=72))
+        # 5 points three half-lives ago are worth less than 1 point now.
+        self.assertEqual(trending_recipes(), [self.bread, self.soup])
+
+    def test_rescale_keeps_ranking_and_moves_epoch(self):
+        start = get_epoch().startedAt
+        record_event(self.soup.id, 'favourite', now=start)
+        record_event(self.bread.id, 'rating', now=start + timedelta(hours=24))
+        rescale_trending_scores(now=start + timedelta(hours=48))
+
+        self.assertAlmostEqual(self._score(self.soup), 1.25)
+        self.assertAlmostEqual(self._score(self.bread), 1.5)
+        self.assertEqual(TrendingEpoch.objects.get().startedAt, start + timedelta(hours=48))
+
+    def test_rescale_zeroes_negligible_scores(self):
+        start = get_epoch().startedAt
+        record_event(self.soup.id, 'view', now=start)
+        rescale_trending_scores(now=start + timedelta(days=30))
+        self.assertEqual(self._score(self.soup), 0)
+        self.assertEqual(trending_recipes(), [])
+
+    def test_private_recipes_do_not_trend(self):
+        secret = make_recipe(self.jane, 'Secret', visibility='private')
+        record_event(secret.id, 'favourite')
+        self.assertEqual(trending_recipes(), [])
+
+    def test_views_count_once_per_viewer(self):
+        self.client.login(username='@johndoe', password='Password123')
+        url = reverse('view_recipe', args=[self.soup.id])
+        self.client.get(url)
+        self.client.get(url)
+        self.assertAlmostEqual(self._score(self.soup), 1, places=3)
+
+    def test_views_neither_pin_readers_nor_invalidate_the_query_cache(self):
+        versions = table_versions([Recipe._meta.db_table])
+        response = self.client.get(reverse('view_recipe', args=[self.soup.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(self._score(self.soup), 1, places=3)
+        self.assertNotIn('primary_reads_until', response.cookies)
+        self.assertEqual(table_versions([Recipe._meta.db_table]), versions)
+
+    def test_anonymous_views_ignore_spoofed_forwarded_for(self):
+        url = reverse('view_recipe', args=[self.soup.id])
+        for number in range(3):
+            self.client.get(url, HTTP_X_FORWARDED_FOR=f'10.0.0.{number}')
+        self.assertAlmostEqual(self._score(self.soup), 1, places=3)
+
+    def test_authors_views_do_not_count(self):
+        self.client.login(username='@janedoe', password='Password123')
+        self.client.get(reverse('view_recipe', args=[self.soup.id]))
+        self.assertEqual(self._score(self.soup), 0)
+
+    def test_dashboard_shows_trending_strip(self):
+        record_event(self.bread.id, 'favourite')
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['trending'], [self.bread])
+        self.assertContains(response, 'Bread')
+
+    def test_search_sorts_by_trending(self):
+        record_event(self.bread.id, 'favourite')
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(reverse('search_recipe'), {'sort': '-trendingScore'})
+        self.assertEqual(list(response.context['recipes']), [self.bread, self.soup])
+
+    def test_command_rescales(self):
+        out = StringIO()
+        call_command('rescale_trending', stdout=out)
+        self.assertIn('Rescaled trending scores', out.getvalue())
+        self.assertLessEqual(TrendingEpoch.objects.get().startedAt, timezone.now())
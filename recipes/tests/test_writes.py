@@ -0,0 +1,79 @@
+from django.db import OperationalError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from recipes.models import Tag
+from recipes.writes import atomic_write, backoff_delay, is_lock_error, metrics
+
+
+NO_DELAY = {'ATTEMPTS': 3, 'BASE_DELAY': 0, 'MAX_DELAY': 0, 'SERIALIZE': True}
+
+
+class FlakyWrite:
+    """Callable that fails with a lock error a set number of times before succeeding."""
+
+    def __init__(self, failures, error='database is locked'):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, name):
+        self.calls += 1
+        Tag.objects.create(name=f'{name}-{self.calls}')
+        if self.calls <= self.failures:
+            raise OperationalError(self.error)
+        return self.calls
+
+
+@override_settings(DB_WRITE_RETRY=NO_DELAY)
+class AtomicWriteTests(TransactionTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_retries_until_success(self):
+        write = FlakyWrite(failures=2)
+        self.assertEqual(atomic_write(write)('tag'), 3)
+        self.assertEqual(write.calls, 3)
+        self.assertEqual(metrics.get('retries'), 2)
+        self.assertEqual(metrics.get('transactions'), 3)
+
+    def test_failed_attempts_are_rolled_back(self):
+        atomic_write(FlakyWrite(failures=1))('tag')
+        self.assertEqual(list(Tag.objects.values_list('name', flat=True)), ['tag-2'])
+
+    def test_gives_up_after_configured_attempts(self):
+        write = FlakyWrite(failures=5)
+        with self.assertRaises(OperationalError):
+            atomic_write(write)('tag')
+        self.assertEqual(write.calls, 3)
+        self.assertEqual(metrics.get('failures'), 1)
+        self.assertFalse(Tag.objects.exists())
+
+    def test_other_operational_errors_are_not_retried(self):
+        write = FlakyWrite(failures=1, error='no such table: missing')
+        with self.assertRaises(OperationalError):
+            atomic_write(write)('tag')
+        self.assertEqual(write.calls, 1)
+
+    def test_no_retry_inside_outer_transaction(self):
+        write = FlakyWrite(failures=1)
+        with self.assertRaises(OperationalError):
+            with transaction.atomic():
+                atomic_write(write)('tag')
+        self.assertEqual(write.calls, 1)
+
+    def test_serialized_writes_record_queue_wait(self):
+        atomic_write(FlakyWrite(failures=0))('tag')
+        self.assertIn('queue_wait_seconds', metrics.snapshot())
+
+
+class WriteHelperTests(TestCase):
+    def test_is_lock_error(self):
+        self.assertTrue(is_lock_error(OperationalError('database is locked')))
+        self.assertTrue(is_lock_error(OperationalError('database table is locked')))
+        self.assertFalse(is_lock_error(OperationalError('disk I/O error')))
+
+    def test_backoff_delay_is_capped(self):
+        for attempt in range(1, 10):
+            delay = backoff_delay(attempt, 0.05, 0.2)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 0.2)
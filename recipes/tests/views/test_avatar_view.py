@@ -0,0 +1,88 @@
+"""Tests for the local avatar proxy."""
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from recipes.avatars import AvatarCache, identicon_svg
+from recipes.models import User
+from recipes.models.user import hash_email
+
+
+class AvatarViewTest(TestCase):
+    """Test suite for the avatar endpoint and its on-disk cache."""
+
+    fixtures = ['recipes/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(AVATARS={'CACHE_DIR': self.directory, 'MAX_FILES': 2})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.get(username='@johndoe')
+        self.email_hash = hash_email(self.user.email)
+        self.url = reverse('avatar', kwargs={'email_hash': self.email_hash, 'size': 60})
+
+    def test_user_avatar_points_at_proxy(self):
+        self.assertEqual(self.user.mini_avatar(), self.url)
+
+    def test_uncached_avatar_is_identicon(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertEqual(response.content.decode(), identicon_svg(self.email_hash, 60))
+        self.assertIn('max-age=3600', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_identicon_is_deterministic(self):
+        self.assertEqual(identicon_svg(self.email_hash, 60), identicon_svg(self.email_hash, 60))
+        self.assertNotEqual(identicon_svg(self.email_hash, 60), identicon_svg('f' * 32, 60))
+
+    def test_cached_avatar_is_served(self):
+        AvatarCache().put(self.email_hash, 60, b'png-bytes', 'image/png')
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, b'png-bytes')
+        self.assertIn('max-age=604800', response['Cache-Control'])
+
+    def test_invalid_hash_or_size_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('avatar', kwargs={'email_hash': 'not-a-hash', 'size': 60})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('avatar', kwargs={'email_hash': self.email_hash, 'size': 5000})).status_code, 404)
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = AvatarCache()
+        cache.put('a' * 32, 60, b'a', 'image/png')
+        cache.put('b' * 32, 60, b'b', 'image/png')
+        old = time.time() - 60
+        os.utime(os.path.join(self.directory, f"{'a' * 32}-60.png"), (old, old))
+        os.utime(os.path.join(self.directory, f"{'b' * 32}-60.png"), (old - 60, old - 60))
+        cache.get('b' * 32, 60)
+        cache.put('c' * 32, 60, b'c', 'image/png')
+        self.assertIsNone(cache.get('a' * 32, 60))
+        self.assertIsNotNone(cache.get('b' * 32, 60))
+        self.assertIsNotNone(cache.get('c' * 32, 60))
+
+    def test_cache_only_scans_directory_to_evict(self):
+        cache = AvatarCache(max_files=20)
+        with mock.patch('recipes.avatars.os.scandir', wraps=os.scandir) as scandir:
+            for index in range(100):
+                cache.put(f'{index:032x}', 60, b'x', 'image/png')
+                cache.put(f'{index:032x}', 60, b'y', 'image/png')
+        self.assertLessEqual(len(os.listdir(self.directory)), 20)
+        self.assertEqual(cache.files, len(os.listdir(self.directory)))
+        self.assertLess(scandir.call_count, 50)
+        self.assertIsNotNone(cache.get(f'{99:032x}', 60))
+
+    @mock.patch('recipes.management.commands.prefetch_avatars.fetch_remote', return_value=(b'jpeg-bytes', 'image/jpeg'))
+    def test_prefetch_command_fills_cache(self, fetch_remote):
+        out = StringIO()
+        call_command('prefetch_avatars', size=[60], stdout=out)
+        fetch_remote.assert_called_once_with(self.email_hash, 60)
+        self.assertIn('Cached 1 avatars.', out.getvalue())
+        self.assertEqual(self.client.get(self.url).content, b'jpeg-bytes')
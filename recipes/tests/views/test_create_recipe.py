@@ -1,8 +1,11 @@
 from datetime import timedelta
+from unittest.mock import patch
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from recipes.models import Recipe
+from recipes.models import Recipe, RecipeIngredient, RecipeStep
 
 User = get_user_model()
 
@@ -65,4 +68,74 @@ class CreateRecipeTests(TestCase):
         
         self.assertEqual(response.status_code, 200)
         
-        self.assertFalse(Recipe.objects.filter(name='Incomplete Recipe').exists())
\ No newline at end of file
+        self.assertFalse(Recipe.objects.filter(name='Incomplete Recipe').exists())
+
+    def _recipe_data(self, name, ingredients, steps):
+        data = {
+            'name': name,
+            'description': 'A test recipe.',
+            'serves': 4,
+            'difficulty': 'easy',
+            'visibility': 'public',
+            'prepTime': '00:10:00',
+            'cookTime': '00:20:00',
+            'cuisine': 'Test',
+            'ingredients-TOTAL_FORMS': str(len(ingredients)),
+            'ingredients-INITIAL_FORMS': '0',
+            'ingredients-MIN_NUM_FORMS': '0',
+            'ingredients-MAX_NUM_FORMS': '1000',
+            'steps-TOTAL_FORMS': str(len(steps)),
+            'steps-INITIAL_FORMS': '0',
+            'steps-MIN_NUM_FORMS': '0',
+            'steps-MAX_NUM_FORMS': '1000',
+        }
+        for i, text in enumerate(ingredients):
+            data[f'ingredients-{i}-text'] = text
+        for i, text in enumerate(steps):
+            data[f'steps-{i}-text'] = text
+        return data
+
+    def _count_create_queries(self, name, size):
+        data = self._recipe_data(
+            name,
+            # Words unique to each recipe, so neither looks like a duplicate of the other.
+            [f'{i + 1}g {name.lower()}' for i in range(size)],
+            [f'Step number {i}.' for i in range(size)],
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, data=data)
+        return len(queries)
+
+    def test_create_recipe_positions_and_parsed_fields(self):
+        """Rows are numbered in form order, skipping deleted forms, and parsed."""
+        data = self._recipe_data('Omelette', ['2 eggs', 'old line', '10g butter'], ['Whisk.', 'Fry.'])
+        data['ingredients-1-DELETE'] = 'on'
+        self.client.post(self.url, data=data)
+
+        recipe = Recipe.objects.get(name='Omelette')
+        self.assertEqual(
+            list(recipe.ingredients.values_list('position', 'text', 'quantity', 'unit', 'item')),
+            [(1, '2 eggs', 2.0, '', 'eggs'), (2, '10g butter', 10.0, 'g', 'butter')],
+        )
+        self.assertEqual(list(recipe.steps.values_list('position', 'text')), [(1, 'Whisk.'), (2, 'Fry.')])
+        self.assertEqual([row['text'] for row in recipe.content['ingredients']], ['2 eggs', '10g butter'])
+        self.assertEqual([row['text'] for row in recipe.content['steps']], ['Whisk.', 'Fry.'])
+
+    def test_create_recipe_query_count_does_not_grow_with_size(self):
+        """A long recipe is created in as many statements as a short one."""
+        self._count_create_queries('Warmup', 1)
+        small = self._count_create_queries('Small', 2)
+        large = self._count_create_queries('Large', 40)
+        self.assertEqual(small, large)
+        self.assertEqual(RecipeIngredient.objects.filter(recipe__name='Large').count(), 40)
+
+    def test_create_recipe_failure_leaves_nothing_behind(self):
+        """A failure part way through the create rolls the whole recipe back."""
+        data = self._recipe_data('Half Saved', ['1 onion'], ['Chop.'])
+        with patch('recipes.views.create_recipe_view.index_ingredients', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                self.client.post(self.url, data=data)
+
+        self.assertFalse(Recipe.objects.filter(name='Half Saved').exists())
+        self.assertFalse(RecipeIngredient.objects.exists())
+        self.assertFalse(RecipeStep.objects.exists())
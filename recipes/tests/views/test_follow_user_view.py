@@ -0,0 +1,111 @@
+"""Tests for following and unfollowing users."""
+from django.contrib import messages
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import User
+
+
+class FollowUserViewTest(TestCase):
+    """Test suite for the follow toggle and the follower/following lists."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.other = User.objects.get(username='@janedoe')
+        self.url = reverse('follow_user', kwargs={'user_id': self.other.id})
+        self.client.login(username=self.user.username, password='Password123')
+
+    def test_follow_user_url(self):
+        self.assertEqual(self.url, f'/users/{self.other.id}/follow/')
+
+    def test_follow_then_unfollow(self):
+        response = self.client.post(self.url)
+        self.assertRedirects(response, reverse('view_profile', kwargs={'user_id': self.other.id}))
+        self.assertTrue(self.user.following.filter(pk=self.other.pk).exists())
+        self.user.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.user.following_count, 1)
+        self.assertEqual(self.other.followers_count, 1)
+
+        self.client.post(self.url)
+        self.assertFalse(self.user.following.filter(pk=self.other.pk).exists())
+        self.user.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.user.following_count, 0)
+        self.assertEqual(self.other.followers_count, 0)
+
+    def test_get_is_not_allowed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(self.user.following.exists())
+
+    def test_cannot_follow_self(self):
+        response = self.client.post(reverse('follow_user', kwargs={'user_id': self.user.id}), follow=True)
+        messages_list = list(response.context['messages'])
+        self.assertEqual(messages_list[0].level, messages.ERROR)
+        self.assertFalse(self.user.following.exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.following_count, 0)
+
+    def test_saving_stale_user_keeps_counters(self):
+        stale = User.objects.get(pk=self.other.pk)
+        self.client.post(self.url)
+        stale.first_name = 'Janet'
+        stale.save()
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.first_name, 'Janet')
+        self.assertEqual(self.other.followers_count, 1)
+
+    def test_deleting_a_user_updates_the_counters_of_their_follows(self):
+        self.client.post(self.url)
+        self.client.login(username='@petrapickles', password='Password123')
+        self.client.post(reverse('follow_user', kwargs={'user_id': self.user.id}))
+        self.client.post(self.url)
+
+        self.user.delete()
+
+        self.other.refresh_from_db()
+        petra = User.objects.get(username='@petrapickles')
+        self.assertEqual(self.other.followers_count, 1)
+        self.assertEqual(petra.following_count, 1)
+        response = self.client.get(reverse('followers', kwargs={'user_id': self.other.id}))
+        self.assertEqual(response.context['page_obj'].paginator.count, 1)
+
+    def test_saving_deleted_user_inserts_it_again(self):
+        stale = User.objects.get(username='@petrapickles')
+        User.objects.filter(pk=stale.pk).delete()
+        stale.save()
+        self.assertTrue(User.objects.filter(pk=stale.pk, username='@petrapickles').exists())
+
+    def test_saving_deferred_user_leaves_deferred_fields_alone(self):
+        deferred = User.objects.defer('last_login', 'date_joined').get(pk=self.other.pk)
+        deferred.first_name = 'Janet'
+        with self.assertNumQueries(2):
+            deferred.save()
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.first_name, 'Janet')
+
+    def test_profile_shows_counts_and_button(self):
+        self.client.post(self.url)
+        response = self.client.get(reverse('view_profile', kwargs={'user_id': self.other.id}))
+        self.assertTrue(response.context['is_following'])
+        self.assertContains(response, '<strong>1</strong> follower', html=False)
+        self.assertContains(response, 'Unfollow')
+
+    def test_followers_list_is_paginated(self):
+        self.client.post(self.url)
+        self.client.login(username='@petrapickles', password='Password123')
+        self.client.post(self.url)
+        response = self.client.get(reverse('followers', kwargs={'user_id': self.other.id}))
+        page = response.context['page_obj']
+        self.assertEqual(page.paginator.count, 2)
+        self.assertEqual([u.username for u in page], ['@johndoe', '@petrapickles'])
+
+    def test_following_list(self):
+        self.client.post(self.url)
+        response = self.client.get(reverse('following', kwargs={'user_id': self.user.id}))
+        self.assertEqual(list(response.context['page_obj']), [self.other])
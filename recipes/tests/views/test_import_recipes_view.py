@@ -0,0 +1,75 @@
+"""Tests for the recipe import view."""
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import AdminLog, Recipe, User
+
+
+class ImportRecipesViewTest(TestCase):
+    """Test suite for the admin recipe upload."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('import_recipes')
+        self.admin = User.objects.get(username='@johndoe')
+        self.admin.role = User.Roles.ADMIN
+        self.admin.save()
+        self.user = User.objects.get(username='@janedoe')
+
+    def upload(self, name, content):
+        return SimpleUploadedFile(name, content.encode(), content_type='application/octet-stream')
+
+    def test_import_url(self):
+        self.assertEqual(self.url, '/admin_panel/import/')
+
+    def test_admin_uploads_json_lines(self):
+        dump = json.dumps({
+            'name': 'Porridge', 'description': 'Warm oats.', 'serves': 1, 'difficulty': 'easy',
+            'prep_minutes': 1, 'cook_minutes': 5, 'visibility': 'public',
+            'ingredients': ['50g oats', '300ml milk'], 'steps': ['Simmer the oats in the milk.'],
+        }) + '\n{"name": "Broken"}\n'
+        self.client.login(username=self.admin.username, password='Password123')
+        response = self.client.post(self.url, {'file': self.upload('dump.jsonl', dump)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Imported 1 recipes, skipped 1')
+        self.assertEqual(Recipe.objects.get(name='Porridge').author, self.admin)
+        self.assertTrue(AdminLog.objects.filter(actor=self.admin, description__contains='imported 1 recipes').exists())
+
+    def test_admin_uploads_csv(self):
+        dump = (
+            'name,description,serves,difficulty,prep_minutes,cook_minutes,visibility,ingredients,steps\n'
+            'Beans on Toast,Classic.,1,easy,2,5,public,1 can beans|2 slices bread,Heat.|Toast.|Serve.\n'
+        )
+        self.client.login(username=self.admin.username, password='Password123')
+        self.client.post(self.url, {'file': self.upload('dump.csv', dump)})
+        self.assertEqual(Recipe.objects.get(name='Beans on Toast').steps.count(), 3)
+
+    def test_invalid_utf8_keeps_and_logs_the_records_before_it(self):
+        line = json.dumps({
+            'name': 'Porridge', 'description': 'Warm oats.', 'serves': 1, 'difficulty': 'easy',
+            'prep_minutes': 1, 'cook_minutes': 5, 'visibility': 'public',
+            'ingredients': ['50g oats', '300ml milk'], 'steps': ['Simmer the oats in the milk.'],
+        }) + '\n'
+        # Decoding happens a buffer at a time, so the invalid byte must come after the first buffer.
+        dump = (line * 100).encode() + b'\xff\n'
+        upload = SimpleUploadedFile('dump.jsonl', dump, content_type='application/octet-stream')
+        self.client.login(username=self.admin.username, password='Password123')
+        response = self.client.post(self.url, {'file': upload})
+
+        self.assertContains(response, 'The file must be UTF-8 text.')
+        created = Recipe.objects.filter(name='Porridge').count()
+        self.assertGreater(created, 0)
+        log = AdminLog.objects.get(actor=self.admin, description__contains='imported')
+        self.assertEqual((log.metadata['created'], log.metadata['truncated']), (created, True))
+
+    def test_regular_user_is_redirected(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
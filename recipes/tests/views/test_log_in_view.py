@@ -1,10 +1,12 @@
 """Tests of the log in view."""
 from django.contrib import messages
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from recipes.forms import LogInForm
 from recipes.models import User
 from recipes.tests.helpers import LogInTester, MenuTesterMixin, reverse_with_next
+from recipes.throttling import get_throttle_config, metrics
 
 class LogInViewTestCase(TestCase, LogInTester, MenuTesterMixin):
     """Tests of the log in view."""
@@ -12,6 +14,7 @@ class LogInViewTestCase(TestCase, LogInTester, MenuTesterMixin):
     fixtures = ['recipes/tests/fixtures/default_user.json']
 
     def setUp(self):
+        caches[get_throttle_config()['CACHE']].clear()
         self.url = reverse('log_in')
         self.user = User.objects.get(username='@johndoe')
 
@@ -141,3 +144,63 @@ class LogInViewTestCase(TestCase, LogInTester, MenuTesterMixin):
         messages_list = list(response.context['messages'])
         self.assertEqual(len(messages_list), 1)
         self.assertEqual(messages_list[0].level, messages.ERROR)
+
+    @override_settings(LOGIN_THROTTLE={'CACHE': 'shared', 'IP': {'CAPACITY': 10, 'REFILL_PER_MINUTE': 1}, 'USERNAME': {'CAPACITY': 2, 'REFILL_PER_MINUTE': 1}})
+    def test_log_in_is_throttled_per_username(self):
+        form_input = { 'username': '@johndoe', 'password': 'WrongPassword123' }
+        for _ in range(2):
+            self.assertEqual(self.client.post(self.url, form_input).status_code, 200)
+        form_input['password'] = 'Password123'
+        response = self.client.post(self.url, form_input)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), range(1, 61))
+        self.assertFalse(self._is_logged_in())
+        self.assertEqual(list(response.context['messages'])[0].level, messages.ERROR)
+        other_user = { 'username': '@janedoe', 'password': 'WrongPassword123' }
+        self.assertEqual(self.client.post(self.url, other_user).status_code, 200)
+
+    @override_settings(LOGIN_THROTTLE={'CACHE': 'shared', 'IP': {'CAPACITY': 2, 'REFILL_PER_MINUTE': 1}, 'USERNAME': {'CAPACITY': 10, 'REFILL_PER_MINUTE': 1}})
+    def test_log_in_is_throttled_per_ip(self):
+        metrics.reset()
+        for username in ['@first', '@second', '@third']:
+            response = self.client.post(self.url, { 'username': username, 'password': 'WrongPassword123' })
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(metrics.get('rejected_ip'), 1)
+        self.assertEqual(metrics.get('allowed'), 2)
+
+    @override_settings(LOGIN_THROTTLE={'CACHE': 'shared', 'IP': {'CAPACITY': 2, 'REFILL_PER_MINUTE': 1}, 'USERNAME': {'CAPACITY': 10, 'REFILL_PER_MINUTE': 1}})
+    def test_rotating_forwarded_for_does_not_escape_ip_throttle(self):
+        for number, username in enumerate(['@first', '@second', '@third']):
+            response = self.client.post(
+                self.url, { 'username': username, 'password': 'WrongPassword123' },
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{number}',
+            )
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(LOGIN_THROTTLE={'CACHE': 'shared', 'IP': {'CAPACITY': 2, 'REFILL_PER_MINUTE': 1}, 'USERNAME': {'CAPACITY': 10, 'REFILL_PER_MINUTE': 1}, 'TRUSTED_PROXIES': ['127.0.0.1']})
+    def test_trusted_proxy_forwards_client_ip(self):
+        for number, username in enumerate(['@first', '@second', '@third']):
+            response = self.client.post(
+                self.url, { 'username': username, 'password': 'WrongPassword123' },
+                # The client's own entry comes first; the proxy appends the real address.
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{number}, 198.51.100.{number}',
+            )
+            self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            self.url, { 'username': '@fourth', 'password': 'WrongPassword123' },
+            HTTP_X_FORWARDED_FOR='203.0.113.9, 198.51.100.0',
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            self.url, { 'username': '@fifth', 'password': 'WrongPassword123' },
+            HTTP_X_FORWARDED_FOR='203.0.113.8, 198.51.100.0',
+        )
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(LOGIN_THROTTLE={'CACHE': 'shared', 'USERNAME': {'CAPACITY': 2, 'REFILL_PER_MINUTE': 1}})
+    def test_succesful_log_in_refills_username_bucket(self):
+        self.client.post(self.url, { 'username': '@johndoe', 'password': 'WrongPassword123' })
+        self.client.post(self.url, { 'username': '@johndoe', 'password': 'Password123' })
+        self.client.logout()
+        response = self.client.post(self.url, { 'username': '@johndoe', 'password': 'WrongPassword123' })
+        self.assertEqual(response.status_code, 200)
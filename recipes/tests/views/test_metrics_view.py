@@ -0,0 +1,36 @@
+"""Tests for the metrics view."""
+from django.test import TestCase
+from django.urls import reverse
+from recipes.metrics import get_metrics
+from recipes.models import User
+
+
+class MetricsViewTest(TestCase):
+    """Test suite for the admin metrics endpoint."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('metrics')
+        self.admin = User.objects.get(username='@johndoe')
+        self.admin.role = User.Roles.ADMIN
+        self.admin.save()
+        self.user = User.objects.get(username='@janedoe')
+
+    def test_metrics_url(self):
+        self.assertEqual(self.url, '/admin_panel/metrics/')
+
+    def test_admin_gets_json_snapshot(self):
+        get_metrics('test_namespace').increment('hits')
+        self.client.login(username=self.admin.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(response.json()['test_namespace']['hits'], 1)
+
+    def test_regular_user_is_redirected(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
@@ -0,0 +1,71 @@
+"""Tests for the recipe history view."""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from recipes.models import Recipe, RecipeIngredient, User
+
+
+class RecipeHistoryViewTest(TestCase):
+    """Edits record revisions, which the author and staff can browse."""
+
+    fixtures = [
+        'recipes/tests/fixtures/default_user.json',
+        'recipes/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.author = User.objects.get(username='@johndoe')
+        self.recipe = Recipe.objects.create(
+            author=self.author,
+            name='Chilli',
+            description='Spicy.',
+            serves=4,
+            difficulty='medium',
+            prepTime=timedelta(minutes=15),
+            cookTime=timedelta(minutes=60),
+            visibility='public',
+        )
+        RecipeIngredient.objects.create(recipe=self.recipe, text='500g beef mince', position=1)
+        self.recipe.refresh_content()
+        self.url = reverse('recipe_history', args=[self.recipe.id])
+
+    def edit(self, ingredients):
+        data = {
+            'name': 'Chilli', 'description': 'Spicy.', 'serves': 4, 'difficulty': 'medium',
+            'prepTime': '00:15:00', 'cookTime': '01:00:00', 'cuisine': '', 'visibility': 'public',
+            'ingredients-TOTAL_FORMS': str(len(ingredients)), 'ingredients-INITIAL_FORMS': '0',
+            'steps-TOTAL_FORMS': '1', 'steps-INITIAL_FORMS': '0', 'steps-0-text': 'Cook it.',
+        }
+        for i, text in enumerate(ingredients):
+            data[f'ingredients-{i}-text'] = text
+        self.client.post(reverse('update_recipe', args=[self.recipe.id]), data)
+
+    def test_edit_records_baseline_and_revision(self):
+        self.client.login(username='@johndoe', password='Password123')
+        self.edit(['500g beef mince', '1 can kidney beans'])
+
+        response = self.client.get(self.url)
+        self.assertEqual([revision.number for revision in response.context['revisions']], [2, 1])
+
+        response = self.client.get(self.url, {'revision': 1})
+        self.assertEqual(response.context['document']['ingredients'], ['500g beef mince'])
+        self.assertEqual(response.context['document']['steps'], [])
+        response = self.client.get(self.url, {'revision': 2})
+        self.assertContains(response, '1 can kidney beans')
+
+    def test_moderator_can_view_history(self):
+        moderator = User.objects.get(username='@janedoe')
+        moderator.role = User.Roles.MODERATOR
+        moderator.save()
+        self.client.login(username='@janedoe', password='Password123')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_other_users_are_redirected(self):
+        self.client.login(username='@janedoe', password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('view_recipe', args=[self.recipe.id]))
+
+    def test_unknown_revision_is_404(self):
+        self.client.login(username='@johndoe', password='Password123')
+        self.assertEqual(self.client.get(self.url, {'revision': 9}).status_code, 404)
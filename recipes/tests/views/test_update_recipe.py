@@ -0,0 +1,143 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import AdminLog, Recipe, RecipeIngredient, RecipeStep, User
+from recipes.views.update_recipe_view import UpdateRecipeView
+
+
+class UpdateRecipeViewTests(TestCase):
+    fixtures = ['recipes/tests/fixtures/default_user.json', 'recipes/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.author = User.objects.get(username='@johndoe')
+        self.recipe = Recipe.objects.create(
+            author=self.author,
+            name='Pancakes',
+            description='Fluffy pancakes.',
+            serves=4,
+            difficulty='easy',
+            prepTime=timedelta(minutes=10),
+            cookTime=timedelta(minutes=15),
+            visibility='public',
+        )
+        self.ingredients = [f'{i + 1}0g ingredient {i}' for i in range(20)]
+        for position, text in enumerate(self.ingredients, start=1):
+            RecipeIngredient.objects.create(recipe=self.recipe, text=text, position=position)
+        for position, text in enumerate(['Mix.', 'Rest.', 'Fry.'], start=1):
+            RecipeStep.objects.create(recipe=self.recipe, text=text, position=position)
+        self.recipe.refresh_content()
+        self.url = reverse('update_recipe', args=[self.recipe.id])
+        self.client.login(username='@johndoe', password='Password123')
+
+    def form_data(self, ingredients, steps, **fields):
+        data = {
+            'name': 'Pancakes',
+            'description': 'Fluffy pancakes.',
+            'serves': 4,
+            'difficulty': 'easy',
+            'prepTime': '00:10:00',
+            'cookTime': '00:15:00',
+            'cuisine': '',
+            'visibility': 'public',
+            'ingredients-TOTAL_FORMS': str(len(ingredients)),
+            'ingredients-INITIAL_FORMS': '0',
+            'steps-TOTAL_FORMS': str(len(steps)),
+            'steps-INITIAL_FORMS': '0',
+        }
+        data.update(fields)
+        for i, text in enumerate(ingredients):
+            data[f'ingredients-{i}-text'] = text
+        for i, text in enumerate(steps):
+            data[f'steps-{i}-text'] = text
+        return data
+
+    def child_writes(self, queries):
+        return [
+            query['sql'] for query in queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+            and ('"recipes_recipeingredient"' in query['sql'] or '"recipes_recipestep"' in query['sql'])
+        ]
+
+    def test_get_shows_stored_rows(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Edit recipe')
+        self.assertContains(response, '10g ingredient 0')
+        self.assertContains(response, 'Fry.')
+
+    def test_other_users_cannot_edit(self):
+        self.client.login(username='@janedoe', password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('view_recipe', args=[self.recipe.id]))
+
+    def test_fixing_one_line_writes_one_row(self):
+        ingredients = list(self.ingredients)
+        ingredients[5] = '2 eggs'
+        before = self.recipe.updatedAt
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, self.form_data(ingredients, ['Mix.', 'Rest.', 'Fry.']))
+
+        self.assertRedirects(response, reverse('view_recipe', args=[self.recipe.id]), fetch_redirect_response=False)
+        writes = self.child_writes(queries)
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('UPDATE'))
+        self.recipe.refresh_from_db()
+        self.assertGreater(self.recipe.updatedAt, before)
+        egg = RecipeIngredient.objects.get(recipe=self.recipe, position=6)
+        self.assertEqual((egg.text, egg.quantity, egg.item), ('2 eggs', 2.0, 'eggs'))
+        self.assertEqual(self.recipe.content['ingredients'][5]['item'], 'eggs')
+        self.assertTrue(AdminLog.objects.filter(action_type=AdminLog.ActionType.RECIPE_UPDATED).exists())
+
+    def test_unchanged_submission_writes_no_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, self.form_data(self.ingredients, ['Mix.', 'Rest.', 'Fry.'], name='Better Pancakes'))
+        self.assertEqual(self.child_writes(queries), [])
+        self.assertEqual(Recipe.objects.get(pk=self.recipe.pk).name, 'Better Pancakes')
+
+    def test_edit_keeps_counters_bumped_meanwhile(self):
+        form_data = self.form_data(self.ingredients, ['Mix.', 'Rest.', 'Fry.'], name='Better Pancakes')
+        real_get_object = UpdateRecipeView.get_object
+
+        def get_object_then_bump(view, *args, **kwargs):
+            recipe = real_get_object(view, *args, **kwargs)
+            Recipe.objects.filter(pk=recipe.pk).update(
+                averageRating=4.5, ratingCount=2, favouritesCount=3, trendingScore=9.0,
+            )
+            return recipe
+
+        with patch.object(UpdateRecipeView, 'get_object', get_object_then_bump):
+            self.client.post(self.url, form_data)
+
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(recipe.name, 'Better Pancakes')
+        self.assertEqual(
+            (recipe.averageRating, recipe.ratingCount, recipe.favouritesCount, recipe.trendingScore),
+            (4.5, 2, 3, 9.0),
+        )
+
+    def test_inserting_and_removing_steps(self):
+        self.client.post(self.url, self.form_data(self.ingredients, ['Whisk.', 'Mix.', 'Fry.']))
+
+        self.assertEqual(
+            list(RecipeStep.objects.filter(recipe=self.recipe).values_list('position', 'text')),
+            [(1, 'Whisk.'), (2, 'Mix.'), (3, 'Fry.')],
+        )
+        self.recipe.refresh_from_db()
+        self.assertEqual([step['text'] for step in self.recipe.get_steps()], ['Whisk.', 'Mix.', 'Fry.'])
+
+    def test_removing_an_ingredient_updates_the_pantry_index(self):
+        self.client.post(self.url, self.form_data(['2 eggs', '100g flour'], ['Mix.']))
+        terms = set(self.recipe.ingredient_postings.values_list('term__term', flat=True))
+        self.assertEqual(terms, {'egg', 'flour'})
+        self.assertEqual(RecipeIngredient.objects.filter(recipe=self.recipe).count(), 2)
+
+    def test_invalid_submission_changes_nothing(self):
+        response = self.client.post(self.url, self.form_data(['2 eggs'], ['Mix.'], serves=''))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(RecipeIngredient.objects.filter(recipe=self.recipe).count(), 20)
@@ -0,0 +1,135 @@
+"""
+Token-bucket throttling for login attempts.
+
+Every login attempt takes a token from two buckets, one for the client
+IP and one for the submitted username, before the password is hashed.
+Buckets refill continuously at their configured rate, so a user who
+mistypes a password a few times is unaffected while a credential
+stuffing burst is turned away without costing a PBKDF2 hash per request.
+
+Buckets live in the cache named by ``LOGIN_THROTTLE['CACHE']`` and expire
+once they would have refilled completely.
+
+The IP bucket is keyed on the connecting address (``REMOTE_ADDR``).
+``X-Forwarded-For`` is only read when the connection comes from one of
+``LOGIN_THROTTLE['TRUSTED_PROXIES']``, and then from the right: the
+nearest address a trusted proxy did not add is the client. Its leftmost
+entries are whatever the client sent, so trusting them would let an
+attacker get a fresh bucket with every request.
+
+Reads and writes are not
+atomic, so concurrent attempts can occasionally overdraw a bucket by a
+token or two; the limit is approximate by design.
+"""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from recipes.metrics import get_metrics
+
+
+DEFAULT_LOGIN_THROTTLE = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    # CAPACITY attempts in a burst, then REFILL_PER_MINUTE attempts a minute.
+    'IP': {'CAPACITY': 20, 'REFILL_PER_MINUTE': 10},
+    'USERNAME': {'CAPACITY': 5, 'REFILL_PER_MINUTE': 2},
+    # Addresses of reverse proxies whose X-Forwarded-For entries are trusted.
+    'TRUSTED_PROXIES': [],
+}
+
+metrics = get_metrics('login_throttle')
+
+
+def get_throttle_config():
+    """Return the login throttle configuration, with ``settings.LOGIN_THROTTLE`` over the defaults."""
+
+    config = dict(DEFAULT_LOGIN_THROTTLE)
+    config.update(getattr(settings, 'LOGIN_THROTTLE', {}) or {})
+    return config
+
+
+def throttle_ip(request):
+    """Return the client IP a login attempt is throttled by."""
+
+    trusted = set(get_throttle_config()['TRUSTED_PROXIES'])
+    address = request.META.get('REMOTE_ADDR')
+    if address not in trusted:
+        return address
+    forwarded = [entry.strip() for entry in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if entry.strip()]
+    for entry in reversed(forwarded):
+        if entry not in trusted:
+            return entry
+    return address
+
+
+def _bucket_key(scope, identifier):
+    digest = hashlib.sha1(identifier.encode('utf-8')).hexdigest()
+    return f'throttle:login:{scope}:{digest}'
+
+
+def _refilled(bucket, limits, now):
+    """Return the number of tokens in a bucket after refilling it up to ``now``."""
+
+    if bucket is None:
+        return float(limits['CAPACITY'])
+    tokens, updated_at = bucket
+    rate = limits['REFILL_PER_MINUTE'] / 60
+    return min(float(limits['CAPACITY']), tokens + (now - updated_at) * rate)
+
+
+def _retry_after(tokens, limits):
+    """Return the number of seconds until a bucket holds a whole token."""
+
+    rate = limits['REFILL_PER_MINUTE'] / 60
+    return math.ceil((1 - tokens) / rate) if rate else None
+
+
+def consume_login_attempt(ip_address, username):
+    """
+    Take one token from the IP and username buckets for a login attempt.
+
+    Tokens are only taken if both buckets have one, so attempts rejected by
+    one bucket do not drain the other.
+
+    Returns:
+        int or None: None if the attempt may proceed, otherwise the number
+        of seconds after which it may be retried.
+    """
+
+    config = get_throttle_config()
+    if not config['ENABLED']:
+        return None
+
+    cache = caches[config['CACHE']]
+    now = time.time()
+    scopes = {}
+    if ip_address:
+        scopes['ip'] = (_bucket_key('ip', ip_address), config['IP'])
+    if username:
+        scopes['username'] = (_bucket_key('username', username.strip().lower()), config['USERNAME'])
+
+    buckets = cache.get_many([key for key, _ in scopes.values()])
+    tokens = {scope: _refilled(buckets.get(key), limits, now) for scope, (key, limits) in scopes.items()}
+
+    for scope, available in tokens.items():
+        if available < 1:
+            metrics.increment(f'rejected_{scope}')
+            return _retry_after(available, scopes[scope][1])
+
+    for scope, (key, limits) in scopes.items():
+        rate = limits['REFILL_PER_MINUTE'] / 60
+        timeout = math.ceil(limits['CAPACITY'] / rate) if rate else None
+        cache.set(key, (tokens[scope] - 1, now), timeout=timeout)
+    metrics.increment('allowed')
+    return None
+
+
+def reset_username_bucket(username):
+    """Refill a username's bucket, e.g. after a successful login."""
+
+    cache = caches[get_throttle_config()['CACHE']]
+    cache.delete(_bucket_key('username', username.strip().lower()))
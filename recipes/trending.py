@@ -0,0 +1,141 @@
+"""
+Time-decayed trending scores, kept up to date on every event.
+
+An event's weight halves every ``TRENDING['HALF_LIFE_HOURS']``. Rather than
+decay every recipe's score as time passes, each event adds its weight
+scaled *up* by ``2 ** (hours since the epoch / half-life)``, where the
+epoch is the single ``TrendingEpoch`` row. Older events therefore count
+for less than newer ones, and ordering by ``trendingScore`` is always
+exact, so the trending listing is a plain indexed sort.
+
+The boost grows without bound, so ``rescale_trending_scores`` (run by the
+``rescale_trending`` command, e.g. hourly) divides every score by the
+current boost and moves the epoch to now. Skipping it only risks float
+overflow after several hundred half-lives; it does not change rankings.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.utils import timezone
+from recipes.metrics import get_metrics
+from recipes.models import Recipe, TrendingEpoch
+from recipes.throttling import throttle_ip
+from recipes.writes import atomic_write
+
+
+DEFAULT_TRENDING = {
+    'HALF_LIFE_HOURS': 24,
+    # Points per event; a rating scores WEIGHTS['rating'] * stars / 5.
+    'WEIGHTS': {
+        'view': 1,
+        'rating': 3,
+        'favourite': 5,
+    },
+    # A user (or anonymous IP) counts one view per recipe in this window.
+    'VIEW_WINDOW': 3600,
+    'CACHE': 'default',
+    # Scores below this are reset to 0 when rescaling.
+    'MIN_SCORE': 0.01,
+}
+
+metrics = get_metrics('trending')
+
+
+def get_trending_config():
+    """Return the trending configuration, with ``settings.TRENDING`` over the defaults."""
+
+    config = dict(DEFAULT_TRENDING)
+    config.update(getattr(settings, 'TRENDING', {}) or {})
+    config['WEIGHTS'] = {**DEFAULT_TRENDING['WEIGHTS'], **config['WEIGHTS']}
+    return config
+
+
+def get_epoch():
+    """Return the ``TrendingEpoch`` row, creating it on first use."""
+
+    # Always read the primary: a stale epoch from the replica would mis-scale events.
+    epoch, _ = TrendingEpoch.objects.db_manager(DEFAULT_DB_ALIAS).get_or_create(
+        pk=1, defaults={'startedAt': timezone.now()}
+    )
+    return epoch
+
+
+def boost(epoch, now, half_life_hours):
+    """Return the factor an event at ``now`` is scaled by, relative to ``epoch``."""
+
+    hours = (now - epoch.startedAt).total_seconds() / 3600
+    return 2 ** (hours / half_life_hours)
+
+
+@atomic_write
+def record_event(recipe_id, event, weight=1.0, now=None):
+    """
+    Add an event to a recipe's trending score.
+
+    Args:
+        recipe_id (int): The recipe the event happened to.
+        event (str): A key of ``TRENDING['WEIGHTS']``.
+        weight (float): Multiplier for the event's configured points.
+        now (datetime): When the event happened; defaults to now.
+    """
+
+    config = get_trending_config()
+    points = config['WEIGHTS'][event] * weight
+    if points <= 0:
+        return
+    factor = boost(get_epoch(), now or timezone.now(), config['HALF_LIFE_HOURS'])
+    # Written to the primary by name, so the router does not pin a reader
+    # of the recipe page to the primary (see recipes/routers.py), and
+    # quietly, so every view does not empty the recipe table's query cache.
+    # Cached listings sorted by score catch up when they expire.
+    Recipe.objects.using(DEFAULT_DB_ALIAS).filter(pk=recipe_id).quiet_update(
+        trendingScore=F('trendingScore') + points * factor
+    )
+    metrics.increment(event)
+
+
+def record_view(request, recipe):
+    """Count a view of ``recipe``, at most once per viewer per ``TRENDING['VIEW_WINDOW']``."""
+
+    config = get_trending_config()
+    if request.user.is_authenticated:
+        if request.user.pk == recipe.author_id:
+            return
+        viewer = f'user:{request.user.pk}'
+    else:
+        viewer = f'ip:{throttle_ip(request)}'
+    if caches[config['CACHE']].add(f'trending:view:{recipe.pk}:{viewer}', 1, config['VIEW_WINDOW']):
+        record_event(recipe.pk, 'view')
+
+
+@atomic_write
+def rescale_trending_scores(now=None):
+    """
+    Re-express every score relative to ``now`` and move the epoch there.
+
+    Returns:
+        float: The factor scores were divided by.
+    """
+
+    config = get_trending_config()
+    now = now or timezone.now()
+    epoch = get_epoch()
+    factor = boost(epoch, now, config['HALF_LIFE_HOURS'])
+    Recipe.objects.filter(trendingScore__gt=0).update(trendingScore=F('trendingScore') / factor)
+    Recipe.objects.filter(trendingScore__gt=0, trendingScore__lt=config['MIN_SCORE']).update(trendingScore=0)
+    epoch.startedAt = now
+    epoch.save(update_fields=['startedAt'])
+    metrics.increment('rescales')
+    return factor
+
+
+def trending_recipes(limit=4):
+    """Return the public recipes with the highest trending scores."""
+
+    return list(
+        Recipe.objects.filter(visibility='public', trendingScore__gt=0)
+        .select_related('author')
+        .order_by('-trendingScore')[:limit]
+    )
@@ -20,4 +20,12 @@ from .view_profile_view import view_profile
 from .favourite_recipe_view import favourite_recipe
 from .add_rating_view import add_rating
 from .favourites_view import favourites
-
+from .metrics_view import metrics
+from .avatar_view import avatar
+from .follow_user import follow_user, followers, following
+from .pantry_search_view import pantry_search
+from .recipe_ingredients_view import recipe_ingredients
+from .meal_plan_view import meal_plan, add_to_meal_plan, remove_from_meal_plan, shopping_list
+from .import_recipes_view import import_recipes
+from .update_recipe_view import UpdateRecipeView
+from .recipe_history_view import recipe_history
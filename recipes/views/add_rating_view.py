@@ -5,6 +5,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib import messages
 from recipes.models import Recipe, RecipeRating
 from recipes.forms import RecipeRatingForm
+from recipes.writes import atomic_write
 
 
 @login_required
@@ -26,10 +27,7 @@ def add_rating(request, recipe_id):
     if request.method == 'POST':
         form = RecipeRatingForm(request.POST, instance=rating)
         if form.is_valid():
-            saved_rating = form.save(commit=False)
-            saved_rating.recipe = recipe
-            saved_rating.user = user
-            saved_rating.save()
+            save_rating(form, recipe, user)
             if is_new:
                 messages.success(request, 'Your rating has been added!')
             else:
@@ -44,3 +42,14 @@ def add_rating(request, recipe_id):
         'user_rating': rating,
     })
 
+
+@atomic_write
+def save_rating(form, recipe, user):
+    """
+    Save a validated rating form for a recipe, retrying if the database is locked.
+    """
+    saved_rating = form.save(commit=False)
+    saved_rating.recipe = recipe
+    saved_rating.user = user
+    saved_rating.save()
+    return saved_rating
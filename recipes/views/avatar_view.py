@@ -0,0 +1,34 @@
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from recipes.avatars import MAX_SIZE, AvatarCache, get_avatar_config, identicon_svg, is_valid_hash, metrics
+
+
+@require_safe
+def avatar(request, email_hash, size):
+    """
+    Serve a user's avatar without contacting gravatar.com.
+
+    Returns the pre-fetched image from the local avatar cache when there is
+    one, otherwise a generated identicon. Both are cacheable by the browser,
+    identicons only for ``AVATARS['IDENTICON_MAX_AGE']`` so that a gravatar
+    fetched later shows up soon.
+    """
+
+    if not is_valid_hash(email_hash) or not 1 <= size <= MAX_SIZE:
+        raise Http404("Unknown avatar.")
+
+    config = get_avatar_config()
+    cached = AvatarCache().get(email_hash, size)
+    if cached is not None:
+        metrics.increment('hits')
+        data, content_type = cached
+        max_age = config['MAX_AGE']
+    else:
+        metrics.increment('identicons')
+        data, content_type = identicon_svg(email_hash, size), 'image/svg+xml'
+        max_age = config['IDENTICON_MAX_AGE']
+
+    response = HttpResponse(data, content_type=content_type)
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
@@ -5,9 +5,13 @@ from django.urls import reverse
 from django.views.generic import CreateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from recipes.models import Recipe, AdminLog
-from recipes.forms.recipe_form import RecipeForm, IngredientFormSet, StepFormSet
+from recipes.models import Recipe, RecipeIngredient, RecipeStep, AdminLog
+from recipes.forms.recipe_form import RecipeForm, IngredientFormSet, StepFormSet, formset_texts
 from recipes.helpers import log_action
+from recipes.minhash import index_recipe, likely_duplicates
+from recipes.pantry import index_ingredients
+from recipes.revisions import record_revision
+from recipes.writes import atomic_write
 
 
 class CreateRecipeView(LoginRequiredMixin, CreateView):
@@ -74,31 +78,40 @@ class CreateRecipeView(LoginRequiredMixin, CreateView):
             "step_formset": step_formset,
         })
 
-    def _save_all(self, form, ingredient_formset, step_formset):
-        
-        
+    @atomic_write
+    def _create(self, form, ingredient_texts, step_texts):
+        """
+        Insert the recipe, its tags, ingredients and steps in one transaction.
+
+        Positions are assigned in memory and the rows are bulk inserted, so a
+        recipe takes the same number of statements however long it is, and a
+        failure part way leaves nothing behind.
+        """
+        ingredients = []
+        for position, text in enumerate(ingredient_texts, start=1):
+            ingredient = RecipeIngredient(text=text, position=position)
+            # bulk_create skips save(), which would parse the text.
+            ingredient.parse()
+            ingredients.append(ingredient)
+        steps = [
+            RecipeStep(text=text, position=position)
+            for position, text in enumerate(step_texts, start=1)
+        ]
+
         form.instance.author = self.request.user
         self.object = form.save(commit=False)
+        self.object.content = Recipe.build_content(ingredients, steps)
         self.object.save()
         form.save_m2m()
 
-        ingredient_formset.instance = self.object
-        pos = 1
-        for f in ingredient_formset.forms:
-            if not f.cleaned_data or f.cleaned_data.get("DELETE"):
-                continue
-            f.instance.position = pos
-            pos += 1
-        ingredient_formset.save()
-
-        step_formset.instance = self.object
-        pos = 1
-        for f in step_formset.forms:
-            if not f.cleaned_data or f.cleaned_data.get("DELETE"):
-                continue
-            f.instance.position = pos
-            pos += 1
-        step_formset.save()
+        for row in ingredients + steps:
+            row.recipe = self.object
+        RecipeIngredient.objects.bulk_create(ingredients)
+        RecipeStep.objects.bulk_create(steps)
+
+        index_recipe(self.object)
+        index_ingredients(self.object)
+        record_revision(self.object, self.request.user)
 
         log_action(
             actor=self.request.user,
@@ -110,12 +123,23 @@ class CreateRecipeView(LoginRequiredMixin, CreateView):
                 'recipe_name': self.object.name,
                 'recipe_difficulty': self.object.difficulty,
                 'recipe_visibility': self.object.visibility,
-                'tags': list(self.object.tags.values_list('name', flat=True)),
+                'tags': [tag.name for tag in form.cleaned_data.get('tags') or []],
             },
             request=self.request,
         )
 
+    def _save_all(self, form, ingredient_formset, step_formset):
+        self._create(form, formset_texts(ingredient_formset), formset_texts(step_formset))
+
         messages.success(self.request, f"Recipe '{self.object.name}' created successfully!")
+        duplicates = likely_duplicates(self.object, self.request.user)
+        if duplicates:
+            messages.warning(
+                self.request,
+                "This recipe looks very similar to "
+                + ", ".join(f"'{recipe.name}' by {recipe.author.username}" for recipe in duplicates)
+                + ".",
+            )
         return self.redirect_success()
 
     def redirect_success(self):
@@ -1,6 +1,9 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
+from recipes.feeds import get_feed
 from recipes.models import Recipe
+from recipes.recommendations import recommended_recipes
+from recipes.trending import trending_recipes
 
 @login_required
 def dashboard(request):
@@ -12,8 +15,15 @@ def dashboard(request):
     # FIX: Changed '-created_at' to '-createdAt' to match your Model field
     recipes = Recipe.objects.filter(author=current_user).order_by('-createdAt')
 
+    # Recipes from followed authors, paged by the cursor in ?feed_before=
+    feed, feed_next = get_feed(current_user, request.GET.get('feed_before'))
+
     return render(request, 'dashboard.html', {
         'user': current_user,
         'recipes': recipes, 
+        'feed': feed,
+        'feed_next': feed_next,
+        'recommended': recommended_recipes(current_user),
+        'trending': trending_recipes(),
     })
     
@@ -3,17 +3,32 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect
 from recipes.helpers import log_action
 from recipes.models import Recipe, AdminLog
+from recipes.purge import tombstone_recipe
+from recipes.writes import atomic_write
 
 def check_admin(user):
     return user.is_superuser
 
+
+@atomic_write
+def delete_logged(recipe, **log_kwargs):
+    """
+    Log the deletion and tombstone the recipe in one transaction, retrying if locked.
+
+    The recipe's rows are removed later by the ``purge_recipes`` command.
+    """
+    log_action(**log_kwargs)
+    tombstone_recipe(recipe)
+
+
 @login_required
 def delete_recipe(request, recipe_id):
     # Standard user delete 
     recipe = get_object_or_404(Recipe, pk=recipe_id)
     if request.user == recipe.author:
-        # Log the action before deletion
-        log_action(
+        # Log the action and delete together
+        delete_logged(
+            recipe,
             actor=request.user,
             action_type=AdminLog.ActionType.RECIPE_DELETED,
             description=f"{request.user.username} deleted recipe '{recipe.name}' (ID: {recipe.id})",
@@ -25,7 +40,6 @@ def delete_recipe(request, recipe_id):
             },
             request=request,
         )
-        recipe.delete()
         messages.success(request, "Recipe deleted.")
     else:
         messages.error(request, "Permission denied.")
@@ -41,8 +55,9 @@ def delete_recipe_admin(request, recipe_id):
     # Get and delete
     recipe = get_object_or_404(Recipe, id=recipe_id)
     
-    # Log the action before deletion
-    log_action(
+    # Log the action and delete together
+    delete_logged(
+        recipe,
         actor=request.user,
         action_type=AdminLog.ActionType.RECIPE_DELETED,
         description=f"{request.user.username} (Admin) deleted recipe '{recipe.name}' (ID: {recipe.id})",
@@ -55,7 +70,5 @@ def delete_recipe_admin(request, recipe_id):
         },
         request=request,
     )
-    
-    recipe.delete()
     messages.success(request, "Recipe successfully deleted by Admin.")
     return redirect('dashboard')
\ No newline at end of file
@@ -4,6 +4,7 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
 from recipes.models import Recipe, RecipeFavourite
+from recipes.writes import atomic_write
 
 
 @login_required
@@ -12,22 +13,27 @@ def favourite_recipe(request, recipe_id):
     Toggle favourite status for a recipe.
     """
     recipe = get_object_or_404(Recipe, pk=recipe_id)
-    user = request.user
     
-    # Check if already favourited
+    if toggle_favourite(recipe, request.user):
+        messages.success(request, f'Added "{recipe.name}" to your favourites.')
+    else:
+        messages.success(request, f'Removed "{recipe.name}" from your favourites.')
+    
+    return redirect('view_recipe', recipe_id=recipe_id)
+
+
+@atomic_write
+def toggle_favourite(recipe, user):
+    """
+    Add or remove a favourite, retrying if the database is locked.
+
+    Returns:
+        bool: True if the recipe is now favourited, False if it was removed.
+    """
     favourite, created = RecipeFavourite.objects.get_or_create(
         recipe=recipe,
         user=user
     )
-    
     if not created:
-        # Already favourited, so remove it
         favourite.delete()
-        messages.success(request, f'Removed "{recipe.name}" from your favourites.')
-    else:
-        # Just created, so it's now favourited
-        messages.success(request, f'Added "{recipe.name}" to your favourites.')
-    
-    return redirect('view_recipe', recipe_id=recipe_id)
-
-
+    return created
@@ -10,7 +10,7 @@ def favourites(request):
     Display the current user's favourite recipes.
     """
     favourites_qs = (
-        RecipeFavourite.objects.filter(user=request.user)
+        RecipeFavourite.objects.filter(user=request.user, recipe__deletedAt__isnull=True)
         .select_related("recipe", "recipe__author")
         .prefetch_related("recipe__tags")
         .order_by("-savedAt")
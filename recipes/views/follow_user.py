@@ -1,13 +1,83 @@
-from django.shortcuts import redirect
-from django.contrib.auth import get_user_model
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import F
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
+from recipes.backends import invalidate_user
+from recipes.models import User
+from recipes.writes import atomic_write
 
-def follow_user(request, pk):
-    User = get_user_model()
 
-    user_being_followed = User.objects.get(pk=pk)
-    if request.user in user_being_followed.all(): #get the list of all being followed see if the user requesting it is in this list
-        user_being_followed.followers.remove(request.user) # to find users irrespective of case sensitivity/with or without @
+@login_required
+@require_POST
+def follow_user(request, user_id):
+    """
+    Toggle whether the current user follows another user.
+    """
+    user_being_followed = get_object_or_404(User, pk=user_id)
+
+    if user_being_followed.pk == request.user.pk:
+        messages.error(request, "You cannot follow yourself.")
+    elif toggle_follow(request.user, user_being_followed):
+        messages.success(request, f"You are now following {user_being_followed.username}.")
+    else:
+        messages.success(request, f"You have unfollowed {user_being_followed.username}.")
+
+    return redirect('view_profile', user_id=user_id)
+
+
+@atomic_write
+def toggle_follow(follower, followed):
+    """
+    Follow or unfollow a user and update both users' counters.
+
+    The check and the write run in one immediate transaction, so the
+    counters stay in step with the follow table under concurrent clicks.
+
+    Returns:
+        bool: True if ``follower`` now follows ``followed``.
+    """
+    now_following = not follower.following.filter(pk=followed.pk).exists()
+    if now_following:
+        follower.following.add(followed)
     else:
-        user_being_followed.followers.add(request.user)
+        follower.following.remove(followed)
+
+    delta = 1 if now_following else -1
+    User.objects.filter(pk=follower.pk).update(following_count=F('following_count') + delta)
+    User.objects.filter(pk=followed.pk).update(followers_count=F('followers_count') + delta)
+    invalidate_user(follower.pk)
+    invalidate_user(followed.pk)
+    return now_following
+
+
+@login_required
+def followers(request, user_id):
+    """
+    List the users following a user, a page at a time.
+    """
+    profile_user = get_object_or_404(User, pk=user_id)
+    return _follow_list(request, profile_user, profile_user.followers.all(), profile_user.followers_count, 'Followers')
+
+
+@login_required
+def following(request, user_id):
+    """
+    List the users a user follows, a page at a time.
+    """
+    profile_user = get_object_or_404(User, pk=user_id)
+    return _follow_list(request, profile_user, profile_user.following.all(), profile_user.following_count, 'Following')
+
 
-    return redirect('profile', pk=pk)
\ No newline at end of file
+def _follow_list(request, profile_user, users, total, title):
+    """Render one page of a follower/following list, counted from the stored counter."""
+    paginator = Paginator(users.order_by('username'), 25)
+    # The counter is kept in step with the follow table, so skip the COUNT query.
+    paginator.count = total
+    page_obj = paginator.get_page(request.GET.get('page', 1))
+    return render(request, 'follow_list.html', {
+        'profile_user': profile_user,
+        'page_obj': page_obj,
+        'title': title,
+    })
@@ -0,0 +1,52 @@
+import io
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+from recipes.forms import RecipeImportForm
+from recipes.helpers import is_admin, log_action
+from recipes.imports import detect_format, import_recipes as run_import
+from recipes.models import AdminLog
+
+
+@login_required
+def import_recipes(request):
+    """
+    Upload a JSON lines or CSV recipe dump and import it (admin only).
+
+    The upload is parsed as a stream and written in chunks, see
+    recipes/imports.py. Records without an author are credited to the
+    uploading admin.
+    """
+    if not is_admin(request.user):
+        messages.error(request, "You do not have permission to import recipes.")
+        return redirect('dashboard')
+
+    result = None
+    form = RecipeImportForm(request.POST or None, request.FILES or None)
+    if request.method == 'POST' and form.is_valid():
+        upload = form.cleaned_data['file']
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        result = run_import(
+            lines,
+            format=form.cleaned_data['format'] or detect_format(upload.name),
+            default_author=request.user,
+        )
+        # Chunks read before any invalid bytes are committed, so always log them.
+        log_action(
+            actor=request.user,
+            action_type=AdminLog.ActionType.ADMIN_ACTION,
+            description=f"{request.user.username} imported {result.created} recipes from '{upload.name}'",
+            target_type='Recipe',
+            metadata={
+                'file': upload.name, 'created': result.created, 'failed': result.failed,
+                'truncated': result.truncated,
+            },
+            request=request,
+        )
+        if result.truncated:
+            form.add_error('file', "The file must be UTF-8 text. Only the records before the first invalid byte were imported.")
+        else:
+            messages.success(request, f"Imported {result.created} recipes ({result.failed} skipped).")
+
+    return render(request, 'import_recipes.html', {'form': form, 'result': result})
@@ -7,6 +7,7 @@ from recipes.forms import LogInForm
 from recipes.views.decorators import LoginProhibitedMixin
 from recipes.helpers import log_action
 from recipes.models import AdminLog
+from recipes.throttling import consume_login_attempt, reset_username_bucket, throttle_ip
 
 
 class LogInView(LoginProhibitedMixin, View):
@@ -36,12 +37,24 @@ class LogInView(LoginProhibitedMixin, View):
         This method attempts to authenticate the user based on submitted
         credentials. If successful, the user is logged in and redirected.
         Otherwise, an error message is displayed and the form is re-rendered.
+        Attempts over the login throttle's limit are rejected with a 429
+        before any password hashing happens.
         """
 
         form = LogInForm(request.POST)
         self.next = request.POST.get('next') or settings.REDIRECT_URL_WHEN_LOGGED_IN
+
+        retry_after = consume_login_attempt(throttle_ip(request), request.POST.get('username', ''))
+        if retry_after is not None:
+            messages.add_message(request, messages.ERROR, "Too many login attempts. Please try again later.")
+            response = self.render()
+            response.status_code = 429
+            response['Retry-After'] = str(retry_after)
+            return response
+
         user = form.get_user()
         if user is not None:
+            reset_username_bucket(user.username)
             login(request, user)
             log_action(
                 actor=user,
@@ -72,12 +72,12 @@ def view_logs(request):
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
     
-    # Get unique values for filter dropdowns
-    action_types = AdminLog.objects.values_list('action_type', flat=True).distinct().order_by('action_type')
-    target_types = AdminLog.objects.exclude(target_type='').values_list('target_type', flat=True).distinct().order_by('target_type')
+    # Get unique values for filter dropdowns (cached, as each one scans the whole log table)
+    action_types = AdminLog.objects.values_list('action_type', flat=True).distinct().order_by('action_type').cached()
+    target_types = AdminLog.objects.exclude(target_type='').values_list('target_type', flat=True).distinct().order_by('target_type').cached()
     
     # Get actors for filter (users who have performed actions)
-    actors = AdminLog.objects.exclude(actor=None).select_related('actor').values_list('actor_id', 'actor__username').distinct().order_by('actor__username')
+    actors = AdminLog.objects.exclude(actor=None).select_related('actor').values_list('actor_id', 'actor__username').distinct().order_by('actor__username').cached()
     
     context = {
         'logs': page_obj,
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import Q
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+
+from recipes.meal_plans import add_entry, get_plan, remove_entry, shopping_list as build_list, week_start
+from recipes.models import MealPlanEntry, Recipe
+from recipes.scaling import parse_serves
+
+
+def _requested_week(value):
+    """Return the Monday of the week in a ``YYYY-MM-DD`` value, or of this week."""
+    try:
+        return week_start(date.fromisoformat(value))
+    except (TypeError, ValueError):
+        return week_start()
+
+
+def _plan_url(week):
+    return f"{reverse('meal_plan')}?week={week.isoformat()}"
+
+
+@login_required
+def meal_plan(request):
+    """
+    Show the current user's meal plan for a week, one day at a time.
+    """
+    week = _requested_week(request.GET.get('week'))
+    plan = get_plan(request.user, week)
+    entries = plan.entries.filter(recipe__deletedAt__isnull=True).select_related('recipe__author') if plan else []
+
+    days = [
+        {'name': name, 'date': week + timedelta(days=day), 'entries': [e for e in entries if e.day == day]}
+        for day, name in MealPlanEntry.DAY_CHOICES
+    ]
+    return render(request, 'meal_plan.html', {
+        'week': week,
+        'previous_week': week - timedelta(weeks=1),
+        'next_week': week + timedelta(weeks=1),
+        'days': days,
+        'plan': plan,
+    })
+
+
+@login_required
+@require_POST
+def add_to_meal_plan(request, recipe_id):
+    """
+    Add a recipe the user can see to a day of their meal plan.
+    """
+    recipe = get_object_or_404(
+        Recipe.objects.filter(Q(visibility__in=['public', 'unlisted']) | Q(author=request.user)),
+        pk=recipe_id,
+    )
+    week = _requested_week(request.POST.get('week'))
+    try:
+        day = int(request.POST.get('day', ''))
+    except ValueError:
+        day = None
+    if day not in dict(MealPlanEntry.DAY_CHOICES):
+        messages.error(request, "Choose a day to plan this recipe for.")
+        return redirect('view_recipe', recipe_id=recipe.id)
+
+    serves = parse_serves(request.POST.get('serves'))
+    add_entry(request.user, week, recipe, day, serves if serves != recipe.serves else None)
+    messages.success(request, f"Added '{recipe.name}' to {MealPlanEntry.DAY_CHOICES[day][1]}.")
+    return redirect(_plan_url(week))
+
+
+@login_required
+@require_POST
+def remove_from_meal_plan(request, entry_id):
+    """
+    Remove a recipe from the user's meal plan.
+    """
+    entry = get_object_or_404(MealPlanEntry.objects.select_related('plan'), pk=entry_id, plan__user=request.user)
+    remove_entry(entry)
+    messages.success(request, "Removed from your meal plan.")
+    return redirect(_plan_url(entry.plan.weekStart))
+
+
+@login_required
+def shopping_list(request):
+    """
+    Show the merged ingredients of every recipe in a week's meal plan.
+    """
+    week = _requested_week(request.GET.get('week'))
+    plan = get_plan(request.user, week)
+    return render(request, 'shopping_list.html', {
+        'week': week,
+        'items': build_list(plan) if plan else [],
+    })
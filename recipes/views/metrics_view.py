@@ -0,0 +1,18 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from recipes.helpers import is_admin
+from recipes.metrics import snapshot_all
+
+
+@login_required
+def metrics(request):
+    """
+    Return this process's in-memory metrics as JSON (admin only).
+    """
+    if not is_admin(request.user):
+        messages.error(request, "You do not have permission to view metrics.")
+        return redirect('dashboard')
+
+    return JsonResponse(snapshot_all())
@@ -0,0 +1,21 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from recipes.pantry import pantry_search as search_pantry, pantry_words
+
+
+@login_required
+def pantry_search(request):
+    """
+    Find recipes that can be cooked with the ingredients the user lists.
+
+    Recipes are ranked by the share of their ingredients the pantry covers.
+    """
+    pantry = request.GET.get('ingredients', '').strip()
+    recipes = search_pantry(pantry, request.user) if pantry else []
+
+    return render(request, 'pantry_search.html', {
+        'pantry': pantry,
+        'pantry_words': sorted(pantry_words(pantry)),
+        'recipes': recipes,
+    })
@@ -0,0 +1,38 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from recipes.helpers import is_admin, is_moderator
+from recipes.models import Recipe, RecipeRevision
+from recipes.revisions import revision_document, revision_history
+
+
+@login_required
+def recipe_history(request, recipe_id):
+    """
+    List a recipe's revisions, and show one with ``?revision=N``.
+
+    Open to the recipe's author, admins and moderators.
+    """
+    recipe = get_object_or_404(Recipe.objects.select_related("author"), pk=recipe_id)
+    if not (request.user == recipe.author or is_admin(request.user) or is_moderator(request.user)):
+        messages.error(request, "You do not have permission to view this recipe's history.")
+        return redirect("view_recipe", recipe_id=recipe.id)
+
+    revisions = list(revision_history(recipe))
+    selected = document = None
+    if request.GET.get("revision"):
+        selected = next((r for r in revisions if str(r.number) == request.GET["revision"]), None)
+        if selected is None:
+            raise Http404("No such revision.")
+        try:
+            document = revision_document(recipe, selected.number)
+        except RecipeRevision.DoesNotExist:
+            raise Http404("No such revision.")
+
+    return render(request, "recipe_history.html", {
+        "recipe": recipe,
+        "revisions": revisions,
+        "selected": selected,
+        "document": document,
+    })
@@ -0,0 +1,28 @@
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from recipes.models import Recipe
+from recipes.scaling import parse_serves, scaled_ingredients
+
+
+@require_safe
+def recipe_ingredients(request, recipe_id):
+    """
+    Return a recipe's ingredients as JSON, scaled to ``?serves=N`` if given.
+    """
+    recipe = get_object_or_404(Recipe, pk=recipe_id)
+    if "serves" in request.GET and parse_serves(request.GET["serves"]) is None:
+        return JsonResponse({"error": "serves must be a whole number of servings."}, status=400)
+    serves = parse_serves(request.GET.get("serves")) or recipe.serves
+
+    return JsonResponse({
+        "recipe": recipe.pk,
+        "name": recipe.name,
+        "serves": serves,
+        "originalServes": recipe.serves,
+        "ingredients": [
+            {key: ingredient[key] for key in ("position", "text", "quantity", "quantityMax", "unit", "item", "note")}
+            for ingredient in scaled_ingredients(recipe, serves)
+        ],
+    })
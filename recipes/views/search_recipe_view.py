@@ -59,6 +59,7 @@ def search_recipe(request):
 
     sort_options = {
         '-createdAt': 'Newest first',
+        '-trendingScore': 'Trending',
         'createdAt': 'Oldest first',
         'name': 'Name A-Z',
         '-name': 'Name Z-A',
@@ -71,7 +72,7 @@ def search_recipe(request):
     if sort_param not in sort_options:
         sort_param = '-createdAt'
 
-    recipes = recipes.order_by(sort_param).distinct()
+    recipes = recipes.order_by(sort_param).distinct().cached(ttl=30)
 
     context = {
         'recipes': recipes,
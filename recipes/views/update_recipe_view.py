@@ -0,0 +1,89 @@
+# recipes/views/update_recipe_view.py
+
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import redirect
+from django.views.generic import UpdateView
+
+from recipes.edits import update_recipe
+from recipes.forms.recipe_form import RecipeForm, IngredientFormSet, StepFormSet, formset_texts
+from recipes.helpers import log_action
+from recipes.models import Recipe, AdminLog
+from recipes.revisions import record_baseline, record_revision
+from recipes.writes import atomic_write
+
+
+class UpdateRecipeView(LoginRequiredMixin, UpdateView):
+    """
+    Let a recipe's author edit it.
+
+    Submitted ingredients and steps are diffed against the stored ones, so
+    only the rows that changed are written (see recipes/edits.py).
+    """
+
+    model = Recipe
+    form_class = RecipeForm
+    template_name = "create_recipe.html"
+    pk_url_kwarg = "recipe_id"
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            self.object = self.get_object()
+            if self.object.author_id != request.user.id:
+                messages.error(request, "You can only edit your own recipes.")
+                return redirect("view_recipe", recipe_id=self.object.id)
+        return super().dispatch(request, *args, **kwargs)
+
+    def _make_formsets(self, data=None):
+        ingredient_formset = IngredientFormSet(data=data, instance=self.object, prefix="ingredients")
+        step_formset = StepFormSet(data=data, instance=self.object, prefix="steps")
+        return ingredient_formset, step_formset
+
+    def _render(self, form, ingredient_formset, step_formset):
+        return self.render_to_response({
+            "form": form,
+            "recipe": self.object,
+            "ingredient_formset": ingredient_formset,
+            "step_formset": step_formset,
+        })
+
+    def get(self, request, *args, **kwargs):
+        return self._render(self.form_class(instance=self.object), *self._make_formsets())
+
+    def post(self, request, *args, **kwargs):
+        form = self.form_class(request.POST, instance=self.object)
+
+        for button, prefix in (("add_ingredient", "ingredients"), ("add_step", "steps")):
+            if button in request.POST:
+                data = request.POST.copy()
+                data[f"{prefix}-TOTAL_FORMS"] = str(int(data.get(f"{prefix}-TOTAL_FORMS", 0)) + 1)
+                return self._render(form, *self._make_formsets(data))
+
+        ingredient_formset, step_formset = self._make_formsets(request.POST)
+        if form.is_valid() and ingredient_formset.is_valid() and step_formset.is_valid():
+            self._update(form, formset_texts(ingredient_formset), formset_texts(step_formset))
+            messages.success(request, f"Recipe '{self.object.name}' updated.")
+            return redirect("view_recipe", recipe_id=self.object.id)
+
+        return self._render(form, ingredient_formset, step_formset)
+
+    @atomic_write
+    def _update(self, form, ingredient_texts, step_texts):
+        """Write the changes and log them in one transaction."""
+        record_baseline(self.object.pk)
+        ingredients, steps = update_recipe(form, ingredient_texts, step_texts)
+        record_revision(self.object, self.request.user)
+        log_action(
+            actor=self.request.user,
+            action_type=AdminLog.ActionType.RECIPE_UPDATED,
+            description=f"{self.request.user.username} updated recipe '{self.object.name}' (ID: {self.object.id})",
+            target_type='Recipe',
+            target_id=self.object.id,
+            metadata={
+                'recipe_name': self.object.name,
+                'changed_fields': form.changed_data,
+                'ingredients_written': ingredients.written,
+                'steps_written': steps.written,
+            },
+            request=self.request,
+        )
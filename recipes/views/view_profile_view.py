@@ -21,7 +21,7 @@ def view_profile(request, user_id):
     
     # Get user's ratings/reviews on other recipes
     user_ratings = RecipeRating.objects.filter(
-        user=profile_user
+        user=profile_user, recipe__deletedAt__isnull=True
     ).select_related('recipe', 'recipe__author').order_by('-createdAt')
     
     context = {
@@ -29,6 +29,7 @@ def view_profile(request, user_id):
         'recipes': recipes,
         'user_ratings': user_ratings,
         'is_own_profile': (current_user.id == profile_user.id),
+        'is_following': current_user.following.filter(pk=profile_user.pk).exists(),
     }
     
     return render(request, 'view_profile.html', context)
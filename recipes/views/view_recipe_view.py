@@ -1,22 +1,30 @@
 from django.shortcuts import get_object_or_404, render
 from recipes.models import (
     Recipe,
-    RecipeIngredient, 
-    RecipeStep, 
     RecipeRating,
-    RecipeFavourite
+    RecipeFavourite,
+    MealPlanEntry
 )
+from recipes.minhash import similar_by_ingredients
+from recipes.recommendations import similar_recipes
+from recipes.scaling import parse_serves, scaled_ingredients
+from recipes.trending import record_view
 
-def view_recipe(request, recipe_id):
-    recipe = get_object_or_404(
-        Recipe.objects.select_related("author").prefetch_related("tags"),
-        pk=recipe_id
-    )
+def recipe_page_context(request, recipe, serves=None, ratings=None):
+    """
+    Return the ``view_recipe.html`` context for ``recipe`` as seen by ``request.user``.
+
+    ``ratings`` may be passed in already fetched, as the static export does.
+    """
+    # ?serves=N shows the ingredients scaled from the recipe's own servings
+    serves = serves or recipe.serves
+    if serves != recipe.serves:
+        ingredients = scaled_ingredients(recipe, serves)
+    else:
+        ingredients = recipe.get_ingredients()
+    if ratings is None:
+        ratings = RecipeRating.objects.select_related("user").filter(recipe=recipe).order_by("-createdAt")
 
-    ingredients = RecipeIngredient.objects.filter(recipe=recipe).order_by("position")
-    steps = RecipeStep.objects.filter(recipe=recipe).order_by("position")
-    ratings = RecipeRating.objects.select_related("user").filter(recipe=recipe).order_by("-createdAt")
-    
     # Check if user has favourited this recipe
     is_favourited = False
     user_rating = None
@@ -27,11 +35,25 @@ def view_recipe(request, recipe_id):
         except RecipeRating.DoesNotExist:
             pass
 
-    return render(request, "view_recipe.html", {
+    return {
         "recipe": recipe,
         "ingredients": ingredients,
-        "steps": steps,
+        "serves": serves,
+        "meal_plan_days": MealPlanEntry.DAY_CHOICES,
+        "steps": recipe.get_steps(),
         "ratings": ratings,
         "is_favourited": is_favourited,
         "user_rating": user_rating,
-    })
+        "similar_recipes": similar_recipes(recipe),
+        "similar_by_ingredients": similar_by_ingredients(recipe),
+    }
+
+
+def view_recipe(request, recipe_id):
+    recipe = get_object_or_404(
+        Recipe.objects.select_related("author").prefetch_related("tags"),
+        pk=recipe_id
+    )
+    context = recipe_page_context(request, recipe, parse_serves(request.GET.get("serves")))
+    record_view(request, recipe)
+    return render(request, "view_recipe.html", context)
@@ -0,0 +1,111 @@
+"""
+Write-path helpers for SQLite lock contention.
+
+SQLite allows one writer at a time. ``atomic_write`` runs a function in its
+own transaction and, if the transaction fails with "database is locked",
+rolls it back and retries it with jittered exponential backoff. With
+``DB_WRITE_RETRY['SERIALIZE']`` enabled, writes in the same process also
+queue on a single lock so threads do not compete for the database lock.
+
+Retries, failures, backoff time and queue wait time are recorded in the
+``db_writes`` metrics namespace.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from recipes.metrics import get_metrics
+
+
+DEFAULT_WRITE_RETRY = {
+    'ATTEMPTS': 5,
+    'BASE_DELAY': 0.05,
+    'MAX_DELAY': 1.0,
+    'SERIALIZE': False,
+}
+
+metrics = get_metrics('db_writes')
+
+_writer_lock = threading.RLock()
+
+
+def get_retry_config():
+    """Return the retry policy, with ``settings.DB_WRITE_RETRY`` over the defaults."""
+
+    config = dict(DEFAULT_WRITE_RETRY)
+    config.update(getattr(settings, 'DB_WRITE_RETRY', {}) or {})
+    return config
+
+
+def is_lock_error(error):
+    """Return True if an OperationalError was caused by SQLite lock contention."""
+
+    return 'is locked' in str(error).lower()
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Return a full-jitter exponential backoff delay for a retry attempt (1-based)."""
+
+    return random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+
+
+@contextmanager
+def _writer_slot():
+    """Hold the per-process writer lock, recording how long we waited for it."""
+
+    started = time.monotonic()
+    with _writer_lock:
+        metrics.increment('queue_wait_seconds', time.monotonic() - started)
+        yield
+
+
+def atomic_write(func=None, *, using=None):
+    """
+    Decorator that runs a function in a transaction and retries it when locked.
+
+    When the decorated function is called inside an existing transaction it
+    simply runs in a savepoint: retrying would replay only part of the outer
+    transaction, so the lock error is left for the outermost caller.
+
+    Example:
+        @atomic_write
+        def save_rating(form, recipe, user):
+            ...
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if transaction.get_connection(using).in_atomic_block:
+                with transaction.atomic(using=using):
+                    return function(*args, **kwargs)
+
+            config = get_retry_config()
+            attempt = 1
+            while True:
+                metrics.increment('transactions')
+                try:
+                    with _writer_slot() if config['SERIALIZE'] else nullcontext():
+                        with transaction.atomic(using=using):
+                            return function(*args, **kwargs)
+                except OperationalError as error:
+                    if not is_lock_error(error):
+                        raise
+                    if attempt >= config['ATTEMPTS']:
+                        metrics.increment('failures')
+                        raise
+                    delay = backoff_delay(attempt, config['BASE_DELAY'], config['MAX_DELAY'])
+                    metrics.increment('retries')
+                    metrics.increment('backoff_seconds', delay)
+                    time.sleep(delay)
+                    attempt += 1
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
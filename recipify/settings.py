@@ -48,6 +48,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'recipes.routers.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -79,7 +80,177 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': {
+            # Take the write lock when a transaction starts, so concurrent
+            # writers queue on busy_timeout instead of deadlocking on upgrade.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Snapshot of the primary for read-only views, written by refresh_replica.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['recipes.routers.ReplicaRouter']
+
+# Views whose GET requests may read from the replica (see recipes/routers.py).
+# STICKY_SECONDS should be longer than the refresh_replica interval.
+READ_REPLICA = {
+    'ALIAS': 'replica',
+    'VIEWS': ['search_recipe', 'view_recipe', 'search_user', 'view_profile'],
+    'STICKY_SECONDS': 60,
+}
+
+# 'shared' must be visible to every worker process: it holds sessions and
+# the user cache's version tokens. Swap in RedisCache/PyMemcacheCache where
+# available; the file cache works on a single host.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'django_cache',
+    },
+}
+
+# Tests swap every cache for LocMemCache, so they never clear live sessions.
+TEST_RUNNER = 'recipes.tests.runner.LocalCacheTestRunner'
+
+# Sessions are read from the shared cache and written through to the database.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'shared'
+
+# Logged-in users are cached per process for TIMEOUT seconds (see recipes/backends.py).
+AUTHENTICATION_BACKENDS = ['recipes.backends.CachedModelBackend']
+USER_CACHE = {
+    'CACHE': 'shared',
+    'TIMEOUT': 30,
+}
+
+# Login attempts allowed per client IP and per username (see recipes/throttling.py).
+LOGIN_THROTTLE = {
+    'CACHE': 'shared',
+    'IP': {'CAPACITY': 20, 'REFILL_PER_MINUTE': 10},
+    'USERNAME': {'CAPACITY': 5, 'REFILL_PER_MINUTE': 2},
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted.
+    'TRUSTED_PROXIES': [],
+}
+
+# Following feed (see recipes/feeds.py). Authors with more than FANOUT_LIMIT
+# followers are read on demand instead of being fanned out by fanout_timelines.
+FEED = {
+    'PAGE_SIZE': 20,
+    'BATCH_SIZE': 500,
+    'FANOUT_LIMIT': 5000,
+}
+
+# Item-item recommendations (see recipes/recommendations.py).
+RECOMMENDATIONS = {
+    'TOP_K': 20,
+    'BATCH_SIZE': 100,
+    'SEED_RECIPES': 10,
+}
+
+# Trending scores (see recipes/trending.py); run rescale_trending hourly.
+TRENDING = {
+    'HALF_LIFE_HOURS': 24,
+    'WEIGHTS': {
+        'view': 1,
+        'rating': 3,
+        'favourite': 5,
+    },
+    'VIEW_WINDOW': 3600,
+}
+
+# Similar recipes and duplicate warnings by ingredients and tags (see recipes/minhash.py).
+MINHASH = {
+    'NUM_PERM': 64,
+    'BANDS': 16,
+    'SIMILAR_THRESHOLD': 0.3,
+    'DUPLICATE_THRESHOLD': 0.8,
+}
+
+# Pantry search (see recipes/pantry.py).
+PANTRY = {
+    'MIN_COVERAGE': 0.5,
+    'MAX_RESULTS': 50,
+}
+
+# Serving-size scaling (see recipes/scaling.py).
+SCALING = {
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+    'MAX_SERVES': 100,
+}
+
+# Meal plan shopping lists (see recipes/meal_plans.py).
+MEAL_PLANS = {
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+}
+
+# Bulk recipe imports (see recipes/imports.py).
+IMPORTS = {
+    'CHUNK_SIZE': 500,
+    'MAX_ERRORS': 100,
+}
+
+# Recipe exports (see recipes/exports.py).
+EXPORTS = {
+    'CHUNK_SIZE': 500,
+}
+
+# Recipe revision history (see recipes/revisions.py).
+REVISIONS = {
+    'SNAPSHOT_EVERY': 10,
+}
+
+# Background purge of deleted recipes (see recipes/purge.py).
+PURGE = {
+    'BATCH_SIZE': 100,
+}
+
+# ORM query cache used by querysets' .cached() (see recipes/query_cache.py).
+# CACHE names an entry in CACHES; TIMEOUT is the default TTL in seconds.
+QUERY_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 60,
+}
+
+# Local avatar proxy (see recipes/avatars.py). Fill the cache with
+# `manage.py prefetch_avatars`; avatars missing from it are identicons.
+AVATARS = {
+    'CACHE_DIR': BASE_DIR / 'avatar_cache',
+    'MAX_FILES': 5000,
+    'MAX_AGE': 7 * 24 * 60 * 60,
+    # Identicons are placeholders until prefetch_avatars finds a gravatar.
+    'IDENTICON_MAX_AGE': 60 * 60,
+}
+
+# Pragmas applied to every new SQLite connection (see recipes/sqlite.py).
+# Override individual entries here; set an entry to None to leave SQLite's default.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,
+    'mmap_size': 134217728,
+    'temp_store': 'MEMORY',
+}
+
+# Retry policy for writes that hit "database is locked" (see recipes/writes.py).
+# SERIALIZE queues all writes within a process on a single lock.
+DB_WRITE_RETRY = {
+    'ATTEMPTS': 5,
+    'BASE_DELAY': 0.05,
+    'MAX_DELAY': 1.0,
+    'SERIALIZE': True,
 }
 
 
@@ -33,11 +33,23 @@ urlpatterns = [
     path('create_recipe/', views.CreateRecipeView.as_view(), name='create_recipe'),
     path('search_user/', views.search_user, name='search_user'),
     path('search_recipe/', views.search_recipe, name='search_recipe'),
+    path('pantry/', views.pantry_search, name='pantry_search'),
     path("recipes/<int:recipe_id>/", views.view_recipe, name="view_recipe"),
+    path("recipes/<int:recipe_id>/edit/", views.UpdateRecipeView.as_view(), name="update_recipe"),
+    path("recipes/<int:recipe_id>/history/", views.recipe_history, name="recipe_history"),
+    path("recipes/<int:recipe_id>/ingredients.json", views.recipe_ingredients, name="recipe_ingredients"),
     path("users/<int:user_id>/profile/", views.view_profile, name="view_profile"),
+    path("users/<int:user_id>/follow/", views.follow_user, name="follow_user"),
+    path("users/<int:user_id>/followers/", views.followers, name="followers"),
+    path("users/<int:user_id>/following/", views.following, name="following"),
     path("recipes/<int:recipe_id>/favourite/", views.favourite_recipe, name="favourite_recipe"),
     path("favourites/", views.favourites, name="favourites"),
+    path("meal-plan/", views.meal_plan, name="meal_plan"),
+    path("meal-plan/shopping-list/", views.shopping_list, name="shopping_list"),
+    path("meal-plan/entries/<int:entry_id>/remove/", views.remove_from_meal_plan, name="remove_from_meal_plan"),
+    path("recipes/<int:recipe_id>/plan/", views.add_to_meal_plan, name="add_to_meal_plan"),
     path("recipes/<int:recipe_id>/rate/", views.add_rating, name="add_rating"),
+    path("avatars/<str:email_hash>/<int:size>/", views.avatar, name="avatar"),
 
     
     #Admin specific delete
@@ -51,5 +63,7 @@ urlpatterns = [
     # admin panel and logs
     path('admin_panel/', views.admin_panel, name='admin_panel'),
     path('logs/', views.view_logs, name='view_logs'),
+    path('admin_panel/metrics/', views.metrics, name='metrics'),
+    path('admin_panel/import/', views.import_recipes, name='import_recipes'),
 ]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)